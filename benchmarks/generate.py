@@ -0,0 +1,131 @@
+"""
+Generador de árboles `logs/` sintéticos para benchmarks.
+
+Produce años de días laborales con el mismo formato que escribe el runner:
+actividades multilínea, muchos tags (incluidos jerárquicos como `ado/backend`),
+mezcla de layouts (JSONL+CSV, solo CSV, legacy en la raíz) y algunas líneas corruptas.
+
+    python benchmarks/generate.py /tmp/worklog-bench --years 3
+"""
+import argparse
+import csv
+import json
+import os
+import random
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+CSV_HEADER = ["date", "start", "end", "minutes", "activity", "tags"]
+
+TAGS = [
+    "azure-devops", "ado/backend", "ado/frontend", "ado/infra", "meetings", "daily",
+    "soporte", "soporte/n2", "qa", "qa/seguridad", "docs", "code-review", "release",
+    "cliente/acme", "cliente/globex", "cliente/initech", "formacion", "oncall",
+]
+WORDS = (
+    "revisión pruebas despliegue reunión cliente certificados pipeline bug fix refactor "
+    "documentación soporte incidente análisis diseño api base datos migración seguridad "
+    "release sprint planeación retro daily demo backlog tarea historia usuario"
+).split()
+
+
+def _activity(rnd: random.Random) -> str:
+    if rnd.random() < 0.15:
+        return rnd.choice(["(sin detalle)", "(break / descanso)", "(sin registro / skip)"])
+    lines = rnd.choices([1, 2, 3, 4], weights=[60, 25, 10, 5])[0]
+    return "\n".join(" ".join(rnd.choices(WORDS, k=rnd.randint(2, 9))) for _ in range(lines))
+
+
+def _day_entries(rnd: random.Random, d: date, tz: ZoneInfo) -> list[dict]:
+    t = datetime(d.year, d.month, d.day, 7, rnd.randint(0, 20), rnd.randint(0, 59), tzinfo=tz)
+    end_of_day = t.replace(hour=17, minute=0, second=0)
+    out = []
+    while t < end_of_day:
+        minutes = rnd.choice([30, 45, 60, 60, 60, 61, 90, 120])
+        nxt = min(t + timedelta(minutes=minutes), end_of_day)
+        tags = ",".join(rnd.sample(TAGS, k=rnd.choices([0, 1, 2, 3], weights=[5, 50, 35, 10])[0]))
+        out.append({
+            "date": d.isoformat(),
+            "start": t.isoformat(timespec="seconds"),
+            "end": nxt.isoformat(timespec="seconds"),
+            "minutes": max(1, int((nxt - t).total_seconds() / 60)),
+            "activity": _activity(rnd),
+            "tags": tags,
+        })
+        t = nxt
+    return out
+
+
+def _write_jsonl(path: str, rows: list[dict], rnd: random.Random, corrupt_ratio: float) -> int:
+    corrupt = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            if rnd.random() < corrupt_ratio:
+                f.write(json.dumps(row, ensure_ascii=False)[: rnd.randint(5, 40)] + "\n")
+                corrupt += 1
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return corrupt
+
+
+def _write_csv(path: str, rows: list[dict]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(CSV_HEADER)
+        for row in rows:
+            w.writerow([row[k] for k in CSV_HEADER])
+
+
+def generate_logs(
+    base_dir: str,
+    years: float = 1.0,
+    start: date = date(2024, 1, 1),
+    seed: int = 7,
+    corrupt_ratio: float = 0.003,
+    csv_only_ratio: float = 0.08,
+    legacy_ratio: float = 0.05,
+    tz_name: str = "America/Bogota",
+) -> dict:
+    """Escribe el árbol y retorna estadísticas (días, entradas, líneas corruptas)."""
+    rnd = random.Random(seed)
+    tz = ZoneInfo(tz_name)
+    json_dir = os.path.join(base_dir, "worklog_json")
+    csv_dir = os.path.join(base_dir, "worklog_csv")
+    for d in (base_dir, json_dir, csv_dir, os.path.join(base_dir, "worklog_md")):
+        os.makedirs(d, exist_ok=True)
+
+    stats = {"days": 0, "entries": 0, "corrupt_lines": 0, "csv_only": 0, "legacy": 0}
+    end = start + timedelta(days=int(365 * years))
+    d = start
+    while d < end:
+        if d.weekday() < 5:
+            rows = _day_entries(rnd, d, tz)
+            name = f"{d.isoformat()}_worklog"
+            layout = rnd.random()
+            if layout < legacy_ratio:
+                _write_jsonl(os.path.join(base_dir, f"{name}.jsonl"), rows, rnd, 0)
+                stats["legacy"] += 1
+            elif layout < legacy_ratio + csv_only_ratio:
+                _write_csv(os.path.join(csv_dir, f"{name}.csv"), rows)
+                stats["csv_only"] += 1
+            else:
+                stats["corrupt_lines"] += _write_jsonl(os.path.join(json_dir, f"{name}.jsonl"), rows, rnd, corrupt_ratio)
+                _write_csv(os.path.join(csv_dir, f"{name}.csv"), rows)
+            stats["days"] += 1
+            stats["entries"] += len(rows)
+        d += timedelta(days=1)
+    return stats
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("base_dir")
+    p.add_argument("--years", type=float, default=1.0)
+    p.add_argument("--start", type=str, default="2024-01-01")
+    p.add_argument("--seed", type=int, default=7)
+    a = p.parse_args()
+    stats = generate_logs(a.base_dir, years=a.years, start=date.fromisoformat(a.start), seed=a.seed)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
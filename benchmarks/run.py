@@ -0,0 +1,223 @@
+"""
+Suite de benchmarks sobre un árbol de logs sintético (ver generate.py).
+
+Mide read_jsonl, read_csv, _summarize, export_markdown, _write_weekly_md y
+weekly_summary de punta a punta, más la memoria retenida por el historial
+cargado (lista de Entry vs EntryBatch) y el pico del resumen anual con --details.
+La salida es JSON para comparar entre commits:
+
+    python benchmarks/run.py --years 3 --out bench.json
+    python benchmarks/run.py --years 3 --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from generate import generate_logs  # noqa: E402
+from worklog.config import SummaryConfig  # noqa: E402
+from worklog.aggregate import _numpy, group_by, summarize  # noqa: E402
+from worklog.domain import EntryBatch  # noqa: E402
+from worklog.exporter import export_markdown  # noqa: E402
+from worklog.storage import read_csv, read_jsonl  # noqa: E402
+from worklog.weekly import _iter_range_entries, _day_range, _summarize, _write_weekly_md, weekly_summary  # noqa: E402
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def run_suite(base_dir: str, start: date, years: float, repeat: int) -> list[dict]:
+    json_files = sorted(os.path.join(base_dir, "worklog_json", n) for n in os.listdir(os.path.join(base_dir, "worklog_json")))
+    csv_files = sorted(os.path.join(base_dir, "worklog_csv", n) for n in os.listdir(os.path.join(base_dir, "worklog_csv")))
+    all_days = _day_range(start, start + timedelta(days=int(365 * years) - 1))
+    entries = list(_iter_range_entries(base_dir, all_days))
+    batch = EntryBatch.from_entries(entries)
+    year_days = all_days[:365]
+    year_entries = list(_iter_range_entries(base_dir, year_days))
+    out_dir = tempfile.mkdtemp(prefix="worklog-bench-out-")
+    rollup_dir = os.path.join(base_dir, "worklog_rollup")
+
+    def drop_rollups() -> None:
+        shutil.rmtree(rollup_dir, ignore_errors=True)
+
+    def summary(**kw) -> Callable[[], None]:
+        kw = {"week": "current", "include_details": False, **kw}
+        cfg = SummaryConfig(base_dir=base_dir, tz_name="America/Bogota", **kw)
+
+        def fn() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                weekly_summary(cfg)
+        return fn
+
+    # primera semana completa del historial; en fin de año la ISO pasa a W01 del año siguiente
+    iso_week = (start + timedelta(weeks=1)).isocalendar()
+    week = f"{iso_week.year}-W{iso_week.week:02d}"
+    year = str(start.year)
+    cases: list[tuple[str, int, Callable[[], object], Callable[[], None] | None]] = [
+        ("read_jsonl.all", len(json_files), lambda: [read_jsonl(p) for p in json_files], None),
+        ("read_csv.all", len(csv_files), lambda: [read_csv(p) for p in csv_files], None),
+        ("summarize.all", len(entries), lambda: _summarize(entries), None),
+        ("aggregate.summarize.python", len(entries), lambda: summarize(batch, use_numpy=False), None),
+        ("aggregate.weekday_hour.python", len(entries), lambda: group_by(batch, "weekday,hour", use_numpy=False), None),
+        ("export_markdown.60_days", 60, lambda: [
+            export_markdown(os.path.join(out_dir, f"{i}.md"), read_jsonl(p)) for i, p in enumerate(json_files[:60])
+        ], None),
+        ("write_weekly_md.year_details", len(year_entries), lambda: _write_weekly_md(
+            os.path.join(out_dir, "year.md"), year, year_days[0], year_days[-1], year_entries, True
+        ), None),
+        ("weekly_summary.week.cold", 7, summary(week=week), drop_rollups),
+        ("weekly_summary.week.warm", 7, summary(week=week), None),
+        ("weekly_summary.year.cold", 365, summary(year=year), drop_rollups),
+        ("weekly_summary.year.warm", 365, summary(year=year), None),
+        ("weekly_summary.year.details", 365, summary(year=year, include_details=True), None),
+    ]
+    if _numpy() is not None:
+        cases += [
+            ("aggregate.summarize.numpy", len(entries), lambda: summarize(batch, use_numpy=True), None),
+            ("aggregate.weekday_hour.numpy", len(entries), lambda: group_by(batch, "weekday,hour", use_numpy=True), None),
+            ("aggregate.day_tag_hour.numpy", len(entries), lambda: group_by(batch, "day,tag,hour", use_numpy=True), None),
+        ]
+
+    results = []
+    for name, items, fn, setup in cases:
+        samples = _time(fn, repeat, setup)
+        results.append({
+            "name": name,
+            "items": items,
+            "repeat": repeat,
+            "min_ms": round(min(samples), 3),
+            "median_ms": round(statistics.median(samples), 3),
+        })
+    shutil.rmtree(out_dir, ignore_errors=True)
+    _add_baseline_ratios(results)
+    results.extend(_memory_cases(json_files, summary(year=year, include_details=True), len(year_entries)))
+    return results
+
+
+def _add_baseline_ratios(results: list[dict]) -> None:
+    # aggregate.summarize.* contra weekly._summarize sobre las mismas entradas:
+    # la razón sobrevive a cambios de máquina, los milisegundos no.
+    base = next((r["median_ms"] for r in results if r["name"] == "summarize.all"), 0)
+    for r in results:
+        if base and r["name"].startswith("aggregate.summarize."):
+            r["vs_summarize"] = round(r["median_ms"] / base, 3)
+            print(f"{r['name']:<32} x{r['vs_summarize']:.3f} vs summarize.all ({base:.2f} ms)", file=sys.stderr)
+
+
+def _traced(fn: Callable[[], object], peak: bool = False) -> tuple[object, int]:
+    tracemalloc.start()
+    try:
+        obj = fn()
+        return obj, tracemalloc.get_traced_memory()[1 if peak else 0]
+    finally:
+        tracemalloc.stop()
+
+
+def _memory_cases(json_files: list[str], year_details: Callable[[], None], year_items: int) -> list[dict]:
+    # Memoria retenida por el historial cargado: lista de Entry vs EntryBatch (columnas).
+    entries, list_bytes = _traced(lambda: [e for p in json_files for e in read_jsonl(p)])
+    batch, batch_bytes = _traced(lambda: EntryBatch.from_entries(entries))
+    # Pico del reporte anual con --details (el detalle se escribe como stream).
+    _, details_peak = _traced(year_details, peak=True)
+    n = max(1, len(entries))
+    return [
+        {"name": "memory.entry_list", "items": len(entries), "kb": round(list_bytes / 1024, 1), "bytes_per_item": round(list_bytes / n, 1)},
+        {"name": "memory.entry_batch", "items": len(batch), "kb": round(batch_bytes / 1024, 1), "bytes_per_item": round(batch_bytes / n, 1)},
+        {"name": "memory.summary_year_details.peak", "items": year_items, "kb": round(details_peak / 1024, 1)},
+    ]
+
+
+def compare(current: list[dict], baseline_path: str, threshold: float) -> int:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    regressions = 0
+    for r in current:
+        b = baseline.get(r["name"])
+        if not b or not b.get("median_ms") or "median_ms" not in r:
+            continue
+        ratio = r["median_ms"] / b["median_ms"]
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        regressions += bool(flag)
+        print(f"{r['name']:<32} {b['median_ms']:>10.2f} -> {r['median_ms']:>10.2f} ms  x{ratio:.2f} {flag}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--years", type=float, default=2.0)
+    p.add_argument("--start", type=str, default="2024-01-01")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--base-dir", type=str, default="", help="Usar un árbol existente en vez de generar uno.")
+    p.add_argument("--out", type=str, default="", help="Archivo JSON de resultados (default: stdout).")
+    p.add_argument("--compare", type=str, default="", help="JSON previo contra el cual comparar medianas.")
+    p.add_argument("--threshold", type=float, default=0.2, help="Regresión tolerada al comparar (default: 0.2 = 20%%).")
+    a = p.parse_args()
+
+    logging.disable(logging.WARNING)  # las líneas corruptas generan un warning cada una
+    start = date.fromisoformat(a.start)
+
+    tmp = None
+    base_dir = a.base_dir
+    gen_stats = None
+    if not base_dir:
+        tmp = tempfile.mkdtemp(prefix="worklog-bench-")
+        base_dir = os.path.join(tmp, "logs")
+        gen_stats = generate_logs(base_dir, years=a.years, start=start)
+
+    try:
+        results = run_suite(base_dir, start, a.years, a.repeat)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    doc = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "years": a.years,
+        "dataset": gen_stats,
+        "results": results,
+    }
+    text = json.dumps(doc, indent=2)
+    if a.out:
+        with open(a.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    return compare(results, a.compare, a.threshold) if a.compare else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Benchmark de arranque en frío del CLI (`python -X importtime`).
+
+Ejecuta `python -m worklog summary` varias veces contra una carpeta de logs
+temporal, mide el tiempo total del proceso y el tiempo de imports, y falla
+(exit 1) si se supera el presupuesto o si se importan módulos prohibidos.
+
+    python benchmarks/startup.py --budget-ms 120 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# `summary` nunca pregunta ni notifica: no debe cargar nada de esto.
+FORBIDDEN = ("typer", "rich", "subprocess", "worklog.runner", "worklog.notifier", "worklog.ui", "sqlite3")
+
+
+def parse_importtime(stderr: str) -> tuple[int, set[str]]:
+    """Retorna (microsegundos de imports de primer nivel, módulos importados)."""
+    total_us = 0
+    modules: set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        # primer nivel: un solo espacio antes del nombre (los anidados van indentados)
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us, modules
+
+
+def run_once(base_dir: str, command: list[str]) -> tuple[float, int, set[str]]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (SRC, os.environ.get("PYTHONPATH")) if p))
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "worklog", *command, "--base-dir", base_dir],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+    import_us, modules = parse_importtime(proc.stderr)
+    return wall_ms, import_us, modules
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--runs", type=int, default=7)
+    p.add_argument("--budget-ms", type=float, default=120.0, help="Presupuesto para el tiempo de imports (mediana).")
+    p.add_argument("--json", action="store_true", help="Salida JSON (una línea).")
+    a = p.parse_args()
+
+    command = ["summary", "--week", "2026-W06"]
+    walls: list[float] = []
+    imports: list[float] = []
+    seen: set[str] = set()
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(a.runs):
+            wall_ms, import_us, modules = run_once(tmp, command)
+            walls.append(wall_ms)
+            imports.append(import_us / 1000)
+            seen |= modules
+
+    forbidden = sorted(m for m in seen if m.split(".")[0] in FORBIDDEN or m in FORBIDDEN)
+    result = {
+        "benchmark": "startup.summary",
+        "runs": a.runs,
+        "wall_ms_median": round(statistics.median(walls), 2),
+        "import_ms_median": round(statistics.median(imports), 2),
+        "budget_ms": a.budget_ms,
+        "forbidden_imports": forbidden,
+    }
+    ok = result["import_ms_median"] <= a.budget_ms and not forbidden
+    result["ok"] = ok
+
+    if a.json:
+        print(json.dumps(result))
+    else:
+        for k, v in result.items():
+            print(f"{k}: {v}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
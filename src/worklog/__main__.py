@@ -2,37 +2,84 @@ import logging
 import os
 import sys
 
-from .cli import app
+# Subcomandos que no necesitan Typer/Rich: se parsean con argparse (config.parse_args)
+# e importan solo sus módulos. `run` sigue pasando por la app Typer de cli.py.
+_LIGHT_COMMANDS = ("summary", "migrate", "search", "compact", "tail")
+
+
+class _LazyFileHandler(logging.FileHandler):
+    """Crea la carpeta y abre worklog.log solo cuando se escribe el primer registro."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path, encoding="utf-8", delay=True)
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        except OSError:
+            pass
+        return super()._open()
 
 
 def _setup_logging(base_dir: str) -> None:
     root = logging.getLogger()
     if root.handlers:
         return
-    try:
-        os.makedirs(base_dir, exist_ok=True)
-    except Exception:
-        base_dir = os.getcwd()
-    log_path = os.path.join(base_dir, "worklog.log")
+    log_path = os.path.join(os.path.abspath(base_dir), "worklog.log")
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
         handlers=[
-            logging.FileHandler(log_path, encoding="utf-8"),
+            _LazyFileHandler(log_path),
             logging.StreamHandler(),
         ],
     )
 
 
+def _run_light(args: list[str]) -> None:
+    from .config import parse_args
+
+    command, cfg = parse_args(args)
+    _setup_logging(cfg.base_dir)
+
+    if command == "summary":
+        from .weekly import weekly_summary
+
+        weekly_summary(cfg)
+    elif command == "migrate":
+        from .sqlite_store import migrate
+
+        migrate(cfg)
+    elif command == "search":
+        from .search import search
+
+        search(cfg)
+    elif command == "compact":
+        from .archive import compact
+
+        compact(cfg)
+    elif command == "tail":
+        from .tail import tail
+
+        tail(cfg)
+
+
 def main() -> None:
-    base_dir = "logs"
     args = sys.argv[1:]
+    if args and args[0] in _LIGHT_COMMANDS:
+        _run_light(args)
+        return
+
+    base_dir = "logs"
     if "--base-dir" in args:
         idx = args.index("--base-dir")
         if idx + 1 < len(args):
             base_dir = args[idx + 1]
 
     _setup_logging(base_dir)
+
+    from .cli import app
+
     app()
 
 
@@ -0,0 +1,214 @@
+from datetime import date
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .domain import EntryBatch, NO_TAGS, day_ordinal
+
+KEYS = ("day", "tag", "hour", "weekday", "isoweek")
+WEEKDAYS = ("lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo")
+
+# Por debajo de este tamaño el costo de convertir a NumPy no compensa.
+NUMPY_MIN_ROWS = 4096
+
+
+def _numpy():
+    # Import perezoso: `summary` sin --group-by no debe cargar NumPy.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _numpy_for(batch: EntryBatch, use_numpy: bool | None):
+    # None: automático según el tamaño; un lote vacío no pasa por NumPy.
+    if not len(batch) or not (use_numpy or (use_numpy is None and len(batch) >= NUMPY_MIN_ROWS)):
+        return None
+    return _numpy()
+
+
+def parse_keys(spec: str | Sequence[str]) -> Tuple[str, ...]:
+    keys = tuple(k.strip() for k in (spec.split(",") if isinstance(spec, str) else spec) if k.strip())
+    for k in keys:
+        if k not in KEYS:
+            raise ValueError(f"Agrupación inválida '{k}'. Usa: {', '.join(KEYS)}.")
+    return keys
+
+
+def _day_label(key: str, day: str) -> Any:
+    o = day_ordinal(day)
+    if key == "day":
+        return day
+    if key == "weekday":
+        return (o - 1) % 7 if o else -1  # 0 = lunes, igual que date.weekday()
+    y, w, _ = date.fromordinal(o).isocalendar() if o else (0, 0, 0)
+    return f"{y}-W{w:02d}" if o else ""
+
+
+def _day_codes(batch: EntryBatch, key: str) -> Tuple[List[int], List[Any]]:
+    # Las claves derivadas de la fecha se calculan una vez por día distinto, no por entrada.
+    per_day = [_day_label(key, d) for d in batch.days]
+    labels = sorted(set(per_day))
+    rank = {label: i for i, label in enumerate(labels)}
+    return [rank[v] for v in per_day], labels
+
+
+class _Plan:
+    """Códigos enteros por fila y etiquetas por clave; las filas se expanden por tag si se agrupa por tag."""
+
+    def __init__(self, batch: EntryBatch, keys: Tuple[str, ...]) -> None:
+        self.batch = batch
+        self.keys = keys
+        self.labels: List[List[Any]] = []
+        self.day_luts: Dict[str, List[int]] = {}
+        for k in keys:
+            if k == "tag":
+                self.labels.append(list(batch.tags))
+            elif k == "hour":
+                self.labels.append(list(range(-1, 24)))  # -1: hora ilegible
+            else:
+                lut, labels = _day_codes(batch, k)
+                self.day_luts[k] = lut
+                self.labels.append(labels)
+        self.radix = [max(1, len(labels)) for labels in self.labels]
+
+    def decode(self, code: int) -> Any:
+        parts = []
+        for labels, r in zip(reversed(self.labels), reversed(self.radix)):
+            code, rem = divmod(code, r)
+            parts.append(labels[rem])
+        parts.reverse()
+        return parts[0] if len(parts) == 1 else tuple(parts)
+
+
+def _group_python(plan: _Plan) -> Dict[int, int]:
+    b = plan.batch
+    offsets, ids = b.tag_offsets, b.tag_ids
+    untagged = b.tags.index(NO_TAGS[0]) if "tag" in plan.keys and NO_TAGS[0] in b.tags else -1
+    acc: Dict[int, int] = {}
+
+    for i in range(len(b)):
+        m = b.minutes[i]
+        base = 0
+        tag_slot = -1
+        for pos, (k, r) in enumerate(zip(plan.keys, plan.radix)):
+            if k == "tag":
+                tag_slot = pos
+                c = 0
+            elif k == "hour":
+                c = b.start_min[i] // 60 + 1 if b.start_min[i] >= 0 else 0
+            else:
+                c = plan.day_luts[k][b.day_ids[i]]
+            base = base * r + c
+        if tag_slot < 0:
+            acc[base] = acc.get(base, 0) + m
+            continue
+        # multiplicador de la posición del tag dentro del código combinado
+        mult = 1
+        for r in plan.radix[tag_slot + 1:]:
+            mult *= r
+        lo, hi = offsets[i], offsets[i + 1]
+        for t in (ids[lo:hi] if lo != hi else (untagged,)):
+            code = base + t * mult
+            acc[code] = acc.get(code, 0) + m
+    return acc
+
+
+def _group_numpy(np, plan: _Plan) -> Dict[Any, int]:
+    b = plan.batch
+    n = len(b)
+    minutes = np.frombuffer(b.minutes, dtype=np.dtype(b.minutes.typecode)).astype(np.int64)
+    day_ids = np.frombuffer(b.day_ids, dtype=np.dtype(b.day_ids.typecode)).astype(np.int64)
+    start_min = np.frombuffer(b.start_min, dtype=np.dtype(b.start_min.typecode)).astype(np.int64)
+    rows = np.arange(n)
+    tag_codes = None
+
+    if "tag" in plan.keys:
+        offsets = np.frombuffer(b.tag_offsets, dtype=np.dtype(b.tag_offsets.typecode)).astype(np.int64)
+        counts = np.diff(offsets)
+        slots = np.maximum(counts, 1)  # las entradas sin tags ocupan una fila con "(sin tags)"
+        rows = np.repeat(rows, slots)
+        untagged = b.tags.index(NO_TAGS[0]) if NO_TAGS[0] in b.tags else 0
+        tag_codes = np.full(len(rows), untagged, dtype=np.int64)
+        tag_codes[np.repeat(counts > 0, slots)] = np.frombuffer(b.tag_ids, dtype=np.dtype(b.tag_ids.typecode))
+
+    combined = np.zeros(len(rows), dtype=np.int64)
+    for k, r in zip(plan.keys, plan.radix):
+        if k == "tag":
+            c = tag_codes
+        elif k == "hour":
+            sm = start_min[rows]
+            c = np.where(sm >= 0, sm // 60 + 1, 0)
+        else:
+            c = np.asarray(plan.day_luts[k], dtype=np.int64)[day_ids[rows]]
+        combined = combined * r + c
+
+    codes, inverse = np.unique(combined, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=minutes[rows], minlength=len(codes)).astype(np.int64).tolist()
+    # decodificar todas las claves de una vez (los códigos ya vienen ordenados)
+    columns = [
+        [labels[i] for i in idx.tolist()]
+        for labels, idx in zip(plan.labels, np.unravel_index(codes, plan.radix))
+    ]
+    groups = columns[0] if len(columns) == 1 else list(zip(*columns))
+    return dict(zip(groups, sums))
+
+
+def _sums_numpy(np, ids, minutes, n: int) -> List[int]:
+    # bincount sobre los códigos de día o de combinación de tags: sin ordenar nada
+    codes = np.frombuffer(ids, dtype=np.dtype(ids.typecode))
+    weights = np.frombuffer(minutes, dtype=np.dtype(minutes.typecode))
+    return np.bincount(codes, weights=weights, minlength=n).astype(np.int64).tolist()
+
+
+def group_by(batch: EntryBatch, keys: str | Sequence[str], use_numpy: bool | None = None) -> Dict[Any, int]:
+    """
+    Minutos por grupo. `keys` combina day, tag, hour, weekday e isoweek
+    (ej: "weekday,hour"); con varias claves el grupo es una tupla.
+    Los grupos salen ordenados por clave; los tags, en orden de primera aparición.
+    """
+    keys = parse_keys(keys)
+    if not keys:
+        raise ValueError("Indica al menos una clave de agrupación.")
+    plan = _Plan(batch, keys)
+
+    np = _numpy_for(batch, use_numpy)
+    if np is not None:
+        return _group_numpy(np, plan)
+    acc = _group_python(plan)
+    return {plan.decode(code): acc[code] for code in sorted(acc)}
+
+
+def _tagset_minutes(np, batch: EntryBatch) -> List[int]:
+    if np is None:
+        return batch.tagset_minutes()
+    return _sums_numpy(np, batch.tagset_ids, batch.minutes, len(batch.tagsets))
+
+
+def tag_tree(batch: EntryBatch, use_numpy: bool | None = None) -> Dict[str, int]:
+    # Minutos por combinación de tags y luego la clausura de ancestros de cada combinación
+    # (cacheada por TagRegistry): el costo por entrada es una suma, no una fila por ancestro.
+    return batch.tag_tree(_tagset_minutes(_numpy_for(batch, use_numpy), batch))
+
+
+def summarize(batch: EntryBatch, use_numpy: bool | None = None) -> dict:
+    """Mismo resultado que weekly._summarize, a partir de las columnas."""
+    np = _numpy_for(batch, use_numpy)
+    per_day = None if np is None else _sums_numpy(np, batch.day_ids, batch.minutes, len(batch.days))
+    return batch.summarize(per_day, _tagset_minutes(np, batch))
+
+
+def format_label(key: str, value: Any) -> str:
+    if key == "hour":
+        return f"{value:02d}:00" if value >= 0 else "(sin hora)"
+    if key == "weekday":
+        return WEEKDAYS[value] if value >= 0 else "(sin fecha)"
+    return str(value) if value != "" else "(sin fecha)"
+
+
+def group_lines(keys: Sequence[str], groups: Dict[Any, int]) -> List[str]:
+    lines: List[str] = []
+    for group, mins in groups.items():
+        values = group if len(keys) > 1 else (group,)
+        label = " · ".join(format_label(k, v) for k, v in zip(keys, values))
+        lines.append(f"- **{label}**: {mins} min ({round(mins/60, 2)} h)")
+    return lines
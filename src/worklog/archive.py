@@ -0,0 +1,328 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo
+
+from .atomic import write_text_atomic
+from .catalog import LAYOUT
+from .config import CompactConfig
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "worklog_archive"
+ARCHIVE_VERSION = 1
+INDEX_SUFFIX = ".idx.json"
+
+# Fuentes de entradas (mismo orden de precedencia que el catálogo) más el Markdown del día.
+KINDS: Tuple[Tuple[str, str, str], ...] = LAYOUT + (
+    ("md", "worklog_md", "_worklog.md"),
+    ("legacy_md", "", "_worklog.md"),
+)
+_SUBDIRS = {sub for _, sub, _ in KINDS if sub}
+_CSV_HEADER = b"date,start,end,minutes,activity,tags"  # storage.CSV_HEADER
+_BOM = b"\xef\xbb\xbf"
+
+_INDEX_CACHE: Dict[str, Tuple[int, dict]] = {}  # ruta del índice -> (mtime_ns, índice)
+_INDEX_LOCK = threading.Lock()
+
+
+def archive_dir(base_dir: str) -> str:
+    return os.path.join(base_dir, ARCHIVE_DIR)
+
+
+def index_path(base_dir: str, month: str) -> str:
+    return os.path.join(archive_dir(base_dir), f"{month}{INDEX_SUFFIX}")
+
+
+def day_path(base_dir: str, day: str, kind: str) -> str:
+    """Ruta que tenía el archivo del día antes de archivarse."""
+    for k, sub, suffix in KINDS:
+        if k == kind:
+            return os.path.join(base_dir, sub, f"{day}{suffix}") if sub else os.path.join(base_dir, f"{day}{suffix}")
+    raise ValueError(f"Tipo de archivo desconocido '{kind}'.")
+
+
+def load_index(path: str) -> dict | None:
+    """
+    Índice de un mes archivado: {"segment": "YYYY-MM-<hash>.gz", "days": {día: {tipo: registro}}}.
+    El registro es [offset, largo] o [offset, largo, bytes absorbidos, blake2b absorbido]: lo
+    que el segmento ya contiene del archivo suelto del día, por si no se pudo borrar.
+    Cacheado por mtime: leer varios días del mismo mes no vuelve a parsear el JSON.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        logger.warning("Unreadable archive index %s", path)
+        return None
+    if not isinstance(data, dict) or data.get("version") != ARCHIVE_VERSION:
+        return None
+    with _INDEX_LOCK:
+        _INDEX_CACHE[path] = (mtime, data)
+    return data
+
+
+def _locate(path: str) -> Tuple[str, str, str] | None:
+    # (base_dir, día, tipo) a partir de la ruta de un archivo por día.
+    parent, name = os.path.split(path)
+    for kind, sub, suffix in KINDS:
+        if not name.endswith(suffix) or len(name) != 10 + len(suffix):
+            continue
+        folder = os.path.basename(parent)
+        if sub and folder == sub:
+            return os.path.dirname(parent), name[:10], kind
+        if not sub and folder not in _SUBDIRS:
+            return parent, name[:10], kind
+    return None
+
+
+def _read_blob(segment: str, offset: int, length: int) -> bytes:
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(length))
+
+
+def read_member(base_dir: str, day: str, kind: str) -> bytes | None:
+    """Contenido original del archivo `kind` del día, descomprimiendo solo ese miembro."""
+    idx = load_index(index_path(base_dir, day[:7]))
+    rec = ((idx or {}).get("days") or {}).get(day, {}).get(kind)
+    if not rec:
+        return None
+    return _read_blob(os.path.join(archive_dir(base_dir), idx["segment"]), rec[0], rec[1])
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _unabsorbed(kind: str, fresh: bytes, rec: list | None) -> bytes:
+    """
+    Parte del archivo suelto que el segmento aún no contiene. Si una compactación
+    no pudo borrarlo (archivo abierto en Windows, corte), lo ya absorbido no se repite.
+    """
+    if not rec or len(rec) < 4 or len(fresh) < rec[2] or _digest(fresh[:rec[2]]) != rec[3]:
+        return fresh
+    if kind.endswith("md"):
+        # el Markdown se regenera entero: o es el absorbido o lo reemplaza
+        return b"" if len(fresh) == rec[2] else fresh
+    return fresh[rec[2]:]
+
+
+def read_archived(path: str) -> bytes | None:
+    """
+    Contenido de un día archivado tal como se vería sin archivar: lo archivado más
+    lo que se agregó después en la ruta del día. None si el día no está archivado.
+    """
+    loc = _locate(path)
+    if not loc:
+        return None
+    base_dir, day, kind = loc
+    idx = load_index(index_path(base_dir, day[:7]))
+    rec = ((idx or {}).get("days") or {}).get(day, {}).get(kind)
+    if not rec:
+        return None
+    data = _read_blob(os.path.join(archive_dir(base_dir), idx["segment"]), rec[0], rec[1])
+    try:
+        with open(path, "rb") as f:
+            fresh = _unabsorbed(kind, f.read(), rec)
+    except FileNotFoundError:
+        return data
+    return _merge(kind, data, fresh) if fresh else data
+
+
+def archived_days(base_dir: str) -> Dict[str, Dict[str, str]]:
+    """día -> tipo -> ruta del segmento, para todos los meses archivados."""
+    out: Dict[str, Dict[str, str]] = {}
+    folder = archive_dir(base_dir)
+    try:
+        names = sorted(n for n in os.listdir(folder) if n.endswith(INDEX_SUFFIX))
+    except OSError:
+        return out
+    for name in names:
+        idx = load_index(os.path.join(folder, name))
+        if not idx:
+            continue
+        segment = os.path.join(folder, idx["segment"])
+        for day, kinds in idx["days"].items():
+            out.setdefault(day, {}).update({k: segment for k in kinds})
+    return out
+
+
+# -------------------------
+# Compactación
+# -------------------------
+
+@dataclass
+class CompactResult:
+    months: int = 0
+    days: int = 0
+    files: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+def _live_files(base_dir: str) -> Dict[str, Dict[str, Dict[str, str]]]:
+    # mes -> día -> tipo -> ruta, con un escaneo por carpeta
+    out: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for kind, sub, suffix in KINDS:
+        folder = os.path.join(base_dir, sub) if sub else base_dir
+        try:
+            it = os.scandir(folder)
+        except OSError:
+            continue
+        with it:
+            for de in it:
+                name = de.name
+                if len(name) == 10 + len(suffix) and name.endswith(suffix) and de.is_file():
+                    day = name[:10]
+                    out.setdefault(day[:7], {}).setdefault(day, {})[kind] = de.path
+    return out
+
+
+def _merge(kind: str, archived: bytes, live: bytes) -> bytes:
+    """
+    Un día ya archivado que volvió a recibir entradas: JSONL y CSV son solo-agregar,
+    así que lo suelto va a continuación de lo archivado (el CSV sin su encabezado).
+    El Markdown es derivado: el suelto reemplaza al archivado.
+    """
+    if not archived or kind.endswith("md"):
+        return live
+    if not archived.endswith(b"\n"):
+        archived += b"\n"
+    if kind.endswith("csv"):
+        first, _, rest = live.partition(b"\n")
+        if first.removeprefix(_BOM).rstrip(b"\r") == _CSV_HEADER:
+            live = rest
+    return archived + live
+
+
+def _compact_month(base_dir: str, month: str, live: Dict[str, Dict[str, str]], result: CompactResult) -> None:
+    folder = archive_dir(base_dir)
+    os.makedirs(folder, exist_ok=True)
+    old = load_index(index_path(base_dir, month))
+    old_days = (old or {}).get("days") or {}
+    old_segment = os.path.join(folder, old["segment"]) if old else ""
+
+    tmp = os.path.join(folder, f"{month}.gz.{os.getpid()}.tmp")
+    index: Dict[str, Dict[str, List[int]]] = {}
+    expected: List[Tuple[str, str, bytes]] = []  # (día, tipo, hash) para verificar antes de borrar
+    h = hashlib.blake2b(digest_size=8)
+    try:
+        with open(tmp, "wb") as out:
+            for day in sorted(set(old_days) | set(live)):
+                for kind, _, _ in KINDS:
+                    path = live.get(day, {}).get(kind)
+                    rec = old_days.get(day, {}).get(kind)
+                    if not path and not rec:
+                        continue
+                    data = _read_blob(old_segment, rec[0], rec[1]) if rec else b""
+                    absorbed: list = []
+                    if path:
+                        with open(path, "rb") as f:
+                            fresh = f.read()
+                        result.bytes_in += len(fresh)
+                        remainder = _unabsorbed(kind, fresh, rec)
+                        if remainder:
+                            data = _merge(kind, data, remainder)
+                        absorbed = [len(fresh), _digest(fresh)]
+                    # un miembro gzip por archivo: cada día se descomprime por separado
+                    blob = gzip.compress(data, mtime=0)
+                    index.setdefault(day, {})[kind] = [out.tell(), len(blob)] + absorbed
+                    out.write(blob)
+                    h.update(blob)
+                    expected.append((day, kind, hashlib.blake2b(data, digest_size=16).digest()))
+            out.flush()
+            os.fsync(out.fileno())
+
+        for day, kind, digest in expected:
+            off, length = index[day][kind][:2]
+            if hashlib.blake2b(_read_blob(tmp, off, length), digest_size=16).digest() != digest:
+                raise OSError(f"verificación fallida en {tmp} ({day} {kind})")
+
+        segment_name = f"{month}-{h.hexdigest()}.gz"
+        segment = os.path.join(folder, segment_name)
+        os.replace(tmp, segment)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+    # El índice se publica después del segmento: siempre apunta a un segmento completo.
+    # Registra lo absorbido de cada archivo suelto: si borrarlo falla, no se lee dos veces.
+    write_text_atomic(
+        index_path(base_dir, month),
+        json.dumps({"version": ARCHIVE_VERSION, "month": month, "segment": segment_name, "days": index}, sort_keys=True),
+    )
+    if old_segment and old_segment != segment:
+        os.remove(old_segment)
+
+    for kinds in live.values():
+        for path in kinds.values():
+            try:
+                os.remove(path)
+            except OSError as e:
+                # abierto por otro proceso (Windows): queda absorbido y se reintenta en la próxima compactación
+                logger.warning("Could not remove compacted file %s: %s", path, e)
+                continue
+            result.files += 1
+    result.months += 1
+    result.days += len(live)
+    result.bytes_out += os.path.getsize(segment)
+    logger.info("Compacted %s: %s days into %s", month, len(live), segment)
+
+
+def compact_months(base_dir: str, before: str, dry_run: bool = False) -> CompactResult:
+    """Archiva los archivos por día de los meses anteriores a `before` (YYYY-MM)."""
+    result = CompactResult()
+    for month, days in sorted(_live_files(base_dir).items()):
+        if month >= before:
+            continue
+        if dry_run:
+            result.months += 1
+            result.days += len(days)
+            for kinds in days.values():
+                result.files += len(kinds)
+                result.bytes_in += sum(os.path.getsize(p) for p in kinds.values())
+            continue
+        _compact_month(base_dir, month, days, result)
+    return result
+
+
+def compact(cfg: CompactConfig) -> None:
+    current = datetime.now(ZoneInfo(cfg.tz_name)).strftime("%Y-%m")
+    before = cfg.before or current
+    try:
+        datetime.strptime(before, "%Y-%m")
+    except ValueError:
+        raise ValueError(f"Mes inválido '{before}'. Usa YYYY-MM.") from None
+    if before > current:
+        # el mes en curso sigue abierto: `worklog run` escribe en el archivo de hoy
+        raise ValueError(f"--before {before} incluye el mes en curso; solo se archivan meses cerrados (máximo {current}).")
+
+    r = compact_months(cfg.base_dir, before, cfg.dry_run)
+    if not r.months:
+        print(f"✅ Nada que compactar antes de {before}.")
+        return
+    if cfg.dry_run:
+        print(f"🔍 Se compactarían {r.months} mes(es): {r.days} días, {r.files} archivos ({r.bytes_in / 1024:.1f} KB).")
+        return
+    print(
+        f"✅ Compactados {r.months} mes(es): {r.days} días, {r.files} archivos "
+        f"({r.bytes_in / 1024:.1f} KB → {r.bytes_out / 1024:.1f} KB en {ARCHIVE_DIR}/)."
+    )
@@ -0,0 +1,329 @@
+import sys
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from .config import RunConfig
+from .clock import now, iso, seconds_until
+from .domain import Entry
+from .scheduler import next_deadline
+from .workcal import WorkCalendar
+from .ui import choose_activity, print_matches, pick_match, console
+from .runner import (
+    DEFAULT_ACTIVITY,
+    RuntimeState,
+    _build_calendar,
+    _init_state,
+    _rotate_if_new_day,
+    _should_tick,
+    _notify_if_enabled,
+    _is_break_block,
+    _build_entry,
+    _save_entry,
+    _flush_exports,
+    _print_block,
+    _remember,
+    _report_clock_jump,
+    _sync_deadline,
+    CATCH_UP_BLOCKS,
+    _missed_blocks,
+    _blocks_before_reset,
+    _catch_up_entries,
+    _print_catch_up,
+    _notify_catch_up,
+    _save_batch,
+    SAVED_MSG,
+    SAVED_BATCH_MSG,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _StdinReader:
+    """Hilo que lee stdin línea a línea y las entrega a una cola asyncio."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue()
+        threading.Thread(target=self._pump, name="worklog-stdin", daemon=True).start()
+
+    def _pump(self) -> None:
+        while True:
+            line = sys.stdin.readline()
+            if not line:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+                return
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, line.rstrip("\r\n"))
+
+    async def ainput(self, prompt: str, timeout_seconds: int = 0, default: str = "") -> tuple[str, bool]:
+        print(prompt, end="", flush=True)
+        try:
+            if timeout_seconds > 0:
+                line = await asyncio.wait_for(self.queue.get(), timeout_seconds)
+            else:
+                line = await self.queue.get()
+        except asyncio.TimeoutError:
+            print("")
+            return default, True
+        if line is None:
+            raise EOFError
+        return line, False
+
+
+class _IoLane:
+    """
+    Un único hilo para el I/O de la fuente (store y ledger); el Markdown lo regenera ExportWorker.
+    Las escrituras se encolan sin bloquear el prompt y se ejecutan en orden.
+    Los mensajes para el usuario se imprimen en el loop, nunca desde el hilo de I/O.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="worklog-io")
+        self.pending: set[asyncio.Future] = set()
+
+    def submit(self, fn: Callable, *args: Any, done_msg: str = "") -> None:
+        fut = self.loop.run_in_executor(self.executor, fn, *args)
+        self.pending.add(fut)
+        fut.add_done_callback(lambda f: self._done(f, done_msg))
+
+    def _done(self, fut: asyncio.Future, done_msg: str) -> None:
+        # Los callbacks corren en el hilo del loop, en orden de registro (antes que drain).
+        self.pending.discard(fut)
+        if fut.cancelled():
+            return
+        if fut.exception():
+            logger.error("Background I/O failed", exc_info=fut.exception())
+        elif done_msg:
+            print(done_msg)
+
+    async def call(self, fn: Callable, *args: Any) -> Any:
+        return await self.loop.run_in_executor(self.executor, fn, *args)
+
+    async def drain(self) -> None:
+        if self.pending:
+            await asyncio.gather(*list(self.pending), return_exceptions=True)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+async def _aprompt_multiline(reader: _StdinReader, msg: str) -> str:
+    console.print(f"[bold cyan]{msg}[/bold cyan]")
+    console.print("[dim](Termina con una línea vacía)[/dim]")
+    lines: list[str] = []
+    while True:
+        line, _ = await reader.ainput("")
+        if line.strip() == "":
+            break
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+async def _acollect_activity(reader: _StdinReader, choice: str, state: RuntimeState) -> str:
+    # Igual que runner._collect_activity, leyendo desde la cola de stdin.
+    normalized = choice.strip().lower()
+
+    if normalized.startswith("/"):
+        query = choice.strip()[1:]
+        matches = state.suggestions.lookup(query)
+        print_matches(query, matches)
+        picked = ""
+        if matches:
+            answer, _ = await reader.ainput("Elige (1..n) o Enter para escribir una nueva: ")
+            picked = pick_match(answer, matches)
+    elif normalized and normalized not in ("s", "b", "r") and not normalized.isdigit():
+        return choice.strip() or DEFAULT_ACTIVITY
+    else:
+        picked = choose_activity(choice, state.last_activities, state.suggestions.last())
+
+    if normalized in ("s", "b"):
+        return picked.strip() or DEFAULT_ACTIVITY
+
+    if not picked:
+        picked = await _aprompt_multiline(reader, "Describe lo que hiciste (multilínea):")
+    else:
+        console.print("\n[bold]Actividad seleccionada.[/bold] ¿Editar? (Enter=no / escribe algo=sí)")
+        answer, _ = await reader.ainput("> ")
+        if answer.strip():
+            picked = await _aprompt_multiline(reader, "Nueva actividad (multilínea):")
+
+    return picked.strip() or DEFAULT_ACTIVITY
+
+
+class _AsyncRunner:
+    def __init__(self, cfg: RunConfig, tz: ZoneInfo, calendar: WorkCalendar, state: RuntimeState) -> None:
+        self.cfg = cfg
+        self.tz = tz
+        self.calendar = calendar
+        self.state = state
+        self.loop = asyncio.get_running_loop()
+        self.io = _IoLane(self.loop)
+        self.reader = _StdinReader(self.loop)
+        self.tasks: set[asyncio.Task] = set()
+
+    def _notify(self, tick_end) -> None:
+        # El toast corre en otro hilo: el prompt no espera a PowerShell.
+        task = asyncio.create_task(
+            asyncio.to_thread(_notify_if_enabled, self.cfg, self.tz, self.state.tick_start, tick_end)
+        )
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def _persist(self, entry: Entry, tick_end) -> None:
+        self.io.submit(_save_entry, self.state, entry, done_msg=SAVED_MSG)
+        self.state.tick_start = tick_end
+
+    async def _rotate(self) -> None:
+        if self.state.store.day == now(self.tz).strftime("%Y-%m-%d"):
+            return
+        await self.io.drain()
+        await self.io.call(_rotate_if_new_day, self.cfg, self.tz, self.state)
+
+    async def _ensure_work_time(self) -> None:
+        n = now(self.tz)
+        if self.calendar.is_work_time(n):
+            return
+
+        await self.io.call(_flush_exports, self.state)
+        nxt = self.calendar.next_work_start(n)
+        wait = seconds_until(nxt, self.tz)
+        print(f"🧊 Fuera de horario. Próximo inicio: {iso(nxt)} (en {wait//60} min).")
+        await self.state.scheduler.asleep_through(nxt)
+        self.state.tick_start = min(nxt, now(self.tz))
+
+    async def _handle_catch_up(self, blocks) -> bool:
+        # Misma lógica que runner._handle_catch_up: una pregunta, una escritura por lotes.
+        cfg, state = self.cfg, self.state
+        task = asyncio.create_task(asyncio.to_thread(_notify_catch_up, cfg, blocks))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+        activity, tags = DEFAULT_ACTIVITY, cfg.tags
+        if not all(_is_break_block(state, s, e) for s, e in blocks):
+            _print_catch_up(state, blocks)
+            choice_raw, timed_out = await self.reader.ainput("> ", cfg.input_timeout_sec, default="")
+            choice = choice_raw.strip()
+            if not choice.startswith("/"):
+                choice = choice.lower()
+
+            if timed_out:
+                print(f"⏰ Sin respuesta. Se registrarán automáticamente como '{DEFAULT_ACTIVITY}'.")
+            elif choice == "q":
+                return False
+            else:
+                activity = await _acollect_activity(self.reader, choice, state)
+                tags_raw, tags_timeout = await self.reader.ainput(
+                    f"Tags (Enter para '{cfg.tags}'): ", cfg.input_timeout_sec, default=cfg.tags
+                )
+                tags = cfg.tags if tags_timeout else (tags_raw.strip() or cfg.tags)
+                _remember(state, activity, blocks[-1][0])
+
+        entries = _catch_up_entries(state, blocks, activity, tags)
+        self.io.submit(_save_batch, state, entries, done_msg=SAVED_BATCH_MSG.format(n=len(entries)))
+        state.tick_start = blocks[-1][1]
+        return True
+
+    async def _handle_tick(self) -> bool:
+        cfg, state = self.cfg, self.state
+        # Que el "💾 Guardado." del bloque anterior salga antes del nuevo prompt.
+        await self.io.drain()
+        blocks = _missed_blocks(cfg, state, now(self.tz))
+        if len(blocks) >= CATCH_UP_BLOCKS:
+            return await self._handle_catch_up(blocks)
+
+        tick_end = state.tick_start + timedelta(minutes=cfg.minutes)
+        if cfg.notify:
+            self._notify(tick_end)
+
+        if _is_break_block(state, state.tick_start, tick_end):
+            self._persist(_build_entry(state.tick_start, tick_end, "(break / descanso)", ""), tick_end)
+            return True
+
+        _print_block(state, tick_end)
+        choice_raw, timed_out = await self.reader.ainput("> ", cfg.input_timeout_sec, default="")
+        choice = choice_raw.strip()
+        if not choice.startswith("/"):
+            choice = choice.lower()
+
+        if timed_out:
+            print(f"⏰ Sin respuesta. Se registrará automáticamente como '{DEFAULT_ACTIVITY}'.")
+            self._persist(_build_entry(state.tick_start, tick_end, DEFAULT_ACTIVITY, cfg.tags), tick_end)
+            return True
+
+        if choice == "q":
+            return False
+
+        activity = await _acollect_activity(self.reader, choice, state)
+        tags_raw, tags_timeout = await self.reader.ainput(
+            f"Tags (Enter para '{cfg.tags}'): ", cfg.input_timeout_sec, default=cfg.tags
+        )
+        tags = cfg.tags if tags_timeout else (tags_raw.strip() or cfg.tags)
+
+        _remember(state, activity, state.tick_start)
+        self._persist(_build_entry(state.tick_start, tick_end, activity, tags), tick_end)
+        return True
+
+    async def _wait_for_next_deadline(self) -> None:
+        state = self.state
+        n = now(self.tz)
+        deadline = next_deadline(
+            n,
+            state.tick_start + timedelta(minutes=self.cfg.minutes),
+            self.calendar,
+            state.break_start,
+            state.break_end,
+        )
+        deadline = _sync_deadline(deadline, n, await self.io.call(state.store.sync_if_due))
+        if await state.scheduler.asleep_until(deadline):
+            _report_clock_jump()
+
+    async def loop_forever(self) -> None:
+        try:
+            while True:
+                blocks = _blocks_before_reset(self.cfg, self.tz, self.state)
+                if blocks and not await self._handle_catch_up(blocks):
+                    return
+                await self._rotate()
+                await self._ensure_work_time()
+
+                if _should_tick(self.cfg, self.tz, self.state) and not await self._handle_tick():
+                    return
+
+                await self._wait_for_next_deadline()
+        except EOFError:
+            return
+        finally:
+            await self.io.drain()
+            if self.tasks:
+                await asyncio.gather(*list(self.tasks), return_exceptions=True)
+            self.io.shutdown()
+
+
+def run_async(cfg: RunConfig) -> None:
+    """
+    Variante asyncio de runner.run: notificaciones, persistencia y export del
+    Markdown corren como tareas concurrentes; el prompt solo espera a la terminal.
+    """
+    tz = ZoneInfo(cfg.tz_name)
+    calendar = _build_calendar(cfg, tz)
+    state = _init_state(cfg, tz, calendar)
+
+    async def main() -> None:
+        await _AsyncRunner(cfg, tz, calendar, state).loop_forever()
+
+    try:
+        asyncio.run(main())
+        _flush_exports(state)
+        print(f"👋 Cerrando. Markdown exportado: {state.paths['md']}")
+    except KeyboardInterrupt:
+        state.store.commit()
+        _flush_exports(state)
+        print(f"\n👋 Interrumpido. Markdown exportado: {state.paths['md']}")
+    finally:
+        state.exports.close()
+        state.store.close()
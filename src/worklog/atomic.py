@@ -0,0 +1,130 @@
+import os
+import time
+import threading
+import hashlib
+import logging
+from typing import TextIO
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1 << 16
+_REPLACE_RETRIES = 5  # en Windows el cliente de sync o un editor pueden tener el archivo abierto un instante
+
+
+def _digest(path: str) -> bytes | None:
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.digest()
+
+
+def _same_content(a: str, b: str) -> bool:
+    try:
+        if os.path.getsize(a) != os.path.getsize(b):
+            return False
+    except OSError:
+        return False
+    return _digest(a) == _digest(b)
+
+
+def _tmp_path(path: str) -> str:
+    # pid e id del hilo: el loop y ExportWorker pueden escribir el mismo destino a la vez
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _replace(tmp: str, path: str) -> None:
+    for attempt in range(_REPLACE_RETRIES):
+        try:
+            os.replace(tmp, path)
+            return
+        except PermissionError:
+            if attempt == _REPLACE_RETRIES - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+def _commit(tmp: str, path: str) -> bool:
+    # Sin cambios: se descarta el temporal y el destino queda intacto (ni mtime ni subida del sync).
+    if _same_content(tmp, path):
+        os.remove(tmp)
+        return False
+    _replace(tmp, path)
+    return True
+
+
+class AtomicWriter:
+    """
+    Escribe un reporte en un temporal junto al destino y al cerrar lo reemplaza
+    con os.replace, solo si el contenido cambió. Un corte a mitad de escritura
+    deja el reporte anterior completo. `changed` indica si se reemplazó.
+    Con durable=False no se hace fsync (cachés que se pueden recalcular).
+
+        w = AtomicWriter(path)
+        with w as f:
+            f.write(...)
+    """
+
+    def __init__(self, path: str, durable: bool = True) -> None:
+        self.path = path
+        self.tmp = _tmp_path(path)
+        self.durable = durable
+        self.changed = False
+        self._f: TextIO | None = None
+
+    def __enter__(self) -> TextIO:
+        self._f = open(self.tmp, "w", encoding="utf-8")
+        return self._f
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        f, self._f = self._f, None
+        try:
+            if exc_type is None and self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            f.close()
+        if exc_type is not None:
+            try:
+                os.remove(self.tmp)
+            except OSError:
+                pass
+            return
+        self.changed = _commit(self.tmp, self.path)
+        if not self.changed:
+            logger.debug("Unchanged, not rewritten: %s", self.path)
+
+
+def write_text_atomic(path: str, text: str, durable: bool = True) -> bool:
+    """
+    Igual que AtomicWriter para un texto ya armado: si el archivo ya tiene ese
+    contenido ni siquiera se crea el temporal. Retorna True si el archivo cambió.
+    """
+    # mismos bytes que open(path, "w") en esta plataforma
+    data = (text if os.linesep == "\n" else text.replace("\n", os.linesep)).encode("utf-8")
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+
+    tmp = _tmp_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        _replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return True
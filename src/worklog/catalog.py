@@ -0,0 +1,130 @@
+import os
+import time
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+# (tipo, carpeta relativa a base_dir, sufijo) en orden de precedencia por día.
+LAYOUT: Tuple[Tuple[str, str, str], ...] = (
+    ("jsonl", "worklog_json", "_worklog.jsonl"),
+    ("csv", "worklog_csv", "_worklog.csv"),
+    ("legacy_jsonl", "", "_worklog.jsonl"),
+    ("legacy_csv", "", "_worklog.csv"),
+)
+
+ARCHIVE_SUBDIR = "worklog_archive"  # meses compactados (ver archive.py)
+
+# Un archivo creado en el mismo instante del escaneo podría no cambiar el mtime de la carpeta:
+# si el escaneo fue muy cerca de ese mtime, se vuelve a escanear la próxima vez.
+_SETTLE_NS = 2_000_000_000
+_MISSING = -1  # la carpeta no existe
+
+
+class Source(NamedTuple):
+    kind: str
+    path: str          # ruta por día (puede no existir si el día está archivado)
+    segment: str = ""  # segmento comprimido que lo contiene, si está archivado
+
+    @property
+    def stat_path(self) -> str:
+        return self.segment or self.path
+
+
+class LogCatalog:
+    """
+    Mapa día -> fuentes existentes (en orden de precedencia), armado con un
+    os.scandir por carpeta. Se cachea por mtime de carpeta: un rango de N días
+    cuesta un stat por carpeta en lugar de probar cada formato de cada día.
+    Los días archivados por `worklog compact` aparecen con su segmento; si un
+    tipo existe suelto y archivado, la fuente lee ambos. Nunca crea carpetas.
+    """
+
+    def __init__(self, base_dir: str) -> None:
+        self.base_dir = base_dir
+        self._dirs: Dict[str, int | None] = {}  # carpeta -> mtime_ns del último escaneo confiable (o _MISSING)
+        self._files: Dict[str, Dict[str, Dict[str, str]]] = {}  # carpeta -> sufijo -> día -> ruta
+        self._archived: Dict[str, Dict[str, str]] = {}  # día -> tipo -> segmento
+        self._days: Dict[str, List[Source]] = {}
+        self._lock = threading.Lock()
+
+    def _folders(self) -> List[str]:
+        folders = [os.path.join(self.base_dir, sub) if sub else self.base_dir for _, sub, _ in LAYOUT]
+        return list(dict.fromkeys(folders + [os.path.join(self.base_dir, ARCHIVE_SUBDIR)]))
+
+    def _scan(self, folder: str) -> Dict[str, Dict[str, str]]:
+        if os.path.basename(folder) == ARCHIVE_SUBDIR:
+            from .archive import archived_days
+
+            self._archived = archived_days(self.base_dir)
+            return {}
+        by_suffix: Dict[str, Dict[str, str]] = {suffix: {} for _, _, suffix in LAYOUT}
+        try:
+            with os.scandir(folder) as it:
+                for de in it:
+                    for suffix, days in by_suffix.items():
+                        if de.name.endswith(suffix):
+                            days[de.name[: -len(suffix)]] = de.path
+                            break
+        except OSError:
+            pass
+        return by_suffix
+
+    def refresh(self) -> bool:
+        """Re-escanea las carpetas cuyo mtime cambió. Retorna True si algo cambió."""
+        with self._lock:
+            changed = False
+            for folder in self._folders():
+                try:
+                    mtime = os.stat(folder).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if mtime is None:
+                    if self._dirs.get(folder) == _MISSING:
+                        continue
+                    self._files[folder] = {}
+                    self._dirs[folder] = _MISSING
+                    if os.path.basename(folder) == ARCHIVE_SUBDIR:
+                        self._archived = {}
+                elif self._dirs.get(folder) == mtime:
+                    continue
+                else:
+                    self._files[folder] = self._scan(folder)
+                    self._dirs[folder] = None if time.time_ns() - mtime < _SETTLE_NS else mtime
+                changed = True
+            if changed:
+                self._rebuild()
+            return changed
+
+    def _rebuild(self) -> None:
+        days: Dict[str, List[Source]] = {}
+        for kind, sub, suffix in LAYOUT:
+            folder = os.path.join(self.base_dir, sub) if sub else self.base_dir
+            live = self._files.get(folder, {}).get(suffix, {})
+            for day, path in live.items():
+                days.setdefault(day, []).append(Source(kind, path))
+            # Si el tipo existe suelto y archivado, la fuente es la ruta del día:
+            # read_jsonl/read_csv devuelven lo archivado seguido de lo suelto.
+            for day, kinds in self._archived.items():
+                if kind in kinds and day not in live:
+                    path = os.path.join(folder, f"{day}{suffix}")
+                    days.setdefault(day, []).append(Source(kind, path, kinds[kind]))
+        # Las fuentes de cada día quedan en el orden de LAYOUT.
+        self._days = days
+
+    def sources(self, day: str) -> List[Source]:
+        return self._days.get(day, [])
+
+    def days(self) -> List[str]:
+        return sorted(self._days)
+
+
+_CATALOGS: Dict[str, LogCatalog] = {}
+
+
+def get_catalog(base_dir: str) -> LogCatalog:
+    """Catálogo compartido por proceso para `base_dir`, actualizado si alguna carpeta cambió."""
+    key = os.path.abspath(base_dir)
+    cat = _CATALOGS.get(key)
+    if cat is None:
+        cat = _CATALOGS[key] = LogCatalog(base_dir)
+    cat.refresh()
+    return cat
@@ -1,10 +1,19 @@
 import typer
 
-from .config import RunConfig, SummaryConfig
-from .runner import run
-from .weekly import weekly_summary
+from .config import RunConfig
 
-app = typer.Typer(help="Worklog PRO (Windows + horario Colombia)")
+# Solo `run`: summary, migrate, search, compact y tail se definen una sola vez con
+# argparse (config.build_parser) y __main__ los despacha sin cargar Typer.
+app = typer.Typer(
+    help="Worklog PRO (Windows + horario Colombia)",
+    epilog="Otros subcomandos: summary, migrate, search, compact, tail (worklog <subcomando> --help).",
+)
+
+
+@app.callback()
+def root() -> None:
+    # Con un único comando Typer lo volvería la app raíz; el callback mantiene `worklog run`.
+    pass
 
 
 @app.command("run")
@@ -21,6 +30,9 @@ def run_command(
     break_end: str = typer.Option("14:00", help="Fin de break HH:MM."),
     break_enabled: bool = typer.Option(True, "--break/--no-break", help="Break automático."),
     input_timeout: int = typer.Option(120, help="Segundos para esperar respuesta antes de auto-registrar."),
+    durability: str = typer.Option("fsync", help="Durabilidad de escritura: flush, fsync o group."),
+    backend: str = typer.Option("files", help="Almacenamiento: files (JSONL/CSV) o sqlite."),
+    async_mode: bool = typer.Option(False, "--async", help="Runner asyncio: notificaciones y guardado no bloquean el prompt."),
 ) -> None:
     cfg = RunConfig(
         minutes=max(1, int(minutes)),
@@ -35,21 +47,16 @@ def run_command(
         break_end=break_end,
         break_enabled=bool(break_enabled),
         input_timeout_sec=max(0, int(input_timeout)),
+        durability=durability,
+        backend=backend,
+        async_mode=bool(async_mode),
     )
-    run(cfg)
+    # Imports diferidos: cada subcomando carga solo lo que usa.
+    if cfg.async_mode:
+        from .async_runner import run_async
 
+        run_async(cfg)
+    else:
+        from .runner import run
 
-@app.command("summary")
-def summary_command(
-    base_dir: str = typer.Option("logs", help="Carpeta donde están los logs."),
-    tz: str = typer.Option("America/Bogota", help="Timezone IANA."),
-    week: str = typer.Option("current", help="Semana ISO: current o YYYY-Www."),
-    details: bool = typer.Option(False, "--details", help="Incluye detalle por entradas."),
-) -> None:
-    cfg = SummaryConfig(
-        base_dir=base_dir,
-        tz_name=tz,
-        week=week,
-        include_details=bool(details),
-    )
-    weekly_summary(cfg)
+        run(cfg)
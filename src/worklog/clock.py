@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from zoneinfo import ZoneInfo
 
 @dataclass(frozen=True)
@@ -24,25 +24,6 @@ def now(tz: ZoneInfo) -> datetime:
 def iso(dt: datetime) -> str:
     return dt.isoformat(timespec="seconds")
 
-def is_work_time(dt: datetime, w: WorkWindow) -> bool:
-    # Lunes=0 ... Domingo=6
-    if dt.weekday() >= 5:
-        return False
-    start = dt.replace(hour=w.start_h, minute=w.start_m, second=0, microsecond=0)
-    end = dt.replace(hour=w.end_h, minute=w.end_m, second=0, microsecond=0)
-    return start <= dt < end
-
-def next_work_start(dt: datetime, w: WorkWindow) -> datetime:
-    candidate = dt.replace(hour=w.start_h, minute=w.start_m, second=0, microsecond=0)
-    if dt < candidate and dt.weekday() < 5:
-        return candidate
-
-    d = dt
-    while True:
-        d = (d + timedelta(days=1)).replace(hour=w.start_h, minute=w.start_m, second=0, microsecond=0)
-        if d.weekday() < 5:
-            return d
-
 def seconds_until(target: datetime, tz: ZoneInfo) -> int:
     s = int((target - now(tz)).total_seconds())
     return max(0, s)
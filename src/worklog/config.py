@@ -15,6 +15,9 @@ class RunConfig:
     break_end: str
     break_enabled: bool
     input_timeout_sec: int
+    durability: str = "fsync"   # flush | fsync | group
+    backend: str = "files"      # files | sqlite
+    async_mode: bool = False    # runner asyncio (notificaciones/I/O en segundo plano)
 
 @dataclass(frozen=True)
 class SummaryConfig:
@@ -22,6 +25,38 @@ class SummaryConfig:
     tz_name: str
     week: str            # "current" o "YYYY-Www" (ISO week)
     include_details: bool
+    date_from: str = ""  # YYYY-MM-DD (rango arbitrario)
+    date_to: str = ""    # YYYY-MM-DD (default: hoy)
+    month: str = ""      # YYYY-MM
+    quarter: str = ""    # YYYY-Qn
+    year: str = ""       # YYYY
+    backend: str = "files"  # files | sqlite
+    group_by: str = ""   # ej: "weekday,hour" (day, tag, hour, weekday, isoweek)
+
+@dataclass(frozen=True)
+class MigrateConfig:
+    base_dir: str
+
+@dataclass(frozen=True)
+class SearchConfig:
+    base_dir: str
+    query: str
+    limit: int = 20
+    rebuild: bool = False
+    backend: str = "files"  # fuente para --rebuild
+
+@dataclass(frozen=True)
+class CompactConfig:
+    base_dir: str
+    tz_name: str = "America/Bogota"
+    before: str = ""     # YYYY-MM: se archivan los meses anteriores (default: mes actual)
+    dry_run: bool = False
+
+@dataclass(frozen=True)
+class TailConfig:
+    base_dir: str
+    lines: int = 10
+    backend: str = "files"  # files | sqlite
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="worklog", description="Worklog PRO (Windows + horario Colombia)")
@@ -42,19 +77,54 @@ def build_parser() -> argparse.ArgumentParser:
     pr.add_argument("--break-end", type=str, default="14:00", help="Fin de break HH:MM (default: 14:00).")
     pr.add_argument("--no-break", dest="break_enabled", action="store_false", default=True, help="Desactiva el break automático.")
     pr.add_argument("--input-timeout", type=int, default=120, help="Segundos para esperar respuesta antes de auto-registrar (default: 120).")
+    pr.add_argument("--durability", type=str, default="fsync", choices=["flush", "fsync", "group"], help="Durabilidad de escritura: flush, fsync o group (default: fsync).")
+    pr.add_argument("--backend", type=str, default="files", choices=["files", "sqlite"], help="Almacenamiento: files (JSONL/CSV) o sqlite (default: files).")
+    pr.add_argument("--async", dest="async_mode", action="store_true", help="Runner asyncio: notificaciones y guardado no bloquean el prompt.")
 
     # summary
-    ps = sub.add_parser("summary", help="Generar resumen semanal")
+    ps = sub.add_parser("summary", help="Generar resumen semanal o por rango")
     ps.add_argument("--base-dir", type=str, default="logs", help="Carpeta donde están los logs (default: logs).")
     ps.add_argument("--tz", type=str, default="America/Bogota", help="Timezone IANA (default: America/Bogota).")
     ps.add_argument("--week", type=str, default="current", help="Semana ISO: 'current' o 'YYYY-Www' (ej: 2026-W05).")
     ps.add_argument("--details", action="store_true", help="Incluye detalle (tabla por entradas).")
+    ps.add_argument("--from", dest="date_from", type=str, default="", help="Inicio de rango YYYY-MM-DD.")
+    ps.add_argument("--to", dest="date_to", type=str, default="", help="Fin de rango YYYY-MM-DD (default: hoy).")
+    ps.add_argument("--month", type=str, default="", help="Mes a resumir: YYYY-MM.")
+    ps.add_argument("--quarter", type=str, default="", help="Trimestre a resumir: YYYY-Qn.")
+    ps.add_argument("--year", type=str, default="", help="Año a resumir: YYYY.")
+    ps.add_argument("--backend", type=str, default="files", choices=["files", "sqlite"], help="Almacenamiento a leer: files o sqlite (default: files).")
+    ps.add_argument("--group-by", type=str, default="", help="Totales extra agrupados por day, tag, hour, weekday o isoweek (ej: weekday,hour).")
+
+    # migrate
+    pm = sub.add_parser("migrate", help="Importar historial JSONL/CSV a SQLite")
+    pm.add_argument("--base-dir", type=str, default="logs", help="Carpeta donde están los logs (default: logs).")
+
+    # search
+    pq = sub.add_parser("search", help="Buscar actividades en todo el historial")
+    pq.add_argument("query", nargs="*", help='Palabras, "frases exactas" y tags (#ado o tag:ado).')
+    pq.add_argument("--base-dir", type=str, default="logs", help="Carpeta donde están los logs (default: logs).")
+    pq.add_argument("--limit", type=int, default=20, help="Máximo de resultados (default: 20).")
+    pq.add_argument("--rebuild", action="store_true", help="Reconstruye el índice desde el historial existente.")
+    pq.add_argument("--backend", type=str, default="files", choices=["files", "sqlite"], help="Fuente para --rebuild: files o sqlite (default: files).")
+
+    # compact
+    pc = sub.add_parser("compact", help="Archivar meses cerrados en segmentos comprimidos")
+    pc.add_argument("--base-dir", type=str, default="logs", help="Carpeta donde están los logs (default: logs).")
+    pc.add_argument("--tz", type=str, default="America/Bogota", help="Timezone IANA (default: America/Bogota).")
+    pc.add_argument("--before", type=str, default="", help="Archivar los meses anteriores a YYYY-MM, como máximo el mes actual (default: mes actual).")
+    pc.add_argument("--dry-run", action="store_true", help="Solo mostrar qué se archivaría.")
+
+    # tail
+    pt = sub.add_parser("tail", help="Mostrar las últimas entradas registradas")
+    pt.add_argument("-n", "--lines", type=int, default=10, help="Cantidad de entradas (default: 10).")
+    pt.add_argument("--base-dir", type=str, default="logs", help="Carpeta donde están los logs (default: logs).")
+    pt.add_argument("--backend", type=str, default="files", choices=["files", "sqlite"], help="Almacenamiento a leer: files o sqlite (default: files).")
 
     return p
 
-def parse_args():
+def parse_args(argv: list[str] | None = None):
     p = build_parser()
-    a = p.parse_args()
+    a = p.parse_args(argv)
 
     if a.command == "run":
         minutes = max(1, int(a.minutes))
@@ -71,12 +141,40 @@ def parse_args():
             break_end=a.break_end,
             break_enabled=bool(a.break_enabled),
             input_timeout_sec=max(0, int(a.input_timeout)),
+            durability=a.durability,
+            backend=a.backend,
+            async_mode=bool(a.async_mode),
         )
 
+    if a.command == "migrate":
+        return a.command, MigrateConfig(base_dir=a.base_dir)
+
+    if a.command == "search":
+        return a.command, SearchConfig(
+            base_dir=a.base_dir,
+            query=" ".join(a.query),
+            limit=max(1, int(a.limit)),
+            rebuild=bool(a.rebuild),
+            backend=a.backend,
+        )
+
+    if a.command == "compact":
+        return a.command, CompactConfig(base_dir=a.base_dir, tz_name=a.tz, before=a.before, dry_run=bool(a.dry_run))
+
+    if a.command == "tail":
+        return a.command, TailConfig(base_dir=a.base_dir, lines=max(1, int(a.lines)), backend=a.backend)
+
     # summary
     return a.command, SummaryConfig(
         base_dir=a.base_dir,
         tz_name=a.tz,
         week=a.week,
         include_details=bool(a.details),
+        date_from=a.date_from,
+        date_to=a.date_to,
+        month=a.month,
+        quarter=a.quarter,
+        year=a.year,
+        backend=a.backend,
+        group_by=a.group_by,
     )
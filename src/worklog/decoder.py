@@ -0,0 +1,171 @@
+import io
+import json
+import math
+from dataclasses import dataclass, field, fields
+from typing import Callable, List, Tuple
+
+from .domain import Entry
+from .journal import verify
+
+try:  # opcional: pip install "worklog[fast]"
+    import orjson
+
+    _loads: Callable[[bytes], object] = orjson.loads
+    BACKEND = "orjson"
+except ImportError:
+    _loads = json.loads
+    BACKEND = "json"
+
+CHUNK_SIZE = 1 << 20
+MAX_ERROR_SAMPLES = 20
+
+_FIELDS = frozenset(f.name for f in fields(Entry) if f.init)
+_SEALED = _FIELDS | {"seq", "crc"}  # registros con secuencia y checksum (ver journal.py)
+_BOM = b"\xef\xbb\xbf"
+
+
+@dataclass
+class DecodeReport:
+    """Resultado de decodificar un JSONL: conteos y muestra de líneas inválidas."""
+
+    path: str
+    lines: int = 0
+    decoded: int = 0
+    skipped: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (línea, motivo), máx. MAX_ERROR_SAMPLES
+
+    @property
+    def ok(self) -> bool:
+        return self.skipped == 0
+
+    def add_error(self, line_no: int, reason: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append((line_no, reason))
+
+    def error_lines(self) -> str:
+        shown = ", ".join(str(n) for n, _ in self.errors)
+        return shown + (", ..." if self.skipped > len(self.errors) else "")
+
+
+class JsonlDecodeError(ValueError):
+    """Línea inválida en modo estricto. `report` trae el detalle."""
+
+    def __init__(self, report: DecodeReport) -> None:
+        line_no, reason = report.errors[-1]
+        super().__init__(f"{report.path}:{line_no}: {reason}")
+        self.report = report
+
+
+def _is_entry(d: object) -> bool:
+    return type(d) is dict and (d.keys() == _FIELDS or d.keys() == _SEALED) and type(d["minutes"]) is int
+
+
+def _as_minutes(v: object) -> int | None:
+    """60, 60.0, "60" o "60.0" -> 60 (el formato original los aceptaba); None si no es un número."""
+    if isinstance(v, str):
+        try:
+            return int(v.strip())
+        except ValueError:
+            try:
+                v = float(v)
+            except ValueError:
+                return None
+    if isinstance(v, (int, float)) and math.isfinite(v):
+        return int(round(v))
+    return None
+
+
+def _coerce_entry(d: object) -> bool:
+    # Camino lento: mismas claves que Entry pero "minutes" no es un int; se normaliza en el sitio.
+    if type(d) is not dict or not (d.keys() == _FIELDS or d.keys() == _SEALED):
+        return False
+    minutes = _as_minutes(d["minutes"])
+    if minutes is None:
+        return False
+    d["minutes"] = minutes
+    return True
+
+
+def _entry(d: dict) -> Entry:
+    if "crc" in d:
+        del d["seq"], d["crc"]
+    return Entry(**d)
+
+
+def decode_line(raw: bytes) -> Entry | None:
+    """Una línea JSONL suelta (ej: lectura desde el final); None si está vacía o es inválida."""
+    if not raw.strip() or verify(raw) is False:
+        return None
+    try:
+        d = _loads(raw)
+    except ValueError:
+        return None
+    return _entry(d) if _is_entry(d) or _coerce_entry(d) else None
+
+
+def _decode_batch(lines: List[bytes], first_no: int, out: List[Entry], report: DecodeReport, strict: bool) -> None:
+    rows: List[object] = []
+    nos: List[int] = []
+    for i, raw in enumerate(lines):
+        if not raw.strip():
+            continue
+        report.lines += 1
+        if verify(raw) is False:
+            report.add_error(first_no + i, "checksum inválido")
+            if strict:
+                raise JsonlDecodeError(report)
+            continue
+        try:
+            rows.append(_loads(raw))
+        except ValueError:  # json.JSONDecodeError, orjson.JSONDecodeError y UnicodeDecodeError
+            report.add_error(first_no + i, "JSON inválido")
+            if strict:
+                raise JsonlDecodeError(report)
+            continue
+        nos.append(first_no + i)
+
+    # Validación del esquema una vez por lote; solo se recorre fila a fila si algo falla.
+    if all(map(_is_entry, rows)):
+        out.extend(map(_entry, rows))
+        report.decoded += len(rows)
+        return
+
+    for line_no, d in zip(nos, rows):
+        if _is_entry(d) or _coerce_entry(d):
+            out.append(_entry(d))
+            report.decoded += 1
+            continue
+        report.add_error(line_no, "no coincide con el esquema de Entry")
+        if strict:
+            raise JsonlDecodeError(report)
+
+
+def decode_jsonl(
+    path: str, strict: bool = False, chunk_size: int = CHUNK_SIZE, data: bytes | None = None
+) -> Tuple[List[Entry], DecodeReport]:
+    """
+    Lee un JSONL por bloques grandes y retorna (entradas, reporte).
+    lenient (default): omite líneas inválidas y las cuenta en el reporte.
+    strict: lanza JsonlDecodeError en la primera línea inválida.
+    Con `data` decodifica esos bytes (ej: un día archivado); `path` queda solo para los mensajes.
+    """
+    report = DecodeReport(path)
+    out: List[Entry] = []
+    line_no = 1
+    tail = b""
+    with (open(path, "rb") if data is None else io.BytesIO(data)) as f:
+        head = f.read(len(_BOM))
+        if head != _BOM:
+            tail = head
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            _decode_batch(lines, line_no, out, report, strict)
+            line_no += len(lines)
+    if tail:
+        _decode_batch([tail], line_no, out, report, strict)
+    return out, report
@@ -1,6 +1,55 @@
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import date as _date
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
 
-@dataclass(frozen=True)
+from .tags import TagRegistry
+
+NO_TAGS: Tuple[str, ...] = ("(sin tags)",)
+
+# Los tags y fechas se repiten mucho entre entradas: se parsean una vez y se comparten.
+_TAG_CACHE: Dict[str, Tuple[str, ...]] = {}
+_ORDINAL_CACHE: Dict[str, int] = {}
+_CACHE_MAX = 4096
+_EXTEND_CHUNK = 4096  # entradas por tramo en EntryBatch.extend
+
+
+def parse_tags(tags: str) -> Tuple[str, ...]:
+    """'a, b,,c' -> ('a', 'b', 'c') con strings internados."""
+    cached = _TAG_CACHE.get(tags)
+    if cached is None:
+        cached = tuple(sys.intern(t.strip()) for t in (tags or "").split(",") if t.strip())
+        if len(_TAG_CACHE) < _CACHE_MAX:
+            _TAG_CACHE[tags] = cached
+    return cached
+
+
+def day_ordinal(day: str) -> int:
+    """Ordinal de 'YYYY-MM-DD' (0 si no es una fecha válida)."""
+    cached = _ORDINAL_CACHE.get(day)
+    if cached is None:
+        try:
+            cached = _date.fromisoformat(day).toordinal()
+        except (TypeError, ValueError):
+            cached = 0
+        if len(_ORDINAL_CACHE) < _CACHE_MAX:
+            _ORDINAL_CACHE[day] = cached
+    return cached
+
+
+def minute_of_day(ts: str) -> int:
+    """Minutos desde la medianoche local de un ISO 'YYYY-MM-DDTHH:MM...' (-1 si no se puede leer)."""
+    try:
+        if ts[10] != "T":
+            return -1
+        return int(ts[11:13]) * 60 + int(ts[14:16])
+    except (TypeError, ValueError, IndexError):
+        return -1
+
+
+@dataclass(frozen=True, slots=True)
 class Entry:
     date: str       # YYYY-MM-DD
     start: str      # ISO local
@@ -8,3 +57,164 @@ class Entry:
     minutes: int
     activity: str
     tags: str
+    # Derivados: se calculan al crear la entrada, no se serializan ni cuentan en ==.
+    day_ordinal: int = field(init=False, repr=False, compare=False)
+    start_min: int = field(init=False, repr=False, compare=False)
+    end_min: int = field(init=False, repr=False, compare=False)
+    tag_tuple: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        set_ = object.__setattr__
+        if type(self.date) is str:
+            set_(self, "date", sys.intern(self.date))
+        set_(self, "day_ordinal", day_ordinal(self.date))
+        set_(self, "start_min", minute_of_day(self.start))
+        set_(self, "end_min", minute_of_day(self.end))
+        set_(self, "tag_tuple", parse_tags(self.tags))
+
+    def to_dict(self) -> dict:
+        # asdict() incluiría los campos derivados; este es el formato del JSONL.
+        return {
+            "date": self.date,
+            "start": self.start,
+            "end": self.end,
+            "minutes": self.minutes,
+            "activity": self.activity,
+            "tags": self.tags,
+        }
+
+
+class EntryBatch:
+    """
+    Entradas en columnas (array) para operaciones masivas: fechas, tags e
+    intervalos como enteros, sin re-parsear strings al agregar.
+    Los tags de cada entrada son tag_ids[tag_offsets[i]:tag_offsets[i + 1]].
+    Además cada entrada apunta a su combinación de tags (tagset_ids): hay pocas
+    combinaciones distintas, así que los totales por tag y el árbol se suman por
+    combinación y solo después se reparten entre sus tags.
+    """
+
+    __slots__ = (
+        "day_ids", "day_ordinals", "start_min", "end_min", "minutes",
+        "tag_offsets", "tag_ids", "tagset_ids", "days", "tags", "tagsets",
+        "_day_index", "_tag_index", "_tagset_index", "_untagged",
+    )
+
+    def __init__(self) -> None:
+        self.day_ids = array("I")
+        self.day_ordinals = array("l")
+        self.start_min = array("h")
+        self.end_min = array("h")
+        self.minutes = array("l")
+        self.tag_offsets = array("L", [0])
+        self.tag_ids = array("I")
+        self.tagset_ids = array("I")
+        self.days: List[str] = []
+        self.tags: List[str] = []
+        self.tagsets: List[Tuple[int, ...]] = []  # ids de tags de cada combinación
+        self._day_index: Dict[str, int] = {}
+        self._tag_index: Dict[str, int] = {}
+        self._tagset_index: Dict[Tuple[str, ...], int] = {}
+        self._untagged = -1  # id de "(sin tags)"; las entradas sin tags no guardan ids
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Entry]) -> "EntryBatch":
+        batch = cls()
+        batch.extend(entries)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def _intern(self, value: str, index: Dict[str, int], vocab: List[str]) -> int:
+        i = index.get(value)
+        if i is None:
+            i = index[value] = len(vocab)
+            vocab.append(value)
+        return i
+
+    def _intern_tagset(self, tags: Tuple[str, ...]) -> int:
+        if not tags and self._untagged < 0:
+            self._untagged = self._intern(NO_TAGS[0], self._tag_index, self.tags)
+        s = self._tagset_index[tags] = len(self.tagsets)
+        self.tagsets.append(tuple(self._intern(t, self._tag_index, self.tags) for t in tags))
+        return s
+
+    def append(self, e: Entry) -> None:
+        self.extend((e,))
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        # Por tramos: cada columna se llena con un solo extend en vez de un append por entrada.
+        it = iter(entries)
+        while chunk := list(islice(it, _EXTEND_CHUNK)):
+            days, day_index = [], self._day_index
+            sets, set_index = [], self._tagset_index
+            for e in chunk:
+                d = day_index.get(e.date)
+                days.append(self._intern(e.date, day_index, self.days) if d is None else d)
+                t = set_index.get(e.tag_tuple)
+                sets.append(self._intern_tagset(e.tag_tuple) if t is None else t)
+            self.day_ids.extend(days)
+            self.day_ordinals.extend([e.day_ordinal for e in chunk])
+            self.start_min.extend([e.start_min for e in chunk])
+            self.end_min.extend([e.end_min for e in chunk])
+            self.minutes.extend([e.minutes for e in chunk])
+            self.tagset_ids.extend(sets)
+            tagsets, tag_ids, offsets = self.tagsets, self.tag_ids, self.tag_offsets
+            for t in sets:
+                tag_ids.extend(tagsets[t])
+                offsets.append(len(tag_ids))
+
+    def nbytes(self) -> int:
+        cols = (
+            self.day_ids, self.day_ordinals, self.start_min, self.end_min, self.minutes,
+            self.tag_offsets, self.tag_ids, self.tagset_ids,
+        )
+        return sum(c.itemsize * len(c) for c in cols)
+
+    # --- agregados (mismo resultado que weekly._summarize) ---
+
+    def total_minutes(self) -> int:
+        return sum(self.minutes)
+
+    def _sum_by(self, ids: array, n: int) -> List[int]:
+        acc = [0] * n
+        for i, m in zip(ids, self.minutes):
+            acc[i] += m
+        return acc
+
+    def day_minutes(self) -> List[int]:
+        """Minutos por id de día (alineado con `days`)."""
+        return self._sum_by(self.day_ids, len(self.days))
+
+    def tagset_minutes(self) -> List[int]:
+        """Minutos por combinación de tags (alineado con `tagsets`)."""
+        return self._sum_by(self.tagset_ids, len(self.tagsets))
+
+    def minutes_by_day(self, per_day: List[int] | None = None) -> Dict[str, int]:
+        return dict(sorted(zip(self.days, self.day_minutes() if per_day is None else per_day)))
+
+    def minutes_by_tag(self, per_set: List[int] | None = None) -> Dict[str, int]:
+        # En orden de primera aparición (el vocabulario se llena en ese orden).
+        acc = [0] * len(self.tags)
+        for ids, m in zip(self.tagsets, self.tagset_minutes() if per_set is None else per_set):
+            for j in ids or (self._untagged,):
+                acc[j] += m
+        return dict(zip(self.tags, acc))
+
+    def entry_tags(self, i: int) -> Tuple[str, ...]:
+        return tuple(self.tags[j] for j in self.tagsets[self.tagset_ids[i]])
+
+    def tag_tree(self, per_set: List[int] | None = None) -> Dict[str, int]:
+        sums = self.tagset_minutes() if per_set is None else per_set
+        return TagRegistry().totals((tuple(self.tags[j] for j in ids), m) for ids, m in zip(self.tagsets, sums))
+
+    def summarize(self, per_day: List[int] | None = None, per_set: List[int] | None = None) -> dict:
+        # `per_day`/`per_set`: sumas ya calculadas (ej: con NumPy en aggregate.summarize)
+        per_set = self.tagset_minutes() if per_set is None else per_set
+        return {
+            "total_minutes": self.total_minutes(),
+            "by_day": self.minutes_by_day(per_day),
+            "by_tag": dict(sorted(self.minutes_by_tag(per_set).items(), key=lambda kv: kv[1], reverse=True)),
+            "by_tag_tree": self.tag_tree(per_set),
+        }
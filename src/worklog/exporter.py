@@ -1,24 +1,28 @@
-from typing import List, Dict
-from .domain import Entry
+from typing import List, Dict, Tuple
+from .atomic import write_text_atomic
+from .domain import Entry, NO_TAGS
 
-def export_markdown(md_path: str, entries: List[Entry]) -> None:
-    def fmt_activity(a: str) -> str:
-        if "\n" not in a:
-            return a.strip()
-        lines = [x.strip() for x in a.splitlines() if x.strip()]
-        return "\n".join([f"- {x}" for x in lines])
 
-    tag_map: Dict[str, int] = {}
-    total = 0
+def fmt_activity(a: str) -> str:
+    if "\n" not in a:
+        return a.strip()
+    lines = [x.strip() for x in a.splitlines() if x.strip()]
+    return "\n".join([f"- {x}" for x in lines])
 
-    for e in entries:
-        total += e.minutes
-        tags = [t.strip() for t in (e.tags or "").split(",") if t.strip()] or ["(sin tags)"]
-        for t in tags:
-            tag_map[t] = tag_map.get(t, 0) + e.minutes
 
-    day = entries[0].date if entries else "N/A"
+def entry_tags(e: Entry) -> Tuple[str, ...]:
+    return e.tag_tuple or NO_TAGS
+
+
+def detail_row(e: Entry) -> str:
+    start = e.start.split("T")[1]
+    end = e.end.split("T")[1]
+    activity = fmt_activity(e.activity).replace("\n", "<br>")
+    tags = (e.tags or "").replace("\n", " ")
+    return f"| {start} | {end} | {e.minutes} | {activity} | {tags} |"
 
+
+def render_markdown(day: str, total: int, tag_map: Dict[str, int], rows: List[str]) -> str:
     lines: List[str] = []
     lines.append(f"# Worklog {day}")
     lines.append("")
@@ -37,13 +41,21 @@ def export_markdown(md_path: str, entries: List[Entry]) -> None:
     lines.append("")
     lines.append("| Inicio | Fin | Min | Actividad | Tags |")
     lines.append("|---|---|---:|---|---|")
+    lines.extend(rows)
+
+    return "\n".join(lines).strip() + "\n"
+
+
+def export_markdown(md_path: str, entries: List[Entry]) -> None:
+    tag_map: Dict[str, int] = {}
+    total = 0
 
     for e in entries:
-        start = e.start.split("T")[1]
-        end = e.end.split("T")[1]
-        activity = fmt_activity(e.activity).replace("\n", "<br>")
-        tags = (e.tags or "").replace("\n", " ")
-        lines.append(f"| {start} | {end} | {e.minutes} | {activity} | {tags} |")
-
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines).strip() + "\n")
+        total += e.minutes
+        for t in entry_tags(e):
+            tag_map[t] = tag_map.get(t, 0) + e.minutes
+
+    day = entries[0].date if entries else "N/A"
+    rows = [detail_row(e) for e in entries]
+
+    write_text_atomic(md_path, render_markdown(day, total, tag_map, rows))
@@ -0,0 +1,86 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = 1.0  # espera tras el último pedido antes de regenerar
+MAX_DELAY_SECONDS = 5.0  # con pedidos continuos, regenerar al menos cada tanto
+
+
+class ExportWorker:
+    """
+    Regenera las salidas derivadas (Markdown del día, etc.) en un hilo aparte.
+    Los pedidos con la misma clave se agrupan: una ráfaga de entradas produce
+    una sola regeneración con el último trabajo pedido. `flush()` y `close()`
+    esperan a que no quede nada pendiente.
+    """
+
+    def __init__(self, debounce: float = DEBOUNCE_SECONDS, max_delay: float = MAX_DELAY_SECONDS) -> None:
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.runs = 0
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Callable[[], None]] = {}
+        self._first = 0.0  # primer pedido aún no atendido
+        self._due = 0.0
+        self._busy = False
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, key: str, job: Callable[[], None]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ExportWorker cerrado")
+            t = time.monotonic()
+            if not self._pending:
+                self._first = t
+            self._pending[key] = job
+            self._due = min(t + self.debounce, self._first + self.max_delay)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="worklog-export", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending:
+                        wait = self._due - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    elif self._closed:
+                        return
+                    else:
+                        self._cond.wait()
+                jobs = list(self._pending.items())
+                self._pending.clear()
+                self._busy = True
+            for key, job in jobs:
+                try:
+                    job()
+                except Exception:
+                    logger.exception("Export failed: %s", key)
+            with self._cond:
+                self.runs += len(jobs)
+                self._busy = False
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Ejecuta ya lo pendiente y espera a que termine."""
+        with self._cond:
+            self._due = 0.0
+            self._cond.notify_all()
+            while self._pending or self._busy:
+                self._cond.wait()
+
+    def close(self) -> None:
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,170 @@
+import io
+import os
+import csv
+import json
+import zlib
+import logging
+from dataclasses import dataclass
+
+from .domain import Entry
+
+logger = logging.getLogger(__name__)
+
+TAIL_BYTES = 64 * 1024
+TORN_SUFFIX = ".torn"
+CSV_FIELDS = 6  # date, start, end, minutes, activity, tags
+
+# Cada registro termina en ,"crc":"xxxxxxxx"} : crc32 de los bytes anteriores a esa marca.
+_CRC_MARK = b',"crc":"'
+
+
+def seal(entry: Entry, seq: int) -> str:
+    """Línea JSONL con número de secuencia y checksum (sin salto de línea)."""
+    body = json.dumps({**entry.to_dict(), "seq": seq}, ensure_ascii=False)[:-1]
+    crc = zlib.crc32(body.encode("utf-8"))
+    return f'{body},"crc":"{crc:08x}"}}'
+
+
+def verify(raw: bytes) -> bool | None:
+    """True/False si la línea trae checksum y coincide; None si es una línea sin sellar (formato anterior)."""
+    i = raw.rfind(_CRC_MARK)
+    if i < 0:
+        return None
+    got = raw[i + len(_CRC_MARK):i + len(_CRC_MARK) + 8]
+    try:
+        return int(got, 16) == zlib.crc32(raw[:i]) and raw[i + len(_CRC_MARK) + 8:].strip() == b'"}'
+    except ValueError:
+        return False
+
+
+def _record_seq(raw: bytes) -> int | None:
+    # Secuencia de una línea completa; None si la línea está corrupta.
+    ok = verify(raw)
+    if ok is False:
+        return None
+    try:
+        d = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(d, dict):
+        return None
+    seq = d.get("seq", 0)
+    return seq if type(seq) is int else 0
+
+
+@dataclass
+class TailState:
+    last_seq: int = 0
+    repaired_bytes: int = 0
+
+
+def _read_tail(f, size: int, sep: bytes = b"\n") -> tuple[int, bytes]:
+    # Ventana final que contiene al menos un separador completo (o el archivo entero).
+    window = TAIL_BYTES
+    while True:
+        start = max(0, size - window)
+        f.seek(start)
+        buf = f.read(size - start)
+        if start == 0 or buf.rfind(sep, 0, len(buf) - len(sep)) >= 0:
+            return start, buf
+        window *= 2
+
+
+def _move_to_torn(f, path: str, cut: int, size: int) -> int:
+    f.seek(cut)
+    torn = f.read(size - cut)
+    with open(path + TORN_SUFFIX, "ab") as t:
+        t.write(torn + (b"" if torn.endswith(b"\n") else b"\n"))
+    f.truncate(cut)
+    f.flush()
+    os.fsync(f.fileno())
+    logger.warning("Repaired tail of %s: moved %s bytes to %s", path, len(torn), path + TORN_SUFFIX)
+    return len(torn)
+
+
+def recover_tail(path: str) -> TailState:
+    """
+    Revisa solo el final de un JSONL (O(cola), no O(archivo)):
+    una última línea sin salto de línea es una escritura cortada, y el último
+    registro completo debe tener JSON y checksum válidos. Lo dañado se corta y se
+    guarda en <archivo>.torn. Retorna la última secuencia válida.
+    """
+    state = TailState()
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return state
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return state
+        start, buf = _read_tail(f, size)
+
+        cut = size
+        if not buf.endswith(b"\n"):
+            nl = buf.rfind(b"\n")
+            cut = start + nl + 1 if nl >= 0 else start
+
+        # el último registro válido de la ventana; lo dañado después de él también se corta
+        end = cut - start
+        while end > 0:
+            line_start = buf.rfind(b"\n", 0, end - 1) + 1
+            if line_start == 0 and start > 0:
+                break  # primera línea de la ventana: puede estar incompleta
+            line = buf[line_start:end]
+            if line.strip():
+                seq = _record_seq(line)
+                if seq is not None:
+                    state.last_seq = seq
+                    break
+                cut = start + line_start
+            end = line_start
+
+        if cut < size:
+            state.repaired_bytes = _move_to_torn(f, path, cut, size)
+    return state
+
+
+_CSV_EOL = b"\r\n"  # terminador de csv.writer; los saltos dentro de una actividad son \n entre comillas
+
+
+def _clean_csv_record(raw: bytes) -> bool:
+    try:
+        rows = list(csv.reader(io.StringIO(raw.decode("utf-8"), newline="")))
+    except (UnicodeDecodeError, csv.Error):
+        return False
+    return len(rows) == 1 and len(rows[0]) == CSV_FIELDS
+
+
+def recover_csv_tail(path: str) -> int:
+    """
+    Igual que recover_tail para el CSV espejo. Un registro puede ocupar varias
+    líneas (actividad multilínea entre comillas), así que el corte se hace en el
+    último fin de registro (CRLF) y el último registro debe parsear como una
+    sola fila completa. Los CSV sin CRLF (escritos a mano) no se tocan.
+    Retorna los bytes movidos a <archivo>.torn.
+    """
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return 0
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if not size:
+            return 0
+        start, buf = _read_tail(f, size, _CSV_EOL)
+        last = buf.rfind(_CSV_EOL)
+        if last < 0:
+            return 0  # sin \r\n: formato desconocido, no se toca
+        cut = start + last + len(_CSV_EOL)
+
+        # último registro completo: desde el fin de registro anterior
+        prev = buf.rfind(_CSV_EOL, 0, last)
+        if prev >= 0 or start == 0:
+            rec_start = prev + len(_CSV_EOL) if prev >= 0 else 0
+            if not _clean_csv_record(buf[rec_start:last + len(_CSV_EOL)].removeprefix(b"\xef\xbb\xbf")):
+                cut = start + rec_start
+
+        if cut < size:
+            return _move_to_torn(f, path, cut, size)
+    return 0
@@ -0,0 +1,96 @@
+import logging
+import threading
+from typing import Dict, Iterable, List
+
+from .atomic import write_text_atomic
+from .domain import Entry
+from .storage import Store
+from .exporter import entry_tags, detail_row, render_markdown
+
+logger = logging.getLogger(__name__)
+
+
+class DayLedger:
+    """
+    Estado en memoria del día actual (totales, minutos por tag y filas del detalle).
+    Permite regenerar el Markdown sin volver a leer el backend en cada tick.
+    Solo se reconstruye si la fuente del día cambió fuera del proceso.
+    El export puede correr en el hilo de ExportWorker mientras el loop registra entradas.
+    """
+
+    def __init__(self, store: Store, source_day: str, md_path: str) -> None:
+        self.store = store
+        self.source_day = source_day
+        self.md_path = md_path
+        self.day = "N/A"
+        self.total = 0
+        self.count = 0
+        self.tag_map: Dict[str, int] = {}
+        self.rows: List[str] = []
+        self._signature: tuple | None = None
+        self._lock = threading.RLock()
+
+    def _reset(self) -> None:
+        self.day = "N/A"
+        self.total = 0
+        self.count = 0
+        self.tag_map = {}
+        self.rows = []
+
+    def _add(self, e: Entry) -> None:
+        if self.count == 0:
+            self.day = e.date
+        self.count += 1
+        self.total += e.minutes
+        for t in entry_tags(e):
+            self.tag_map[t] = self.tag_map.get(t, 0) + e.minutes
+        self.rows.append(detail_row(e))
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._reset()
+            for e in self.store.read_day(self.source_day):
+                self._add(e)
+            self._signature = self.store.day_signature(self.source_day)
+        logger.debug("Ledger rebuilt for %s (%s entries)", self.source_day, self.count)
+
+    def is_stale(self) -> bool:
+        return self.store.day_signature(self.source_day) != self._signature
+
+    def ensure_fresh(self) -> None:
+        with self._lock:
+            if self.is_stale():
+                self.rebuild()
+
+    def append(self, entry: Entry) -> None:
+        """
+        Escribe la entrada en el backend y la suma al estado, todo bajo el lock:
+        un export concurrente nunca ve el archivo con la entrada y el estado sin ella
+        (la reconstruiría y luego se sumaría dos veces).
+        """
+        with self._lock:
+            # si la fuente cambió fuera del proceso, reconstruir antes de sumar
+            self.ensure_fresh()
+            self.store.append(entry)
+            self._add(entry)
+            self._signature = self.store.day_signature(self.source_day)
+
+    def append_many(self, entries: Iterable[Entry]) -> None:
+        """Como `append` para varias entradas, con un solo commit del backend."""
+        with self._lock:
+            self.ensure_fresh()
+            with self.store.batch():
+                for e in entries:
+                    self.store.append(e)
+                    self._add(e)
+            self._signature = self.store.day_signature(self.source_day)
+
+    def render(self) -> str:
+        with self._lock:
+            return render_markdown(self.day, self.total, self.tag_map, self.rows)
+
+    def export(self) -> None:
+        with self._lock:
+            self.ensure_fresh()
+            text = self.render()
+        write_text_atomic(self.md_path, text)
@@ -1,14 +1,18 @@
+import atexit
 import logging
+import os
 import shutil
-import subprocess
 import time
 
+from .notifier_host import NotifierHost, powershell_host_argv, stub_host_argv
+
 logger = logging.getLogger(__name__)
 
 _last_notification_key: tuple[str, str] | None = None
 _last_notification_ts: float = 0.0
 _notifications_muted_until_ts: float = 0.0
 _backend_preference: str = "burnttoast"
+_host: NotifierHost | None = None
 
 
 def _should_skip_duplicate(title: str, body: str, min_seconds: int = 20) -> bool:
@@ -41,18 +45,43 @@ def _find_powershell() -> str | None:
     return None
 
 
-def _run_ps(ps_exe: str, script: str, timeout: int = 2) -> int:
+def _host_argv() -> list[str] | None:
+    # WORKLOG_NOTIFIER_HOST=stub usa el host de prueba (Linux/tests).
+    if os.environ.get("WORKLOG_NOTIFIER_HOST") == "stub":
+        return stub_host_argv()
+    ps_exe = _find_powershell()
+    return powershell_host_argv(ps_exe) if ps_exe else None
+
+
+def _get_host() -> NotifierHost | None:
+    global _host
+    if _host is None:
+        argv = _host_argv()
+        if argv is None:
+            return None
+        _host = NotifierHost(argv)
+        atexit.register(_host.close)
+    return _host
+
+
+def warm_up() -> None:
+    """Inicia el host de notificaciones en segundo plano para que el primer toast no pague el arranque."""
+    host = _get_host()
+    if host is None or host.is_alive():
+        return
     try:
-        result = subprocess.run(
-            [ps_exe, "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", script],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        return result.returncode
-    except subprocess.TimeoutExpired:
-        return 124
-    except Exception:
+        host.start()
+    except OSError:
+        logger.warning("Could not start notifier host")
+
+
+def _run_script(script: str, timeout: int = 2) -> int:
+    host = _get_host()
+    if host is None:
+        return 125
+    try:
+        return host.run_script(script, timeout=timeout)
+    except OSError:
         return 125
 
 
@@ -71,30 +100,34 @@ def notify_windows(title: str, body: str) -> None:
         logger.debug("Skipping duplicate notification: %s | %s", title, body)
         return
 
-    ps_exe = _find_powershell()
-    if not ps_exe:
+    if _get_host() is None:
         logger.warning("PowerShell no disponible; notificaciones desactivadas temporalmente.")
         _mute_notifications(minutes=60)
         return
 
+    # Los scripts retornan su código: el host ya tiene BurntToast importado ($bt).
     ps_toast = f"""
     try {{
-      if (Get-Module -ListAvailable -Name BurntToast) {{
-        Import-Module BurntToast -ErrorAction Stop
+      if ($bt -or (Get-Module -ListAvailable -Name BurntToast)) {{
+        if (-not $bt) {{ Import-Module BurntToast -ErrorAction Stop }}
         New-BurntToastNotification -Text '{title.replace("'", "''")}', '{body.replace("'", "''")}' -AppLogo (Join-Path $env:WINDIR 'System32\\SHELL32.dll') | Out-Null
-        exit 0
+        return 0
       }} else {{
-        exit 2
+        return 2
       }}
     }} catch {{
-      exit 1
+      return 1
     }}
     """.strip()
 
     if _backend_preference == "burnttoast":
-        rc = _run_ps(ps_exe, ps_toast, timeout=2)
+        rc = _run_script(ps_toast, timeout=2)
         if rc == 0:
             return
+        if rc == 126:
+            # el host sigue arrancando: se omite este aviso sin cambiar de backend ni silenciar
+            logger.debug("Notifier host still starting; skipping notification")
+            return
         if rc in (124, 125):
             logger.warning("Notificación BurntToast lenta o fallida; usando fallback WinRT.")
         _backend_preference = "winrt"
@@ -108,14 +141,14 @@ def notify_windows(title: str, body: str) -> None:
       $toast = [Windows.UI.Notifications.ToastNotification]::new($xml)
       $notifier = [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier('Worklog')
       $notifier.Show($toast)
-      exit 0
+      return 0
     }} catch {{
-      exit 1
+      return 1
     }}
     """.strip()
 
-    rc = _run_ps(ps_exe, ps_winrt, timeout=2)
-    if rc == 0:
+    rc = _run_script(ps_winrt, timeout=2)
+    if rc in (0, 126):
         return
 
     logger.warning("No se pudo mostrar notificación; se pausarán por 10 minutos.")
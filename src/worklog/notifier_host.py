@@ -0,0 +1,216 @@
+import base64
+import logging
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Protocolo por líneas (stdin/stdout, ASCII):
+#   host -> READY                 al terminar de iniciar
+#   PING                -> PONG
+#   RUN <base64 utf-8>  -> DONE <rc>
+#   EXIT                -> (termina)
+
+PS_BOOTSTRAP = """
+$ErrorActionPreference = 'Continue'
+$bt = $false
+try { Import-Module BurntToast -ErrorAction Stop; $bt = $true } catch {}
+[Console]::Out.WriteLine('READY')
+while ($true) {
+  $line = [Console]::In.ReadLine()
+  if ($line -eq $null -or $line -eq 'EXIT') { break }
+  if ($line -eq 'PING') { [Console]::Out.WriteLine('PONG'); continue }
+  if ($line.StartsWith('RUN ')) {
+    $rc = 1
+    try {
+      $code = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($line.Substring(4)))
+      $rc = & ([scriptblock]::Create($code))
+    } catch { $rc = 1 }
+    [Console]::Out.WriteLine("DONE $rc")
+  }
+}
+""".strip()
+
+
+def powershell_host_argv(ps_exe: str) -> list[str]:
+    encoded = base64.b64encode(PS_BOOTSTRAP.encode("utf-16-le")).decode("ascii")
+    return [ps_exe, "-NoProfile", "-NoLogo", "-ExecutionPolicy", "Bypass", "-EncodedCommand", encoded]
+
+
+def stub_host_argv() -> list[str]:
+    return [sys.executable, "-m", "worklog.notifier_stub"]
+
+
+class NotifierHost:
+    """
+    Proceso de notificaciones de larga vida: se inicia una vez y recibe los
+    scripts por stdin. Si el proceso muere o deja de responder se reinicia
+    en la siguiente solicitud (hasta `max_restarts` veces seguidas; una
+    respuesta correcta vuelve a habilitar los reinicios).
+
+    El arranque no bloquea: cada solicitud espera a READY como mucho su propio
+    timeout; si el host sigue arrancando se responde 126 y se le da hasta
+    `ready_timeout` segundos antes de darlo por perdido.
+    """
+
+    def __init__(self, argv: list[str], ready_timeout: float = 15.0, max_restarts: int = 3, ping_every: float = 300.0) -> None:
+        self.argv = argv
+        self.ready_timeout = ready_timeout
+        self.max_restarts = max_restarts
+        self.ping_every = ping_every
+        self.restarts = 0
+        self._proc: subprocess.Popen | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._ready = False
+        self._started = False
+        self._started_at = 0.0
+        self._last_ok = 0.0
+        self._lock = threading.Lock()
+
+    # --- ciclo de vida ---
+
+    def start(self) -> None:
+        """Lanza el proceso sin esperar a READY (el arranque corre en segundo plano)."""
+        self._lines = queue.Queue()
+        self._ready = False
+        self._started = True
+        self._started_at = time.monotonic()
+        self._proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="ascii",
+            errors="replace",
+            bufsize=1,
+        )
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), name="worklog-notifier", daemon=True).start()
+
+    @staticmethod
+    def _pump(proc: subprocess.Popen, lines: queue.Queue) -> None:
+        for line in proc.stdout:
+            lines.put(line.strip())
+        lines.put(None)
+
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _kill(self) -> None:
+        if self._proc is None:
+            return
+        try:
+            self._proc.kill()
+            self._proc.wait(timeout=2)
+        except Exception:
+            pass
+        self._proc = None
+        self._ready = False
+
+    def _restart(self) -> bool:
+        self._kill()
+        if self.restarts >= self.max_restarts:
+            return False
+        self.restarts += 1
+        logger.warning("Restarting notifier host (attempt %s)", self.restarts)
+        self.start()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self.is_alive():
+                try:
+                    self._proc.stdin.write("EXIT\n")
+                    self._proc.stdin.flush()
+                    self._proc.wait(timeout=2)
+                except Exception:
+                    pass
+            self._kill()
+
+    # --- protocolo ---
+
+    def _read(self, timeout: float) -> str | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if line is None or line:
+                return line
+
+    def _ensure_ready(self, timeout: float) -> int:
+        """0 si el host está listo, 126 si sigue arrancando, 125 si no está disponible."""
+        if not self.is_alive():
+            if not self._started:
+                self.start()
+            elif not self._restart():
+                return 125
+        if self._ready:
+            return 0
+        ready_deadline = self._started_at + self.ready_timeout
+        line = self._read(min(timeout, max(0.0, ready_deadline - time.monotonic())))
+        if line == "READY":
+            self._ready = True
+            self._last_ok = time.monotonic()
+            return 0
+        if line is None and self.is_alive() and time.monotonic() < ready_deadline:
+            # sigue arrancando: se vuelve a esperar en la próxima solicitud
+            return 126
+        logger.warning("Notifier host did not become ready")
+        self._kill()
+        return 125
+
+    def _request(self, line: str, timeout: float) -> tuple[str | None, int]:
+        """
+        Retorna (respuesta, código de error): 124 si no respondió, 125 si el host
+        no está disponible, 126 si aún está arrancando.
+        """
+        err = self._ensure_ready(timeout)
+        if err:
+            return None, err
+        try:
+            self._proc.stdin.write(line + "\n")
+            self._proc.stdin.flush()
+        except (OSError, ValueError):
+            self._kill()
+            return None, 125
+        resp = self._read(timeout)
+        if resp is None:
+            # colgado o muerto: se reinicia en la próxima solicitud
+            self._kill()
+            return None, 124
+        self._last_ok = time.monotonic()
+        self.restarts = 0
+        return resp, 0
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        with self._lock:
+            return self._request("PING", timeout)[0] == "PONG"
+
+    def run_script(self, script: str, timeout: float = 2.0) -> int:
+        """Ejecuta un script en el host. Retorna su código (124 timeout, 125 host no disponible, 126 arrancando)."""
+        with self._lock:
+            # health check si el host lleva mucho tiempo sin uso
+            if self._ready and time.monotonic() - self._last_ok > self.ping_every:
+                if self._request("PING", 2.0)[0] != "PONG":
+                    self._kill()
+
+            payload = base64.b64encode(script.encode("utf-8")).decode("ascii")
+            resp, err = self._request(f"RUN {payload}", timeout)
+
+        if resp is None:
+            return err
+        tag, _, rc = resp.partition(" ")
+        if tag != "DONE":
+            return 125
+        try:
+            return int(rc)
+        except ValueError:
+            return 1
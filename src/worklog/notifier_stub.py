@@ -0,0 +1,42 @@
+"""
+Host de notificaciones de prueba (Linux/tests): habla el mismo protocolo que el
+host PowerShell pero no muestra nada.
+
+- WORKLOG_NOTIFIER_STUB_LOG: archivo donde se agregan los scripts recibidos.
+- WORKLOG_NOTIFIER_STUB_RC: código a responder (default: 0).
+- WORKLOG_NOTIFIER_STUB_READY_DELAY: segundos antes de anunciar READY (simula un arranque lento).
+- Un script que contenga "__stub_hang__" no recibe respuesta (simula un cuelgue).
+"""
+import base64
+import os
+import sys
+import time
+
+
+def main() -> None:
+    log_path = os.environ.get("WORKLOG_NOTIFIER_STUB_LOG")
+    rc = int(os.environ.get("WORKLOG_NOTIFIER_STUB_RC", "0"))
+
+    time.sleep(float(os.environ.get("WORKLOG_NOTIFIER_STUB_READY_DELAY", "0")))
+    print("READY", flush=True)
+    for raw in sys.stdin:
+        line = raw.strip()
+        if line == "EXIT":
+            break
+        if line == "PING":
+            print("PONG", flush=True)
+            continue
+        if not line.startswith("RUN "):
+            continue
+
+        script = base64.b64decode(line[4:]).decode("utf-8")
+        if log_path:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(script.replace("\n", " ") + "\n")
+        if "__stub_hang__" in script:
+            time.sleep(3600)
+        print(f"DONE {rc}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import os
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from .atomic import write_text_atomic
+from .domain import Entry
+from .catalog import Source, get_catalog
+from .storage import ensure_dir, read_source
+from .exporter import entry_tags
+from .tags import TagRegistry
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_VERSION = 2
+
+
+@dataclass
+class DayRollup:
+    day: str
+    total_minutes: int = 0
+    count: int = 0
+    by_day: Dict[str, int] = field(default_factory=dict)
+    by_tag: Dict[str, int] = field(default_factory=dict)
+    by_tag_tree: Dict[str, int] = field(default_factory=dict)
+
+
+def rollup_path(base_dir: str, day: str) -> str:
+    return os.path.join(base_dir, "worklog_rollup", f"{day}_rollup.json")
+
+
+def build_rollup(day: str, entries: List[Entry]) -> DayRollup:
+    r = DayRollup(day=day)
+    for e in entries:
+        r.count += 1
+        r.total_minutes += e.minutes
+        r.by_day[e.date] = r.by_day.get(e.date, 0) + e.minutes
+        for t in entry_tags(e):
+            r.by_tag[t] = r.by_tag.get(t, 0) + e.minutes
+    r.by_tag_tree = TagRegistry().totals((e.tag_tuple, e.minutes) for e in entries)
+    return r
+
+
+def _load_sidecar(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != ROLLUP_VERSION:
+        return {}
+    return data.get("sources") or {}
+
+
+def _save_sidecar(path: str, sources: dict) -> None:
+    try:
+        ensure_dir(os.path.dirname(path))
+        # caché recalculable: sin fsync (un sidecar ilegible se descarta y se recalcula)
+        write_text_atomic(path, json.dumps({"version": ROLLUP_VERSION, "sources": sources}, ensure_ascii=False), durable=False)
+    except OSError:
+        logger.warning("Could not write rollup cache %s", path)
+
+
+def load_day_rollup(base_dir: str, day: str, day_sources: List[Source] | None = None) -> DayRollup:
+    """
+    Retorna los totales del día usando el sidecar en worklog_rollup/.
+    Solo re-parsea la fuente si su tamaño o mtime cambiaron.
+    `day_sources` (del catálogo) evita volver a listar las carpetas.
+    """
+    if day_sources is None:
+        day_sources = get_catalog(base_dir).sources(day)
+    if not day_sources:
+        return DayRollup(day=day)
+
+    sidecar = rollup_path(base_dir, day)
+    cached = _load_sidecar(sidecar)
+    sources: dict = {}
+    dirty = False
+    result = DayRollup(day=day)
+
+    for source in day_sources:
+        kind, path = source.kind, source.path
+        try:
+            st = os.stat(source.stat_path)  # si el día está archivado, el segmento
+        except OSError:
+            continue
+
+        rec = cached.get(kind)
+        if rec and rec.get("path") == path and rec.get("size") == st.st_size and rec.get("mtime_ns") == st.st_mtime_ns:
+            r = DayRollup(
+                day=day,
+                total_minutes=rec["total_minutes"],
+                count=rec["count"],
+                by_day=rec["by_day"],
+                by_tag=rec["by_tag"],
+                by_tag_tree=rec["by_tag_tree"],
+            )
+        else:
+            r = build_rollup(day, read_source(source))
+            rec = {
+                "path": path,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "total_minutes": r.total_minutes,
+                "count": r.count,
+                "by_day": r.by_day,
+                "by_tag": r.by_tag,
+                "by_tag_tree": r.by_tag_tree,
+            }
+            dirty = True
+
+        sources[kind] = rec
+        if r.count:
+            result = r
+            break
+
+    if dirty or sources.keys() != cached.keys():
+        _save_sidecar(sidecar, sources)
+    return result
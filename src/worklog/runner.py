@@ -1,6 +1,6 @@
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, time as dtime, timedelta
 
 from dataclasses import dataclass
 from zoneinfo import ZoneInfo
@@ -12,23 +12,29 @@ from .clock import (
     parse_hhmm,
     now,
     iso,
-    is_work_time,
-    next_work_start,
     seconds_until,
 )
 from . import storage
-from .exporter import export_markdown
+from .exports import ExportWorker
+from .ledger import DayLedger
+from .scheduler import Scheduler, next_deadline
+from .suggest import SuggestionIndex
+from .workcal import WorkCalendar, calendar_path
 from .ui import (
     prompt_multiline,
     sprint_menu,
     choose_activity,
     maybe_edit,
-    update_sprint,
+    ask_match,
 )
-from .notifier import notify_windows
+from .notifier import notify_windows, warm_up
 
 logger = logging.getLogger(__name__)
 DEFAULT_ACTIVITY = "(sin detalle)"
+CATCH_UP_BLOCKS = 2  # bloques vencidos a partir de los cuales se pregunta una sola vez
+SAVED_MSG = "💾 Guardado.\n"
+SAVED_BATCH_MSG = "💾 Guardadas {n} entradas.\n"
+SEED_DAYS = 14  # historial usado para crear el índice de sugerencias la primera vez
 
 try:
     import msvcrt
@@ -40,10 +46,15 @@ except Exception:
 class RuntimeState:
     paths: dict[str, str]
     tick_start: datetime
-    next_tick: float
-    last_activities: list[str]
+    last_activities: list[str]  # menú del sprint, mejor sugerencia primero
+    suggestions: SuggestionIndex
     break_start: tuple[int, int] | None
     break_end: tuple[int, int] | None
+    ledger: DayLedger
+    store: storage.Store
+    scheduler: Scheduler
+    exports: ExportWorker
+    calendar: WorkCalendar
 
 
 # -------------------------
@@ -56,6 +67,11 @@ def _build_window(cfg: RunConfig) -> WorkWindow:
     return WorkWindow(sh, sm, eh, em)
 
 
+def _build_calendar(cfg: RunConfig, tz: ZoneInfo) -> WorkCalendar:
+    # logs/worklog_calendar.json (festivos y turnos por día) si existe; si no, L–V con --start/--end.
+    return WorkCalendar.load(calendar_path(cfg.base_dir), tz, _build_window(cfg))
+
+
 def _build_break_window(cfg: RunConfig) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
     if not cfg.break_enabled:
         return None, None
@@ -68,68 +84,121 @@ def _current_day(tz: ZoneInfo) -> str:
     return now(tz).strftime("%Y-%m-%d")
 
 
-def _load_sprint_activities(jsonl_path: str) -> list[str]:
-    entries = storage.read_jsonl(jsonl_path)
-    unique = []
-    for e in reversed(entries):
-        if e.activity and e.activity not in unique:
-            unique.append(e.activity)
-        if len(unique) >= 9:
-            break
-    return list(reversed(unique))
+def _open_ledger(store: storage.Store, paths: dict[str, str]) -> DayLedger:
+    ledger = DayLedger(store, store.day, paths["md"])
+    ledger.rebuild()
+    return ledger
+
+
+def _load_suggestions(cfg: RunConfig, store: storage.Store) -> SuggestionIndex:
+    suggestions = SuggestionIndex.load(cfg.base_dir)
+    if suggestions.exists():
+        _catch_up_suggestions(suggestions, store)
+        return suggestions
+
+    # Primera vez: sembrar con los últimos días; después se mantiene por cada entrada.
+    today = datetime.strptime(store.day, "%Y-%m-%d").date()
+    for back in range(SEED_DAYS, -1, -1):
+        suggestions.seed(store.read_day((today - timedelta(days=back)).isoformat()))
+    suggestions.save()
+    logger.info("Seeded suggestion index with %s activities", len(suggestions.items))
+    return suggestions
+
+
+def _catch_up_suggestions(suggestions: SuggestionIndex, store: storage.Store) -> None:
+    # El índice se guarda con retraso: tras un corte pueden faltar las últimas entradas del día.
+    # Se leen desde el final del archivo y se corta en la primera que el índice ya conoce.
+    newest = suggestions.newest()
+    missed: list[Entry] = []
+    for e in store.iter_day_reversed(store.day):
+        try:
+            if datetime.fromisoformat(e.start).timestamp() <= newest:
+                break
+        except ValueError:
+            continue
+        missed.append(e)
+    if missed:
+        suggestions.seed(reversed(missed))
+        logger.info("Caught up suggestion index with %s entries", len(missed))
+
 
+def _schedule_export(state: RuntimeState) -> None:
+    # La clave es el archivo: si el día rota, el Markdown anterior igual se termina de escribir.
+    state.exports.submit(state.ledger.md_path, state.ledger.export)
+    state.exports.submit("suggestions", state.suggestions.save)
 
-def _print_banner(cfg: RunConfig, paths: dict) -> None:
+
+def _flush_exports(state: RuntimeState) -> None:
+    _schedule_export(state)
+    state.exports.flush()
+
+
+def _remember(state: RuntimeState, activity: str, when: datetime) -> None:
+    state.suggestions.record(activity, when)
+    state.last_activities = state.suggestions.top(9)
+
+
+def _print_banner(cfg: RunConfig, paths: dict, store: storage.Store, calendar: WorkCalendar) -> None:
     print(f"✅ Worklog PRO (TZ={cfg.tz_name})")
-    print(f"📁 JSONL: {paths['jsonl']}")
-    print(f"📁  CSV: {paths['csv']}")
+    if store.name == "sqlite":
+        print(f"🗄️ SQLite: {store.path}")
+    else:
+        print(f"📁 JSONL: {paths['jsonl']}")
+        print(f"📁  CSV: {paths['csv']}")
     print(f"📁   MD: {paths['md']}")
-    print(f"🕘 Horario: L–V {cfg.start}–{cfg.end}")
+    print(f"🕘 Horario: {calendar.describe()}")
     print(f"⏱️ Intervalo: {cfg.minutes} min")
     print(f"🔔 Notificaciones: {'ON' if cfg.notify else 'OFF'}")
     print("🛑 Salir: Ctrl+C\n")
     logger.info("Run started: tz=%s start=%s end=%s minutes=%s", cfg.tz_name, cfg.start, cfg.end, cfg.minutes)
 
 
-def _sleep_until_next_work_start(tz: ZoneInfo, window: WorkWindow) -> None:
+def _sleep_until_next_work_start(tz: ZoneInfo, calendar: WorkCalendar, scheduler: Scheduler) -> None:
     n = now(tz)
-    if is_work_time(n, window):
+    if calendar.is_work_time(n):
         return
 
-    nxt = next_work_start(n, window)
+    nxt = calendar.next_work_start(n)
     wait = seconds_until(nxt, tz)
     print(f"🧊 Fuera de horario. Próximo inicio: {iso(nxt)} (en {wait//60} min).")
 
     try:
-        time.sleep(wait)
+        scheduler.sleep_through(nxt)
     except KeyboardInterrupt:
         print("\n👋 Worklog detenido por el usuario.")
         raise SystemExit(0)
 
 
 
-def _init_state(cfg: RunConfig, tz: ZoneInfo, window: WorkWindow) -> RuntimeState:
+def _init_state(cfg: RunConfig, tz: ZoneInfo, calendar: WorkCalendar) -> RuntimeState:
     day = _current_day(tz)
     paths = storage.paths_for_day(cfg.base_dir, day)
-    storage.init_csv_if_needed(paths["csv"])
+    store = storage.open_store(cfg.base_dir, day, cfg.backend, cfg.durability)
+
+    suggestions = _load_suggestions(cfg, store)
 
-    last_activities = _load_sprint_activities(paths["jsonl"])
+    scheduler = Scheduler(tz)
 
-    _print_banner(cfg, paths)
-    _sleep_until_next_work_start(tz, window)
+    _print_banner(cfg, paths, store, calendar)
+    if cfg.notify:
+        warm_up()
+    _sleep_until_next_work_start(tz, calendar, scheduler)
 
     tick_start = now(tz)
-    interval_seconds = cfg.minutes * 60
-    next_tick = time.time() + (0 if cfg.immediate else interval_seconds)
     break_start, break_end = _build_break_window(cfg)
 
     return RuntimeState(
         paths=paths,
         tick_start=tick_start,
-        next_tick=next_tick,
-        last_activities=last_activities,
+        last_activities=suggestions.top(9),
+        suggestions=suggestions,
         break_start=break_start,
         break_end=break_end,
+        ledger=_open_ledger(store, paths),
+        store=store,
+        scheduler=scheduler,
+        exports=ExportWorker(),
+        calendar=calendar,
     )
 
 
@@ -139,47 +208,71 @@ def _init_state(cfg: RunConfig, tz: ZoneInfo, window: WorkWindow) -> RuntimeStat
 
 def _rotate_if_new_day(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> None:
     day = _current_day(tz)
-    if state.paths["jsonl"].endswith(f"{day}_worklog.jsonl"):
+    if state.store.day == day:
         return
 
     state.paths = storage.paths_for_day(cfg.base_dir, day)
-    storage.init_csv_if_needed(state.paths["csv"])
-    state.tick_start = now(tz)
-
-    # recargar sprint list del nuevo día (si existe)
-    state.last_activities = _load_sprint_activities(state.paths["jsonl"])
+    state.store.rotate(day)
+    # Desde el primer turno del día nuevo (si ya pasó): el loop registra lo que falte.
+    midnight = datetime.combine(date.fromisoformat(day), dtime(), tz)
+    first = midnight if state.calendar.is_work_time(midnight) else state.calendar.next_work_start(midnight)
+    state.tick_start = min(first, now(tz))
+    state.ledger = _open_ledger(state.store, state.paths)
 
     print(f"\n📆 Nuevo día detectado: {day}. Rotando logs.")
     logger.info("Rotated logs to day=%s", day)
 
 
-def _ensure_work_time_or_sleep(cfg: RunConfig, tz: ZoneInfo, window: WorkWindow, state: RuntimeState) -> None:
+def _ensure_work_time_or_sleep(cfg: RunConfig, tz: ZoneInfo, calendar: WorkCalendar, state: RuntimeState) -> None:
     n = now(tz)
-    if is_work_time(n, window):
+    if calendar.is_work_time(n):
         return
 
-    export_markdown(state.paths["md"], storage.read_jsonl(state.paths["jsonl"]))
+    _flush_exports(state)
 
-    nxt = next_work_start(n, window)
+    nxt = calendar.next_work_start(n)
     wait = seconds_until(nxt, tz)
     print(f"🧊 Fuera de horario. Próximo inicio: {iso(nxt)} (en {wait//60} min).")
 
     try:
-        time.sleep(wait)
+        state.scheduler.sleep_through(nxt)
     except KeyboardInterrupt:
         print("\n👋 Worklog detenido por el usuario.")
         raise SystemExit(0)
 
-    state.tick_start = now(tz)
-    interval_seconds = cfg.minutes * 60
-    state.next_tick = time.time() + (0 if cfg.immediate else interval_seconds)
-
+    # Desde el inicio del turno: si el equipo despertó tarde, esos bloques quedan vencidos.
+    state.tick_start = min(nxt, now(tz))
 
 
 def _should_tick(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> bool:
     return now(tz) >= state.tick_start + timedelta(minutes=cfg.minutes)
 
 
+def _sync_deadline(deadline: datetime, n: datetime, due: float | None) -> datetime:
+    # durabilidad group: despertar a tiempo para el fsync pendiente (ver DayWriter.sync_if_due)
+    return deadline if due is None else min(deadline, n + timedelta(seconds=due))
+
+
+def _wait_for_next_deadline(cfg: RunConfig, tz: ZoneInfo, calendar: WorkCalendar, state: RuntimeState) -> None:
+    n = now(tz)
+    deadline = next_deadline(
+        n,
+        state.tick_start + timedelta(minutes=cfg.minutes),
+        calendar,
+        state.break_start,
+        state.break_end,
+    )
+    deadline = _sync_deadline(deadline, n, state.store.sync_if_due())
+    if state.scheduler.sleep_until(deadline):
+        _report_clock_jump()
+
+
+def _report_clock_jump() -> None:
+    # salto de reloj (suspensión, NTP): el loop re-evalúa rotación, horario y bloques vencidos
+    print("⏯️ Cambio de reloj detectado (suspensión o ajuste de hora). Revisando bloques pendientes...")
+    logger.info("Clock jump; re-evaluating schedule")
+
+
 def _notify_if_enabled(cfg: RunConfig, tz: ZoneInfo, tick_start: datetime, tick_end: datetime) -> None:
     if not cfg.notify:
         return
@@ -245,13 +338,23 @@ def _is_break_block(state: RuntimeState, tick_start: datetime, tick_end: datetim
     return tick_start < break_end_dt and tick_end > break_start_dt
 
 
-def _collect_activity(choice: str, last_activities: list[str]) -> str:
+def _collect_activity(choice: str, state: RuntimeState) -> str:
     normalized = choice.strip().lower()
 
+    if normalized.startswith("/"):
+        # /texto: buscar entre las actividades de todos los días
+        query = choice.strip()[1:]
+        picked = ask_match(query, state.suggestions.lookup(query))
+        if not picked:
+            picked = prompt_multiline("Describe lo que hiciste (multilínea):")
+        else:
+            picked = maybe_edit(picked)
+        return picked.strip() or DEFAULT_ACTIVITY
+
     if normalized and normalized not in ("s", "b", "r") and not normalized.isdigit():
         return choice.strip() or DEFAULT_ACTIVITY
 
-    picked = choose_activity(choice, last_activities)
+    picked = choose_activity(choice, state.last_activities, state.suggestions.last())
 
     if normalized in ("s", "b"):
         return picked.strip() or DEFAULT_ACTIVITY
@@ -276,15 +379,133 @@ def _build_entry(tick_start, tick_end, activity: str, tags: str) -> Entry:
     )
 
 
-def _persist_and_export(state: RuntimeState, entry: Entry) -> None:
-    storage.append_jsonl(state.paths["jsonl"], entry)
-    storage.append_csv(state.paths["csv"], entry)
-    export_markdown(state.paths["md"], storage.read_jsonl(state.paths["jsonl"]))
-    print("💾 Guardado + Markdown actualizado.\n")
+def _save_entry(state: RuntimeState, entry: Entry) -> None:
+    # Sin prints: la variante asyncio lo ejecuta en el hilo de I/O.
+    state.ledger.append(entry)
+    # El Markdown y las sugerencias se regeneran en segundo plano (agrupando ráfagas).
+    _schedule_export(state)
     logger.info("Saved entry: %s %s-%s (%s min)", entry.date, entry.start, entry.end, entry.minutes)
 
 
+def _save_batch(state: RuntimeState, entries: list[Entry]) -> None:
+    # Igual que _save_entry para varias entradas: un solo commit y un solo export.
+    state.ledger.append_many(entries)
+    _schedule_export(state)
+    logger.info("Saved %s entries: %s-%s", len(entries), entries[0].start, entries[-1].end)
+
+
+def _persist_and_export(state: RuntimeState, entry: Entry) -> None:
+    _save_entry(state, entry)
+    print(SAVED_MSG)
+
+
+def _persist_batch(state: RuntimeState, entries: list[Entry]) -> None:
+    _save_batch(state, entries)
+    print(SAVED_BATCH_MSG.format(n=len(entries)))
+
+
+def _missed_blocks(cfg: RunConfig, state: RuntimeState, n: datetime) -> list[tuple[datetime, datetime]]:
+    """Bloques completos vencidos desde tick_start; se saltan los huecos entre turnos del calendario."""
+    step = timedelta(minutes=cfg.minutes)
+    blocks: list[tuple[datetime, datetime]] = []
+    start = state.tick_start
+    while start + step <= n:
+        end = start + step
+        shift_end = state.calendar.shift_end(start)
+        if shift_end is None or end > shift_end:
+            start = state.calendar.next_work_start(start)
+            continue
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+
+def _blocks_before_reset(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> list[tuple[datetime, datetime]]:
+    """
+    Bloques vencidos que se perderían al rotar el día o al dormir fuera de horario
+    (ambos mueven tick_start); acotados por el turno y por el fin del día del store.
+    """
+    n = now(tz)
+    if state.store.day == n.strftime("%Y-%m-%d") and state.calendar.is_work_time(n):
+        return []
+    day_end = datetime.combine(date.fromisoformat(state.store.day) + timedelta(days=1), dtime(), tz)
+    return _missed_blocks(cfg, state, min(n, day_end))
+
+
+def _catch_up_entries(state: RuntimeState, blocks: list[tuple[datetime, datetime]], activity: str, tags: str) -> list[Entry]:
+    return [
+        _build_entry(s, e, "(break / descanso)", "") if _is_break_block(state, s, e) else _build_entry(s, e, activity, tags)
+        for s, e in blocks
+    ]
+
+
+def _print_catch_up(state: RuntimeState, blocks: list[tuple[datetime, datetime]]) -> None:
+    print("=" * 70)
+    print(f"⏪ {len(blocks)} bloques sin registrar ({blocks[0][0].strftime('%H:%M')}–{blocks[-1][1].strftime('%H:%M')}):")
+    for s, e in blocks:
+        mark = "  (break)" if _is_break_block(state, s, e) else ""
+        print(f"   {s.strftime('%H:%M')}–{e.strftime('%H:%M')}{mark}")
+    print("Una sola actividad para todos los bloques.")
+    print("Opciones: [Enter]=nuevo o escribe la actividad  /  (s)=skip  /  (b)=break  /  (q)=salir")
+    sprint_menu(state.last_activities)
+
+
+def _notify_catch_up(cfg: RunConfig, blocks: list[tuple[datetime, datetime]]) -> None:
+    if cfg.notify:
+        notify_windows(
+            "Worklog",
+            f"Registrar {len(blocks)} bloques ({blocks[0][0].strftime('%H:%M')}–{blocks[-1][1].strftime('%H:%M')})",
+        )
+
+
+def _handle_catch_up(cfg: RunConfig, state: RuntimeState, blocks: list[tuple[datetime, datetime]]) -> bool:
+    """
+    Tras una suspensión/hibernación: todos los bloques vencidos con una sola
+    pregunta, una sola escritura por lotes y un solo export.
+    """
+    logger.info("Catch-up: %s missed blocks since %s", len(blocks), iso(state.tick_start))
+    _notify_catch_up(cfg, blocks)
+
+    activity, tags = DEFAULT_ACTIVITY, cfg.tags
+    if not all(_is_break_block(state, s, e) for s, e in blocks):
+        _print_catch_up(state, blocks)
+        choice_raw, timed_out = _input_with_timeout("> ", cfg.input_timeout_sec, default="")
+        choice = choice_raw.strip()
+        if not choice.startswith("/"):
+            choice = choice.lower()
+
+        if timed_out:
+            print(f"⏰ Sin respuesta. Se registrarán automáticamente como '{DEFAULT_ACTIVITY}'.")
+        elif choice == "q":
+            _flush_exports(state)
+            print(f"👋 Cerrando. Markdown exportado: {state.paths['md']}")
+            return False
+        else:
+            activity = _collect_activity(choice, state)
+            tags_raw, tags_timeout = _input_with_timeout(
+                f"Tags (Enter para '{cfg.tags}'): ", cfg.input_timeout_sec, default=cfg.tags
+            )
+            tags = cfg.tags if tags_timeout else (tags_raw.strip() or cfg.tags)
+            _remember(state, activity, blocks[-1][0])
+
+    _persist_batch(state, _catch_up_entries(state, blocks, activity, tags))
+    state.tick_start = blocks[-1][1]
+    return True
+
+
+def _print_block(state: RuntimeState, tick_end: datetime) -> None:
+    block_minutes = max(1, int((tick_end - state.tick_start).total_seconds() / 60))
+    print("=" * 70)
+    print(f"🕒 Bloque: {state.tick_start.strftime('%H:%M')}–{tick_end.strftime('%H:%M')} ({block_minutes} min)")
+    print("Opciones: [Enter]=nuevo o escribe la actividad  /  (s)=skip  /  (b)=break  /  (q)=salir")
+    sprint_menu(state.last_activities)
+
+
 def _handle_tick(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> bool:
+    blocks = _missed_blocks(cfg, state, now(tz))
+    if len(blocks) >= CATCH_UP_BLOCKS:
+        return _handle_catch_up(cfg, state, blocks)
+
     tick_end = state.tick_start + timedelta(minutes=cfg.minutes)
     _notify_if_enabled(cfg, tz, state.tick_start, tick_end)
 
@@ -292,17 +513,14 @@ def _handle_tick(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> bool:
         entry = _build_entry(state.tick_start, tick_end, "(break / descanso)", "")
         _persist_and_export(state, entry)
         state.tick_start = tick_end
-        state.next_tick = time.time()
         return True
 
-    block_minutes = max(1, int((tick_end - state.tick_start).total_seconds() / 60))
-    print("=" * 70)
-    print(f"🕒 Bloque: {state.tick_start.strftime('%H:%M')}–{tick_end.strftime('%H:%M')} ({block_minutes} min)")
-    print("Opciones: [Enter]=nuevo o escribe la actividad  /  (s)=skip  /  (b)=break  /  (q)=salir")
-    sprint_menu(state.last_activities)
+    _print_block(state, tick_end)
 
     choice_raw, timed_out = _input_with_timeout("> ", cfg.input_timeout_sec, default="")
-    choice = choice_raw.strip().lower()
+    choice = choice_raw.strip()
+    if not choice.startswith("/"):
+        choice = choice.lower()
 
     if timed_out:
         print(f"⏰ Sin respuesta. Se registrará automáticamente como '{DEFAULT_ACTIVITY}'.")
@@ -311,15 +529,14 @@ def _handle_tick(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> bool:
         entry = _build_entry(state.tick_start, tick_end, activity, tags)
         _persist_and_export(state, entry)
         state.tick_start = tick_end
-        state.next_tick = time.time()
         return True
 
     if choice == "q":
-        export_markdown(state.paths["md"], storage.read_jsonl(state.paths["jsonl"]))
+        _flush_exports(state)
         print(f"👋 Cerrando. Markdown exportado: {state.paths['md']}")
         return False
 
-    activity = _collect_activity(choice, state.last_activities)
+    activity = _collect_activity(choice, state)
     tags_raw, tags_timeout = _input_with_timeout(
         f"Tags (Enter para '{cfg.tags}'): ", cfg.input_timeout_sec, default=cfg.tags
     )
@@ -327,12 +544,11 @@ def _handle_tick(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> bool:
 
     entry = _build_entry(state.tick_start, tick_end, activity, tags)
 
-    state.last_activities = update_sprint(state.last_activities, activity)
+    _remember(state, activity, state.tick_start)
     _persist_and_export(state, entry)
 
     # avanzar ventana
     state.tick_start = tick_end
-    state.next_tick = time.time()
     return True
 
 
@@ -342,19 +558,26 @@ def _handle_tick(cfg: RunConfig, tz: ZoneInfo, state: RuntimeState) -> bool:
 
 def run(cfg: RunConfig) -> None:
     tz = ZoneInfo(cfg.tz_name)
-    window = _build_window(cfg)
-    state = _init_state(cfg, tz, window)
+    calendar = _build_calendar(cfg, tz)
+    state = _init_state(cfg, tz, calendar)
 
     try:
         while True:
+            blocks = _blocks_before_reset(cfg, tz, state)
+            if blocks and not _handle_catch_up(cfg, state, blocks):
+                return
             _rotate_if_new_day(cfg, tz, state)
-            _ensure_work_time_or_sleep(cfg, tz, window, state)
+            _ensure_work_time_or_sleep(cfg, tz, calendar, state)
 
             if _should_tick(cfg, tz, state) and not _handle_tick(cfg, tz, state):
                 return
 
-            time.sleep(1)
+            _wait_for_next_deadline(cfg, tz, calendar, state)
 
     except KeyboardInterrupt:
-        export_markdown(state.paths["md"], storage.read_jsonl(state.paths["jsonl"]))
+        state.store.commit()
+        _flush_exports(state)
         print(f"\n👋 Interrumpido. Markdown exportado: {state.paths['md']}")
+    finally:
+        state.exports.close()
+        state.store.close()
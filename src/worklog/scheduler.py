@@ -0,0 +1,109 @@
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from .clock import now
+from .workcal import WorkCalendar
+
+logger = logging.getLogger(__name__)
+
+
+def next_deadline(
+    n: datetime,
+    tick_due: datetime,
+    calendar: WorkCalendar,
+    break_start: tuple[int, int] | None = None,
+    break_end: tuple[int, int] | None = None,
+) -> datetime:
+    """
+    Próximo instante en que el runner tiene algo que hacer:
+    tick, borde del break, fin del turno en curso o medianoche (rotación de logs).
+    """
+    candidates = [tick_due, (n + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)]
+    end = calendar.shift_end(n)
+    if end:
+        candidates.append(end)
+    for hm in (break_start, break_end):
+        if hm:
+            candidates.append(n.replace(hour=hm[0], minute=hm[1], second=0, microsecond=0))
+
+    future = [c for c in candidates if c > n]
+    return min(future) if future else n
+
+
+class Scheduler:
+    """
+    Duerme hasta la siguiente deadline en vez de despertar cada segundo.
+    El sueño se parte en tramos de `max_sleep` segundos y al final de cada tramo
+    se buscan saltos de reloj de dos formas:
+
+    - el reloj de pared avanzó distinto que el monotónico (ajustes NTP, cambios
+      manuales de hora; y la suspensión en Linux/macOS, donde el monotónico se
+      detiene mientras el equipo duerme);
+    - el reloj de pared avanzó más que lo pedido: así se ve la suspensión en
+      Windows, donde time.monotonic sigue contando durante la suspensión.
+
+    Limitación: solo se detecta lo que ocurre durante un tramo de sueño y supera
+    `jump_tolerance`; una suspensión mientras se espera el prompt no la ve el
+    Scheduler (el catch-up del runner igual calcula los bloques por reloj de pared).
+    """
+
+    def __init__(
+        self,
+        tz: ZoneInfo,
+        max_sleep: float = 60.0,
+        jump_tolerance: float = 5.0,
+        sleep: Callable[[float], None] = time.sleep,
+        wall: Callable[[], float] = time.time,
+        mono: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.tz = tz
+        self.max_sleep = max_sleep
+        self.jump_tolerance = jump_tolerance
+        self._sleep = sleep
+        self._wall = wall
+        self._mono = mono
+
+    def _slice(self, deadline: datetime) -> float:
+        return min((deadline - now(self.tz)).total_seconds(), self.max_sleep)
+
+    def _jumped(self, wall0: float, mono0: float, seconds: float) -> bool:
+        wall = self._wall() - wall0
+        drift = wall - (self._mono() - mono0)
+        if abs(drift) > self.jump_tolerance:
+            logger.info("Wall clock jump detected: %.0f s", drift)
+            return True
+        if wall - seconds > self.jump_tolerance:
+            logger.info("Overslept by %.0f s (resume from suspend)", wall - seconds)
+            return True
+        return False
+
+    def sleep_until(self, deadline: datetime) -> bool:
+        """Duerme un tramo hacia `deadline`. Retorna True si detectó un salto de reloj."""
+        seconds = self._slice(deadline)
+        if seconds <= 0:
+            return False
+        wall0, mono0 = self._wall(), self._mono()
+        self._sleep(seconds)
+        return self._jumped(wall0, mono0, seconds)
+
+    async def asleep_until(self, deadline: datetime) -> bool:
+        """Versión asyncio de `sleep_until` (no bloquea el event loop)."""
+        seconds = self._slice(deadline)
+        if seconds <= 0:
+            return False
+        wall0, mono0 = self._wall(), self._mono()
+        await asyncio.sleep(seconds)
+        return self._jumped(wall0, mono0, seconds)
+
+    def sleep_through(self, deadline: datetime) -> None:
+        """Duerme hasta alcanzar `deadline` según el reloj de pared."""
+        while now(self.tz) < deadline:
+            self.sleep_until(deadline)
+
+    async def asleep_through(self, deadline: datetime) -> None:
+        while now(self.tz) < deadline:
+            await self.asleep_until(deadline)
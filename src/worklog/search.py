@@ -0,0 +1,408 @@
+import os
+import re
+import json
+import time
+import shutil
+import logging
+import unicodedata
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .config import SearchConfig
+from .domain import Entry
+from .tags import TagRegistry
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = "worklog_index"
+INDEX_VERSION = 2  # 2: shards agrupados por término con tabla de offsets (postings_NN.terms.json)
+SHARDS = 32
+FLUSH_EVERY = 5000  # entradas por lote al reconstruir
+
+_WORD = re.compile(r"\w+")
+_SPACES = re.compile(r"\s+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def index_dir(base_dir: str) -> str:
+    return os.path.join(base_dir, INDEX_DIR)
+
+
+def _lock_path(base_dir: str) -> str:
+    # Fuera de worklog_index/: rebuild reemplaza la carpeta completa.
+    return os.path.join(base_dir, INDEX_DIR + ".lock")
+
+
+def _pending_path(base_dir: str) -> str:
+    return os.path.join(base_dir, INDEX_DIR + ".pending.jsonl")
+
+
+def _lock_file(f, blocking: bool) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(0.05)
+    except BlockingIOError:
+        return False
+
+
+@contextmanager
+def _file_lock(path: str, blocking: bool = True) -> Iterator[bool]:
+    """Lock exclusivo entre procesos; el sistema lo libera si el proceso muere. Entrega si se obtuvo."""
+    with open(path, "a+b") as f:
+        f.seek(0)
+        locked = _lock_file(f, blocking)
+        try:
+            yield locked
+        finally:
+            if locked:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def fold(text: str) -> str:
+    """Minúsculas y sin tildes: 'Revisión' -> 'revision'."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def words(text: str) -> List[str]:
+    return _WORD.findall(fold(text))
+
+
+def fold_tag(tag: str) -> str:
+    return _SPACES.sub("-", fold(tag).strip()).strip("/")
+
+
+def _tag_terms(tags: Iterable[str]) -> Set[str]:
+    # `ado/backend` también se encuentra con #ado.
+    reg = TagRegistry()
+    out: Set[str] = set()
+    for t in tags:
+        for i in reg.lineage(reg.intern(fold_tag(t))):
+            out.add("#" + reg.names[i])
+    return out
+
+
+def entry_terms(e: Entry) -> Set[str]:
+    return set(words(e.activity)) | _tag_terms(e.tag_tuple)
+
+
+def _shard(term: str) -> int:
+    return zlib.crc32(term.encode("utf-8")) % SHARDS
+
+
+@dataclass
+class Hit:
+    date: str
+    start: str
+    end: str
+    tags: str
+    activity: str
+
+    def block(self) -> str:
+        return f"{self.start[11:16]}–{self.end[11:16]}"
+
+
+class SearchIndex:
+    """
+    Índice invertido en logs/worklog_index/:
+    - docs.jsonl: una línea por entrada; el id del documento es su offset en bytes.
+    - postings_NN.tsv: líneas `término<TAB>offset`, repartidas en SHARDS archivos por hash.
+    - postings_NN.terms.json: tabla término -> [offset, largo] del tramo agrupado por rebuild.
+    Agregar una entrada solo escribe su documento y sus términos al final de cada archivo;
+    esa cola (después del tramo de la tabla) se recorre completa hasta el próximo rebuild.
+    """
+
+    def __init__(self, base_dir: str, root: str | None = None) -> None:
+        self.base_dir = base_dir
+        self.root = root or index_dir(base_dir)
+        self._tables: Dict[int, Tuple[int, Dict[str, List[int]]]] = {}
+
+    @property
+    def docs_path(self) -> str:
+        return os.path.join(self.root, "docs.jsonl")
+
+    def _postings_path(self, shard: int) -> str:
+        return os.path.join(self.root, f"postings_{shard:02d}.tsv")
+
+    def _table_path(self, shard: int) -> str:
+        return os.path.join(self.root, f"postings_{shard:02d}.terms.json")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.docs_path)
+
+    # --- escritura ---
+
+    def add(self, entry: Entry) -> None:
+        self.add_many([entry])
+
+    def maintain(self, entry: Entry) -> None:
+        """
+        Delta por cada entrada guardada; solo si el índice ya existe (worklog search --rebuild).
+        Si hay un rebuild en curso, la entrada va al diario de pendientes y rebuild la reaplica.
+        """
+        try:
+            # El lock del diario primero: rebuild lo toma para vaciarlo antes de publicar el índice.
+            with _file_lock(_pending_path(self.base_dir) + ".lock"):
+                with _file_lock(_lock_path(self.base_dir), blocking=False) as free:
+                    if not free:
+                        with open(_pending_path(self.base_dir), "ab") as f:
+                            f.write(json.dumps(entry.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n")
+                    elif self.exists():
+                        self.add(entry)
+        except OSError:
+            logger.warning("Could not update search index in %s", self.root)
+
+    def add_many(self, entries: Iterable[Entry]) -> int:
+        os.makedirs(self.root, exist_ok=True)
+        by_shard: Dict[int, List[str]] = {}
+        count = 0
+        with open(self.docs_path, "ab") as docs:
+            for e in entries:
+                offset = docs.tell()
+                docs.write(json.dumps(e.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n")
+                for term in entry_terms(e):
+                    by_shard.setdefault(_shard(term), []).append(f"{term}\t{offset}\n")
+                count += 1
+                if count % FLUSH_EVERY == 0:
+                    docs.flush()
+                    self._write_postings(by_shard)
+        self._write_postings(by_shard)
+        return count
+
+    def _write_postings(self, by_shard: Dict[int, List[str]]) -> None:
+        # Los documentos se escriben antes que sus postings: nunca hay un offset sin documento.
+        for shard, lines in by_shard.items():
+            with open(self._postings_path(shard), "ab") as f:
+                f.write("".join(lines).encode("utf-8"))
+        by_shard.clear()
+
+    def seal(self) -> None:
+        """Agrupa cada shard por término (orden de offsets intacto) y escribe su tabla de offsets."""
+        for shard in range(SHARDS):
+            path = self._postings_path(shard)
+            if not os.path.exists(path):
+                continue
+            groups: Dict[bytes, List[bytes]] = {}
+            with open(path, "rb") as f:
+                for line in f:
+                    groups.setdefault(line.split(b"\t", 1)[0], []).append(line)
+            table: Dict[str, List[int]] = {}
+            pos = 0
+            with open(path, "wb") as f:
+                for term, lines in groups.items():
+                    chunk = b"".join(lines)
+                    f.write(chunk)
+                    table[term.decode("utf-8")] = [pos, len(chunk)]
+                    pos += len(chunk)
+            with open(self._table_path(shard), "w", encoding="utf-8") as f:
+                json.dump({"size": pos, "terms": table}, f, ensure_ascii=False)
+        self._tables.clear()
+
+    # --- lectura ---
+
+    def _table(self, shard: int) -> Tuple[int, Dict[str, List[int]]]:
+        if shard not in self._tables:
+            try:
+                with open(self._table_path(shard), encoding="utf-8") as f:
+                    t = json.load(f)
+                self._tables[shard] = (t["size"], t["terms"])
+            except (OSError, ValueError, KeyError):
+                self._tables[shard] = (0, {})  # índice sin tabla: se recorre el shard completo
+        return self._tables[shard]
+
+    def _postings(self, term: str) -> Set[int]:
+        # Tramo agrupado: un seek con la tabla. Cola agregada después del rebuild: recorrido lineal.
+        shard = _shard(term)
+        size, table = self._table(shard)
+        prefix = term.encode("utf-8") + b"\t"
+        out: Set[int] = set()
+        try:
+            with open(self._postings_path(shard), "rb") as f:
+                span = table.get(term)
+                if span:
+                    f.seek(span[0])
+                    out.update(int(line[len(prefix):]) for line in f.read(span[1]).splitlines())
+                f.seek(size)
+                for line in f:
+                    if line.startswith(prefix):
+                        out.add(int(line[len(prefix):]))
+        except OSError:
+            pass
+        return out
+
+    def contains(self, entry: Entry) -> bool:
+        """Si `entry` ya tiene documento (se busca por sus términos, no recorriendo docs.jsonl)."""
+        candidates: Set[int] | None = None
+        for term in entry_terms(entry):
+            postings = self._postings(term)
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return False
+        if candidates is None:
+            return False
+        doc = entry.to_dict()
+        with open(self.docs_path, "rb") as f:
+            return any(self._doc(f, offset) == doc for offset in candidates)
+
+    def _doc(self, f, offset: int) -> dict:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+    def search(self, query: str, limit: int = 20) -> List[Hit]:
+        """Todas las palabras y tags deben aparecer; "entre comillas" exige la frase exacta."""
+        terms, phrases = parse_query(query)
+        if not terms:
+            return []
+
+        candidates: Set[int] | None = None
+        for term in sorted(terms, key=len, reverse=True):  # términos largos suelen ser más selectivos
+            postings = self._postings(term)
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return []
+
+        # Los documentos se agregan en orden cronológico: offsets mayores = entradas más recientes.
+        hits: List[Hit] = []
+        with open(self.docs_path, "rb") as f:
+            for offset in sorted(candidates, reverse=True):
+                d = self._doc(f, offset)
+                if phrases:
+                    text = " " + " ".join(words(d["activity"])) + " "
+                    if not all(f" {p} " in text for p in phrases):
+                        continue
+                hits.append(Hit(d["date"], d["start"], d["end"], d["tags"], d["activity"]))
+                if len(hits) >= limit:
+                    break
+        hits.sort(key=lambda h: (h.date, h.start), reverse=True)
+        return hits
+
+
+def parse_query(query: str) -> Tuple[Set[str], List[str]]:
+    terms: Set[str] = set()
+    phrases: List[str] = []
+    for phrase, token in _QUERY.findall(query):
+        if phrase:
+            ws = words(phrase)
+            terms.update(ws)
+            if len(ws) > 1:
+                phrases.append(" ".join(ws))
+        elif token.startswith("#") or token.startswith("tag:"):
+            tag = fold_tag(token[1:] if token.startswith("#") else token[4:])
+            if tag:
+                terms.add("#" + tag)
+        else:
+            terms.update(words(token))
+    return terms, phrases
+
+
+def _history(base_dir: str) -> Iterator[Entry]:
+    # Mismo orden de precedencia por día que los resúmenes.
+    from .storage import discover_days, read_day_any
+
+    for day in discover_days(base_dir):
+        yield from read_day_any(base_dir, day)
+
+
+def _replay_pending(base_dir: str, index: SearchIndex) -> int:
+    # Entradas guardadas por `maintain` durante el rebuild; las que el historial ya traía se omiten.
+    path = _pending_path(base_dir)
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return 0
+    count = 0
+    for line in lines:
+        try:
+            e = Entry(**json.loads(line))
+        except (ValueError, TypeError):
+            continue  # línea cortada por un corte de luz
+        if not index.contains(e):
+            count += index.add_many([e])
+    os.remove(path)
+    return count
+
+
+def rebuild(base_dir: str, backend: str = "files") -> int:
+    """Reconstruye el índice desde el historial completo. Retorna la cantidad de entradas indexadas."""
+    final = index_dir(base_dir)
+    tmp = final + ".tmp"
+    os.makedirs(base_dir, exist_ok=True)
+
+    # Mientras dure, `maintain` (runner en otro proceso) escribe al diario de pendientes.
+    with _file_lock(_lock_path(base_dir)):
+        shutil.rmtree(tmp, ignore_errors=True)
+        index = SearchIndex(base_dir, root=tmp)
+        if backend == "sqlite":
+            from datetime import date
+            from .sqlite_store import SqliteStore
+
+            store = SqliteStore(base_dir)
+            try:
+                count = index.add_many(store.iter_range(date.min, date.max))
+            finally:
+                store.close()
+        else:
+            count = index.add_many(_history(base_dir))
+        index.seal()
+
+        with _file_lock(_pending_path(base_dir) + ".lock"):
+            replayed = _replay_pending(base_dir, index)
+            count += replayed
+            os.makedirs(tmp, exist_ok=True)
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "shards": SHARDS, "entries": count}, f)
+            shutil.rmtree(final, ignore_errors=True)
+            os.replace(tmp, final)
+    logger.info("Search index rebuilt with %s entries (%s replayed from pending)", count, replayed)
+    return count
+
+
+def first_line(text: str) -> str:
+    lines = [x.strip() for x in (text or "").splitlines() if x.strip()]
+    if not lines:
+        return ""
+    return lines[0] + (" …" if len(lines) > 1 else "")
+
+
+def search(cfg: SearchConfig) -> None:
+    if cfg.rebuild:
+        count = rebuild(cfg.base_dir, cfg.backend)
+        print(f"✅ Índice de búsqueda reconstruido: {count} entradas.")
+        if not cfg.query:
+            return
+
+    index = SearchIndex(cfg.base_dir)
+    if not index.exists():
+        print("⚠️ No hay índice de búsqueda. Ejecuta: worklog search --rebuild")
+        return
+
+    t0 = time.perf_counter()
+    hits = index.search(cfg.query, cfg.limit)
+    ms = (time.perf_counter() - t0) * 1000
+
+    print(f"🔎 {len(hits)} resultado(s) para \"{cfg.query}\" ({ms:.1f} ms)")
+    for h in hits:
+        tags = f" [{h.tags}]" if h.tags else ""
+        print(f"- {h.date} {h.block()}{tags} {first_line(h.activity)}")
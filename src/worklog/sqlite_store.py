@@ -0,0 +1,306 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from itertools import groupby
+from datetime import date
+from typing import Dict, Iterator, List
+
+from .config import MigrateConfig
+from .domain import Entry
+from .tags import TagRegistry
+from .search import SearchIndex
+from .catalog import get_catalog
+from .storage import DURABILITY_MODES, ensure_dir, file_signature, read_source, source_signature
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "worklog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id       INTEGER PRIMARY KEY,
+    date     TEXT NOT NULL,
+    start    TEXT NOT NULL,
+    end      TEXT NOT NULL,
+    minutes  INTEGER NOT NULL,
+    activity TEXT NOT NULL,
+    tags     TEXT NOT NULL,
+    source   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date);
+CREATE INDEX IF NOT EXISTS idx_entries_start ON entries(start);
+CREATE TABLE IF NOT EXISTS entry_tags (
+    entry_id INTEGER NOT NULL,
+    pos      INTEGER NOT NULL,
+    tag      TEXT NOT NULL,
+    PRIMARY KEY (entry_id, pos)
+);
+CREATE INDEX IF NOT EXISTS idx_entry_tags_tag ON entry_tags(tag);
+CREATE TABLE IF NOT EXISTS imported_days (
+    day      TEXT PRIMARY KEY,
+    source   TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+_ENTRY_COLS = "date, start, end, minutes, activity, tags"
+_FETCH_ROWS = 512  # filas por tanda en las lecturas en stream
+
+
+def db_path(base_dir: str) -> str:
+    return os.path.join(base_dir, DB_NAME)
+
+
+def _row_to_entry(row: tuple) -> Entry:
+    return Entry(date=row[0], start=row[1], end=row[2], minutes=row[3], activity=row[4], tags=row[5])
+
+
+class SqliteStore:
+    """
+    Backend SQLite (logs/worklog.sqlite3) con índices por fecha, inicio y tag.
+    Las consultas por rango o tag son búsquedas indexadas en vez de recorrer carpetas.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, base_dir: str, day: str = "", durability: str = "fsync") -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Durabilidad inválida '{durability}'. Usa: {', '.join(DURABILITY_MODES)}.")
+        ensure_dir(base_dir)
+        self.base_dir = base_dir
+        self.day = day
+        self.path = db_path(base_dir)
+        self.durability = durability
+        self.group_size = 16
+        self.group_seconds = 5.0
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._batch_depth = 0
+        # Una conexión compartida por varios hilos: el loop (o el hilo de I/O del modo
+        # asyncio) escribe y confirma, y ExportWorker lee el día para el Markdown.
+        # Todo acceso a `conn` y al estado del modo group pasa por este lock.
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durability == 'fsync' else 'NORMAL'}")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+        self.index = SearchIndex(base_dir)
+
+    # --- escritura ---
+
+    def rotate(self, day: str) -> None:
+        with self._lock:
+            self.commit()
+            self.day = day
+
+    def _insert(self, entry: Entry, source: str | None = None) -> None:
+        cur = self.conn.execute(
+            f"INSERT INTO entries ({_ENTRY_COLS}, source) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (entry.date, entry.start, entry.end, entry.minutes, entry.activity, entry.tags, source),
+        )
+        self.conn.executemany(
+            "INSERT INTO entry_tags (entry_id, pos, tag) VALUES (?, ?, ?)",
+            [(cur.lastrowid, i, t) for i, t in enumerate(entry.tag_tuple)],
+        )
+        self._pending += 1
+
+    def append(self, entry: Entry) -> None:
+        with self._lock:
+            self._insert(entry)
+            self.index.maintain(entry)
+            if self._batch_depth:
+                return
+            if (
+                self.durability != "group"
+                or self._pending >= self.group_size
+                or time.monotonic() - self._last_commit >= self.group_seconds
+            ):
+                self.commit()
+
+    @contextmanager
+    def batch(self) -> Iterator["SqliteStore"]:
+        # El lote completo es una sola transacción: otro hilo no confirma filas a medias.
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self.commit()
+
+    def commit(self) -> None:
+        with self._lock:
+            self.conn.commit()
+            self._pending = 0
+            self._last_commit = time.monotonic()
+
+    def sync_if_due(self) -> float | None:
+        """Igual que DayWriter.sync_if_due: confirma lo pendiente del modo group al vencer `group_seconds`."""
+        with self._lock:
+            if self.durability != "group" or not self._pending or self._batch_depth:
+                return None
+            left = self._last_commit + self.group_seconds - time.monotonic()
+            if left > 0:
+                return left
+            self.commit()
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            self.commit()
+            self.conn.close()
+
+    # --- lectura ---
+
+    def _query(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _iter_rows(self, sql: str, params: tuple = ()) -> Iterator[tuple]:
+        # Por tandas: el lock no queda tomado mientras el consumidor procesa cada fila.
+        with self._lock:
+            cur = self.conn.execute(sql, params)
+            rows = cur.fetchmany(_FETCH_ROWS)
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cur.fetchmany(_FETCH_ROWS)
+
+    def read_day(self, day: str) -> List[Entry]:
+        rows = self._query(f"SELECT {_ENTRY_COLS} FROM entries WHERE date = ? ORDER BY id", (day,))
+        return [_row_to_entry(r) for r in rows]
+
+    def iter_day_reversed(self, day: str) -> Iterator[Entry]:
+        for r in self._iter_rows(f"SELECT {_ENTRY_COLS} FROM entries WHERE date = ? ORDER BY id DESC", (day,)):
+            yield _row_to_entry(r)
+
+    def iter_recent(self) -> Iterator[Entry]:
+        for r in self._iter_rows(f"SELECT {_ENTRY_COLS} FROM entries ORDER BY date DESC, id DESC"):
+            yield _row_to_entry(r)
+
+    def day_signature(self, day: str) -> tuple | None:
+        count, max_id = self._query("SELECT COUNT(*), MAX(id) FROM entries WHERE date = ?", (day,))[0]
+        return (count, max_id) if count else None
+
+    def iter_range(self, d1: date, d2: date) -> Iterator[Entry]:
+        rows = self._iter_rows(
+            f"SELECT {_ENTRY_COLS} FROM entries WHERE date BETWEEN ? AND ? ORDER BY date, start, id",
+            (d1.isoformat(), d2.isoformat()),
+        )
+        for r in rows:
+            yield _row_to_entry(r)
+
+    def summarize_range(self, d1: date, d2: date) -> dict:
+        # Mismo formato y orden que weekly._summarize (empates por primera aparición).
+        params = (d1.isoformat(), d2.isoformat())
+        total = self._query(
+            "SELECT COALESCE(SUM(minutes), 0) FROM entries WHERE date BETWEEN ? AND ?", params
+        )[0][0]
+        by_day = dict(self._query(
+            "SELECT date, SUM(minutes) FROM entries WHERE date BETWEEN ? AND ? GROUP BY date ORDER BY date", params
+        ))
+        tag_rows = self._query(
+            """
+            SELECT COALESCE(t.tag, '(sin tags)') AS tag,
+                   SUM(e.minutes),
+                   MIN(printf('%s:%012d:%04d', e.date, e.id, COALESCE(t.pos, 0)))
+            FROM entries e LEFT JOIN entry_tags t ON t.entry_id = e.id
+            WHERE e.date BETWEEN ? AND ?
+            GROUP BY tag
+            """,
+            params,
+        )
+        tag_rows.sort(key=lambda r: r[2])
+        by_tag: Dict[str, int] = {tag: mins for tag, mins, _ in tag_rows}
+
+        tree_rows = self._iter_rows(
+            """
+            SELECT e.id, e.minutes, t.tag
+            FROM entries e JOIN entry_tags t ON t.entry_id = e.id
+            WHERE e.date BETWEEN ? AND ?
+            ORDER BY e.id, t.pos
+            """,
+            params,
+        )
+        by_tag_tree = TagRegistry().totals(
+            (tuple(r[2] for r in rows), mins)
+            for (_, mins), rows in groupby(tree_rows, key=lambda r: (r[0], r[1]))
+        )
+
+        return {
+            "total_minutes": total,
+            "by_day": by_day,
+            "by_tag": dict(sorted(by_tag.items(), key=lambda kv: kv[1], reverse=True)),
+            "by_tag_tree": by_tag_tree,
+        }
+
+    # --- migración ---
+
+    def import_day(self, day: str, path: str, entries: List[Entry], sig: tuple[int, int] | None = None) -> bool:
+        """
+        Reemplaza las filas importadas de `day` por `entries`. Si el día ya tiene
+        filas escritas con el backend sqlite (source NULL), manda SQLite y no se
+        importa: las mismas horas quedarían contadas dos veces.
+        """
+        sig = sig or file_signature(path)
+        if sig is None:
+            return False
+        with self.batch():
+            native = self.conn.execute("SELECT 1 FROM entries WHERE date = ? AND source IS NULL LIMIT 1", (day,)).fetchone()
+            if native:
+                logger.warning("Not importing %s from %s: the day already has entries written to SQLite", day, path)
+                return False
+            prev = self.conn.execute("SELECT source, size, mtime_ns FROM imported_days WHERE day = ?", (day,)).fetchone()
+            if prev == (path, sig[0], sig[1]):
+                return False
+
+            if prev:
+                self.conn.execute(
+                    "DELETE FROM entry_tags WHERE entry_id IN (SELECT id FROM entries WHERE date = ? AND source = ?)",
+                    (day, prev[0]),
+                )
+                self.conn.execute("DELETE FROM entries WHERE date = ? AND source = ?", (day, prev[0]))
+            for e in entries:
+                self._insert(e, source=path)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO imported_days (day, source, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                (day, path, sig[0], sig[1]),
+            )
+        return True
+
+
+def migrate_files(base_dir: str) -> tuple[int, int]:
+    """
+    Importa el historial JSONL/CSV a SQLite. Es idempotente: solo reimporta días
+    cuyo archivo fuente cambió, y omite los días con registros propios de SQLite.
+    Retorna (días importados, entradas importadas).
+    """
+    store = SqliteStore(base_dir)
+    catalog = get_catalog(base_dir)
+    imported_days = 0
+    imported_entries = 0
+    try:
+        for day in catalog.days():
+            for source in catalog.sources(day):
+                entries = read_source(source)
+                if not entries:
+                    continue
+                if store.import_day(day, source.path, entries, source_signature(source)):
+                    imported_days += 1
+                    imported_entries += len(entries)
+                break
+    finally:
+        store.close()
+    logger.info("Migrated %s days (%s entries) into %s", imported_days, imported_entries, db_path(base_dir))
+    return imported_days, imported_entries
+
+
+def migrate(cfg: MigrateConfig) -> None:
+    days, entries = migrate_files(cfg.base_dir)
+    print(f"✅ Migración a SQLite: {days} días, {entries} entradas importadas.")
@@ -1,13 +1,24 @@
+import io
 import os
 import csv
-import json
+import time
 import logging
-from dataclasses import asdict
-from typing import List
+from contextlib import contextmanager
+from typing import ContextManager, Iterator, List, Protocol, TextIO
 from .domain import Entry
+from .archive import read_archived
+from .catalog import LogCatalog, Source, get_catalog
+from .decoder import decode_jsonl, decode_line
+from .journal import recover_csv_tail, recover_tail, seal
+from .search import SearchIndex
 
 logger = logging.getLogger(__name__)
 
+CSV_HEADER = ["date", "start", "end", "minutes", "activity", "tags"]
+DURABILITY_MODES = ("flush", "fsync", "group")
+REVERSE_BLOCK = 64 * 1024
+BACKENDS = ("files", "sqlite")
+
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
@@ -27,6 +38,23 @@ def paths_for_day(base_dir: str, day: str) -> dict:
     }
 
 
+def day_file_paths(base_dir: str, day: str) -> dict:
+    # Igual que paths_for_day pero sin crear carpetas (solo lectura).
+    return {
+        "jsonl": os.path.join(base_dir, "worklog_json", f"{day}_worklog.jsonl"),
+        "csv":   os.path.join(base_dir, "worklog_csv", f"{day}_worklog.csv"),
+        "md":    os.path.join(base_dir, "worklog_md", f"{day}_worklog.md"),
+    }
+
+
+def file_signature(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
 def legacy_paths_for_day(base_dir: str, day: str) -> dict:
     return {
         "jsonl": os.path.join(base_dir, f"{day}_worklog.jsonl"),
@@ -34,59 +62,331 @@ def legacy_paths_for_day(base_dir: str, day: str) -> dict:
         "md":    os.path.join(base_dir, f"{day}_worklog.md"),
     }
 
+def discover_days(base_dir: str) -> List[str]:
+    """Días con algún archivo JSONL o CSV (carpetas nuevas o legacy), ordenados."""
+    return get_catalog(base_dir).days()
+
+
+def read_source(source: Source) -> List[Entry]:
+    # read_jsonl/read_csv resuelven solas los días archivados.
+    return read_csv(source.path) if source.kind.endswith("csv") else read_jsonl(source.path)
+
+
+def source_signature(source: Source) -> tuple[int, int] | None:
+    return file_signature(source.stat_path)
+
+
+def read_day_any(base_dir: str, day: str, catalog: LogCatalog | None = None) -> List[Entry]:
+    # Precedencia: JSONL, CSV, JSONL legacy, CSV legacy (la primera fuente con datos gana).
+    # Solo se abren los archivos que existen según el catálogo.
+    for source in (catalog or get_catalog(base_dir)).sources(day):
+        entries = read_source(source)
+        if entries:
+            return entries
+    return []
+
+
+def _reverse_lines(f, size: int, block_size: int) -> Iterator[bytes]:
+    # Líneas de la última a la primera, leyendo bloques fijos desde el final.
+    pos = size
+    rest = b""
+    while pos > 0:
+        step = min(block_size, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + rest).split(b"\n")
+        rest = lines[0]
+        yield from reversed(lines[1:])
+    yield rest.removeprefix(b"\xef\xbb\xbf")
+
+
+def iter_jsonl_reverse(path: str, block_size: int = REVERSE_BLOCK) -> Iterator[Entry]:
+    """
+    Entradas de un JSONL de la más reciente a la más antigua. Lee bloques desde el
+    final: quien corta temprano (última entrada, tail) no paga el tamaño del archivo.
+    Las líneas inválidas se omiten.
+    """
+    # día compactado: lo archivado más lo escrito después en la ruta del día, ya unidos
+    data = read_archived(path)
+    try:
+        f = open(path, "rb") if data is None else io.BytesIO(data)
+    except FileNotFoundError:
+        return
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        for raw in _reverse_lines(f, size, block_size):
+            entry = decode_line(raw)
+            if entry is not None:
+                yield entry
+
+
+def iter_source_reverse(source: Source) -> Iterator[Entry]:
+    if source.kind.endswith("csv"):
+        return reversed(read_csv(source.path))
+    return iter_jsonl_reverse(source.path)
+
+
+def iter_recent(base_dir: str, catalog: LogCatalog | None = None) -> Iterator[Entry]:
+    """Todo el historial de la entrada más reciente hacia atrás (misma precedencia por día que read_day_any)."""
+    catalog = catalog or get_catalog(base_dir)
+    for day in reversed(catalog.days()):
+        for source in catalog.sources(day):
+            it = iter_source_reverse(source)
+            first = next(it, None)
+            if first is not None:
+                yield first
+                yield from it
+                break
+
+
 def init_csv_if_needed(path: str) -> None:
     if os.path.exists(path) and os.path.getsize(path) > 0:
         return
     with open(path, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
-        w.writerow(["date", "start", "end", "minutes", "activity", "tags"])
+        w.writerow(CSV_HEADER)
+
+def _jsonl_line(entry: Entry, seq: int) -> str:
+    return seal(entry, seq) + "\n"
+
+def _csv_row(entry: Entry) -> list:
+    return [entry.date, entry.start, entry.end, entry.minutes, entry.activity, entry.tags]
 
 def append_jsonl(path: str, entry: Entry) -> None:
+    # Repara una cola cortada antes de escribir: la línea nueva nunca queda pegada a otra a medias.
+    seq = recover_tail(path).last_seq
     with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+        f.write(_jsonl_line(entry, seq + 1))
 
 def append_csv(path: str, entry: Entry) -> None:
     with open(path, "a", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
-        w.writerow([entry.date, entry.start, entry.end, entry.minutes, entry.activity, entry.tags])
+        w.writerow(_csv_row(entry))
+
+
+class DayWriter:
+    """
+    Mantiene abiertos los archivos JSONL y CSV del día entre ticks.
+    Durabilidad:
+    - flush: se vacía el buffer al SO en cada entrada.
+    - fsync: flush + fsync en cada entrada (default, uso interactivo).
+    - group: flush en cada entrada y fsync agrupado cada `group_size` entradas o `group_seconds`.
+      Como nadie escribe mientras el runner duerme, el runner llama a `sync_if_due`
+      antes de dormir para que lo pendiente no espere al próximo tick.
+    Dentro de `batch()` se difiere todo y se confirma una sola vez al salir.
+    """
+
+    def __init__(self, paths: dict, durability: str = "fsync", group_size: int = 16, group_seconds: float = 5.0) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Durabilidad inválida '{durability}'. Usa: {', '.join(DURABILITY_MODES)}.")
+        self.durability = durability
+        self.group_size = max(1, group_size)
+        self.group_seconds = group_seconds
+        self.paths: dict = {}
+        self._jsonl = None
+        self._csv = None
+        self._csv_writer = None
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._batch_depth = 0
+        self._seq = 0
+        self.open(paths)
+
+    def open(self, paths: dict) -> None:
+        self.paths = paths
+        # Recuperación tras un corte: solo se lee el final de cada archivo.
+        self._seq = recover_tail(paths["jsonl"]).last_seq
+        recover_csv_tail(paths["csv"])
+        init_csv_if_needed(paths["csv"])
+        self._jsonl = open(paths["jsonl"], "a", encoding="utf-8")
+        self._csv = open(paths["csv"], "a", newline="", encoding="utf-8")
+        self._csv_writer = csv.writer(self._csv)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def rotate(self, paths: dict) -> None:
+        self.close()
+        self.open(paths)
+
+    def append(self, entry: Entry) -> None:
+        self._seq += 1
+        self._jsonl.write(_jsonl_line(entry, self._seq))
+        self._csv_writer.writerow(_csv_row(entry))
+        self._pending += 1
+        if self._batch_depth:
+            return
+
+        self._flush()
+        if self.durability == "fsync":
+            self._sync()
+        elif self.durability == "group":
+            if self._pending >= self.group_size or time.monotonic() - self._last_sync >= self.group_seconds:
+                self._sync()
+
+    @contextmanager
+    def batch(self) -> Iterator["DayWriter"]:
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.commit()
+
+    def commit(self) -> None:
+        if self._jsonl is None:
+            return
+        self._flush()
+        if self.durability != "flush" and self._pending:
+            self._sync()
+
+    def sync_if_due(self) -> float | None:
+        """
+        Modo group: fsync de lo pendiente si ya venció `group_seconds`.
+        Retorna los segundos que faltan para el vencimiento si queda algo pendiente.
+        """
+        if self._jsonl is None or self.durability != "group" or not self._pending or self._batch_depth:
+            return None
+        left = self._last_sync + self.group_seconds - time.monotonic()
+        if left > 0:
+            return left
+        self._flush()
+        self._sync()
+        return None
+
+    def close(self) -> None:
+        if self._jsonl is None:
+            return
+        self.commit()
+        self._jsonl.close()
+        self._csv.close()
+        self._jsonl = self._csv = self._csv_writer = None
+
+    def _flush(self) -> None:
+        self._jsonl.flush()
+        self._csv.flush()
+
+    def _sync(self) -> None:
+        os.fsync(self._jsonl.fileno())
+        os.fsync(self._csv.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+
+def _warn_skipped(report, path: str) -> None:
+    if report.skipped:
+        logger.warning(
+            "Ignored %s invalid JSONL lines in %s (lines %s)", report.skipped, path, report.error_lines()
+        )
+
 
 def read_jsonl(path: str) -> List[Entry]:
-    if not os.path.exists(path):
+    # Días compactados: se leen desde worklog_archive/ con el mismo resultado; si después
+    # se escribió en la ruta del día, esas entradas van a continuación de las archivadas.
+    data = read_archived(path)
+    if data is None and not os.path.exists(path):
         return []
-    out: List[Entry] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                d = json.loads(line)
-                out.append(Entry(**d))
-            except Exception:
-                logger.warning("Invalid JSONL line ignored in %s", path)
-                continue
-    return out
+    entries, report = decode_jsonl(path, data=data)
+    _warn_skipped(report, path)
+    return entries
 
 
 def read_csv(path: str) -> List[Entry]:
+    data = read_archived(path)
+    if data is not None:
+        return _read_csv_rows(io.StringIO(data.decode("utf-8"), newline=""), path)
     if not os.path.exists(path):
         return []
-    out: List[Entry] = []
     with open(path, "r", newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            try:
-                out.append(
-                    Entry(
-                        date=(row.get("date") or "").strip(),
-                        start=(row.get("start") or "").strip(),
-                        end=(row.get("end") or "").strip(),
-                        minutes=int((row.get("minutes") or "0").strip() or "0"),
-                        activity=(row.get("activity") or "").strip(),
-                        tags=(row.get("tags") or "").strip(),
-                    )
+        return _read_csv_rows(f, path)
+
+
+def _read_csv_rows(f: TextIO, path: str) -> List[Entry]:
+    out: List[Entry] = []
+    r = csv.DictReader(f)
+    for row in r:
+        try:
+            out.append(
+                Entry(
+                    date=(row.get("date") or "").strip(),
+                    start=(row.get("start") or "").strip(),
+                    end=(row.get("end") or "").strip(),
+                    minutes=int((row.get("minutes") or "0").strip() or "0"),
+                    activity=(row.get("activity") or "").strip(),
+                    tags=(row.get("tags") or "").strip(),
                 )
-            except Exception:
-                logger.warning("Invalid CSV row ignored in %s", path)
-                continue
+            )
+        except Exception:
+            logger.warning("Invalid CSV row ignored in %s", path)
+            continue
     return out
+
+
+class Store(Protocol):
+    """Backend de almacenamiento del runner y de los resúmenes."""
+
+    name: str
+    day: str
+
+    def rotate(self, day: str) -> None: ...
+    def append(self, entry: Entry) -> None: ...
+    def batch(self) -> ContextManager: ...
+    def commit(self) -> None: ...
+    def sync_if_due(self) -> float | None: ...
+    def close(self) -> None: ...
+    def read_day(self, day: str) -> List[Entry]: ...
+    def iter_day_reversed(self, day: str) -> Iterator[Entry]: ...
+    def day_signature(self, day: str) -> tuple | None: ...
+
+
+class FileStore:
+    """Backend por defecto: un JSONL (fuente) y un CSV por día."""
+
+    name = "files"
+
+    def __init__(self, base_dir: str, day: str, durability: str = "fsync") -> None:
+        self.base_dir = base_dir
+        self.day = day
+        self.paths = paths_for_day(base_dir, day)
+        self.writer = DayWriter(self.paths, durability)
+        self.index = SearchIndex(base_dir)
+
+    def rotate(self, day: str) -> None:
+        self.day = day
+        self.paths = paths_for_day(self.base_dir, day)
+        self.writer.rotate(self.paths)
+
+    def append(self, entry: Entry) -> None:
+        self.writer.append(entry)
+        self.index.maintain(entry)
+
+    def batch(self) -> ContextManager:
+        return self.writer.batch()
+
+    def commit(self) -> None:
+        self.writer.commit()
+
+    def sync_if_due(self) -> float | None:
+        return self.writer.sync_if_due()
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def read_day(self, day: str) -> List[Entry]:
+        return read_jsonl(day_file_paths(self.base_dir, day)["jsonl"])
+
+    def iter_day_reversed(self, day: str) -> Iterator[Entry]:
+        return iter_jsonl_reverse(day_file_paths(self.base_dir, day)["jsonl"])
+
+    def day_signature(self, day: str) -> tuple | None:
+        return file_signature(day_file_paths(self.base_dir, day)["jsonl"])
+
+
+def open_store(base_dir: str, day: str, backend: str = "files", durability: str = "fsync") -> Store:
+    if backend == "files":
+        return FileStore(base_dir, day, durability)
+    if backend == "sqlite":
+        from .sqlite_store import SqliteStore
+
+        return SqliteStore(base_dir, day, durability)
+    raise ValueError(f"Backend inválido '{backend}'. Usa: {', '.join(BACKENDS)}.")
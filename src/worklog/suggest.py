@@ -0,0 +1,181 @@
+import os
+import json
+import math
+import heapq
+import bisect
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from .atomic import write_text_atomic
+from .domain import Entry
+from .search import fold
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_FILE = "worklog_suggest.json"
+SUGGEST_VERSION = 1
+HALF_LIFE_DAYS = 7.0
+MAX_ITEMS = 300
+SKIP_VALUES = {"(sin detalle)", "(sin registro / skip)", "(break / descanso)"}
+
+_LN2 = math.log(2)
+
+
+def suggest_path(base_dir: str) -> str:
+    return os.path.join(base_dir, SUGGEST_FILE)
+
+
+def _log_weight(when: datetime) -> float:
+    # Peso de un uso en escala logarítmica: cada HALF_LIFE_DAYS de antigüedad vale la mitad.
+    # En log se puede sumar sin re-escalar los puntajes guardados ni desbordar.
+    return when.timestamp() / 86400.0 / HALF_LIFE_DAYS * _LN2
+
+
+def _log_add(a: float, b: float) -> float:
+    hi, lo = (a, b) if a >= b else (b, a)
+    return hi + math.log1p(math.exp(lo - hi))
+
+
+class SuggestionIndex:
+    """
+    Actividades recientes de todos los días, rankeadas por frecuencia con decaimiento
+    (vida media de HALF_LIFE_DAYS). Se guarda en logs/worklog_suggest.json con
+    a lo sumo MAX_ITEMS actividades: cargarlo cuesta lo mismo con 1 semana o 5 años de historial.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.items: Dict[str, list] = {}  # actividad -> [log_score, usos, último uso (epoch)]
+        self._folded: Dict[str, str] = {}
+        self._sorted: List[tuple] | None = None  # (texto normalizado, actividad) para prefijos
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    # --- persistencia ---
+
+    @classmethod
+    def load(cls, base_dir: str) -> "SuggestionIndex":
+        idx = cls(suggest_path(base_dir))
+        try:
+            with open(idx.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return idx
+        if isinstance(data, dict) and data.get("version") == SUGGEST_VERSION:
+            for activity, score, count, last in data.get("items") or []:
+                idx.items[activity] = [score, count, last]
+        return idx
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            rows = [[a, s, c, t] for a, (s, c, t) in self.items.items()]
+            self._dirty = False
+        try:
+            write_text_atomic(self.path, json.dumps({"version": SUGGEST_VERSION, "items": rows}, ensure_ascii=False))
+        except OSError:
+            logger.warning("Could not write suggestion index %s", self.path)
+
+    # --- actualización ---
+
+    def record(self, activity: str, when: datetime) -> None:
+        activity = (activity or "").strip()
+        if not activity or activity in SKIP_VALUES:
+            return
+        w = _log_weight(when)
+        ts = when.timestamp()
+        with self._lock:
+            item = self.items.get(activity)
+            if item is None:
+                self.items[activity] = [w, 1, ts]
+                self._sorted = None
+            else:
+                item[0] = _log_add(item[0], w)
+                item[1] += 1
+                item[2] = max(item[2], ts)
+            if len(self.items) > MAX_ITEMS + MAX_ITEMS // 5:
+                keep = heapq.nlargest(MAX_ITEMS, self.items.items(), key=lambda kv: kv[1][0])
+                self.items = dict(keep)
+                self._sorted = None
+                self._folded.clear()
+            self._dirty = True
+
+    def seed(self, entries: Iterable[Entry]) -> None:
+        for e in entries:
+            try:
+                when = datetime.fromisoformat(e.start)
+            except ValueError:
+                continue
+            self.record(e.activity, when)
+
+    # --- consultas ---
+
+    def top(self, k: int = 9) -> List[str]:
+        with self._lock:
+            return [a for a, _ in heapq.nlargest(k, self.items.items(), key=lambda kv: kv[1][0])]
+
+    def newest(self) -> float:
+        """Epoch del uso más reciente registrado (0 si está vacío)."""
+        with self._lock:
+            return max((item[2] for item in self.items.values()), default=0.0)
+
+    def last(self) -> str:
+        with self._lock:
+            if not self.items:
+                return ""
+            return max(self.items.items(), key=lambda kv: kv[1][2])[0]
+
+    def _fold(self, activity: str) -> str:
+        f = self._folded.get(activity)
+        if f is None:
+            f = self._folded[activity] = " ".join(fold(activity).split())
+        return f
+
+    def lookup(self, query: str, k: int = 9) -> List[str]:
+        """
+        Coincidencias para lo que el usuario escribe, en orden:
+        prefijo de la actividad, prefijo de alguna palabra, subcadena y difusa
+        (las letras en orden). Dentro de cada nivel gana el puntaje.
+        """
+        q = " ".join(fold(query).split())
+        if not q:
+            return self.top(k)
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted((self._fold(a), a) for a in self.items)
+            ranked: List[tuple] = []
+            seen = set()
+
+            # prefijo exacto: búsqueda binaria en la lista ordenada
+            i = bisect.bisect_left(self._sorted, (q,))
+            while i < len(self._sorted) and self._sorted[i][0].startswith(q):
+                a = self._sorted[i][1]
+                ranked.append((0, -self.items[a][0], a))
+                seen.add(a)
+                i += 1
+
+            for a, item in self.items.items():
+                if a in seen:
+                    continue
+                text = self._fold(a)
+                if (" " + q) in (" " + text):
+                    tier = 1
+                elif q in text:
+                    tier = 2
+                elif _subsequence(q, text):
+                    tier = 3
+                else:
+                    continue
+                ranked.append((tier, -item[0], a))
+        return [a for _, _, a in heapq.nsmallest(k, ranked)]
+
+
+def _subsequence(q: str, text: str) -> bool:
+    it = iter(text)
+    return all(c in it for c in q)
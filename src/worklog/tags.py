@@ -0,0 +1,96 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+SEP = "/"
+
+
+class TagRegistry:
+    """
+    Interna cada tag una vez a un id entero y guarda su jerarquía por '/':
+    `ado/backend` es hijo de `ado`. Los padres se crean al internar al hijo.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.parents = array("i")
+        self._ids: Dict[str, int] = {}
+        self._lineage: List[Tuple[int, ...]] = []  # id del tag seguido de sus ancestros
+        self._closure: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, tag: str) -> int:
+        i = self._ids.get(tag)
+        if i is not None:
+            return i
+        head, sep, _ = tag.rpartition(SEP)
+        head = head.rstrip(SEP)
+        parent = self.intern(head) if sep and head else -1
+        i = self._ids[tag] = len(self.names)
+        self.names.append(tag)
+        self.parents.append(parent)
+        self._lineage.append((i,) + (self._lineage[parent] if parent >= 0 else ()))
+        return i
+
+    def lineage(self, i: int) -> Tuple[int, ...]:
+        """El id seguido de los ids de sus ancestros."""
+        return self._lineage[i]
+
+    def closure(self, tags: Tuple[str, ...]) -> Tuple[int, ...]:
+        """Ids de los tags y de todos sus ancestros, sin repetir (cacheado por tupla)."""
+        ids = self._closure.get(tags)
+        if ids is None:
+            ids = self._closure[tags] = tuple(dict.fromkeys(a for t in tags for a in self._lineage[self.intern(t)]))
+        return ids
+
+    def children(self) -> Dict[int, List[int]]:
+        out: Dict[int, List[int]] = {}
+        for i, p in enumerate(self.parents):
+            if p >= 0:
+                out.setdefault(p, []).append(i)
+        return out
+
+    def totals(self, rows: Iterable[Tuple[Tuple[str, ...], int]]) -> Dict[str, int]:
+        """
+        Minutos por nodo en una sola pasada sobre (tags, minutos). Cada entrada
+        suma una vez a cada nivel: `ado/backend,ado/frontend` cuenta una vez en `ado`.
+        """
+        acc: List[int] = []
+        for tags, minutes in rows:
+            ids = self.closure(tags)
+            if len(acc) < len(self.names):
+                acc.extend([0] * (len(self.names) - len(acc)))
+            for i in ids:
+                acc[i] += minutes
+        return {self.names[i]: m for i, m in enumerate(acc) if m}
+
+
+def merge_totals(into: Dict[str, int], other: Dict[str, int]) -> None:
+    for name, mins in other.items():
+        into[name] = into.get(name, 0) + mins
+
+
+def tree_lines(totals: Dict[str, int]) -> List[str]:
+    """Líneas Markdown anidadas para los tags con jerarquía (los tags planos se omiten)."""
+    reg = TagRegistry()
+    for name in totals:
+        reg.intern(name)
+    kids = reg.children()
+
+    def key(i: int) -> tuple:
+        return (-totals.get(reg.names[i], 0), reg.names[i])
+
+    lines: List[str] = []
+
+    def walk(i: int, depth: int) -> None:
+        name = reg.names[i]
+        mins = totals.get(name, 0)
+        lines.append(f"{'  ' * depth}- **{name}**: {mins} min ({round(mins/60, 2)} h)")
+        for c in sorted(kids.get(i, []), key=key):
+            walk(c, depth + 1)
+
+    roots = [i for i in range(len(reg)) if reg.parents[i] < 0 and i in kids]
+    for r in sorted(roots, key=key):
+        walk(r, 0)
+    return lines
@@ -0,0 +1,30 @@
+from itertools import islice
+
+from .config import TailConfig
+from .domain import Entry
+from .search import first_line
+from .storage import iter_recent
+
+
+def recent_entries(base_dir: str, limit: int, backend: str = "files") -> list[Entry]:
+    """Las `limit` entradas más recientes, de la más nueva a la más antigua."""
+    if backend == "sqlite":
+        from .sqlite_store import SqliteStore
+
+        store = SqliteStore(base_dir)
+        try:
+            return list(islice(store.iter_recent(), limit))
+        finally:
+            store.close()
+    return list(islice(iter_recent(base_dir), limit))
+
+
+def tail(cfg: TailConfig) -> None:
+    entries = recent_entries(cfg.base_dir, cfg.lines, cfg.backend)
+    if not entries:
+        print("⚠️ No hay entradas registradas.")
+        return
+    print(f"🕒 Últimas {len(entries)} entrada(s):")
+    for e in reversed(entries):
+        tags = f" [{e.tags}]" if e.tags else ""
+        print(f"- {e.date} {e.start[11:16]}–{e.end[11:16]}{tags} {first_line(e.activity)}")
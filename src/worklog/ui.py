@@ -15,18 +15,20 @@ def prompt_multiline(msg: str) -> str:
         lines.append(line)
     return "\n".join(lines).strip()
 
-def sprint_menu(last_activities: List[str]) -> None:
-    if not last_activities:
+def _one_line(a: str) -> str:
+    one_line = a.splitlines()[0] if a else ""
+    if len(one_line) > 60:
+        one_line = one_line[:57] + "..."
+    return one_line
+
+def sprint_menu(suggestions: List[str]) -> None:
+    if not suggestions:
         return
-    console.print("[bold]Sprint:[/bold] (r)=repetir última, (1..9)=usar actividad reciente")
-    recent = last_activities[-9:]
-    for i, a in enumerate(recent, start=1):
-        one_line = a.splitlines()[0]
-        if len(one_line) > 60:
-            one_line = one_line[:57] + "..."
-        console.print(f"  {i}. {one_line}")
-
-def choose_activity(choice: str, last_activities: List[str]) -> str:
+    console.print("[bold]Sprint:[/bold] (r)=repetir última, (1..9)=usar sugerencia, /texto=buscar")
+    for i, a in enumerate(suggestions[:9], start=1):
+        console.print(f"  {i}. {_one_line(a)}")
+
+def choose_activity(choice: str, suggestions: List[str], last: str = "") -> str:
     choice = choice.strip().lower()
 
     if choice == "s":
@@ -34,14 +36,34 @@ def choose_activity(choice: str, last_activities: List[str]) -> str:
     if choice == "b":
         return "(break / descanso)"
     if choice == "r":
-        return last_activities[-1] if last_activities else ""
-    if choice.isdigit() and last_activities:
+        return last
+    if choice.isdigit() and suggestions:
         idx = int(choice)
-        recent = last_activities[-9:]
+        recent = suggestions[:9]
         if 1 <= idx <= len(recent):
             return recent[idx - 1]
     return ""
 
+def print_matches(query: str, matches: List[str]) -> None:
+    if not matches:
+        console.print(f"[dim]Sin coincidencias para '{query}'.[/dim]")
+        return
+    console.print(f"[bold]Coincidencias para '{query}':[/bold]")
+    for i, a in enumerate(matches, start=1):
+        console.print(f"  {i}. {_one_line(a)}")
+
+def pick_match(answer: str, matches: List[str]) -> str:
+    answer = answer.strip()
+    if answer.isdigit() and 1 <= int(answer) <= len(matches):
+        return matches[int(answer) - 1]
+    return ""
+
+def ask_match(query: str, matches: List[str]) -> str:
+    print_matches(query, matches)
+    if not matches:
+        return ""
+    return pick_match(Prompt.ask("Elige (1..n) o Enter para escribir una nueva", default=""), matches)
+
 def maybe_edit(activity: str) -> str:
     if not activity:
         return activity
@@ -53,11 +75,3 @@ def maybe_edit(activity: str) -> str:
 def ask_tags(default_tags: str) -> str:
     t = Prompt.ask(f"Tags (Enter para '{default_tags}')", default="").strip()
     return t if t else default_tags
-
-def update_sprint(last_activities: List[str], activity: str) -> List[str]:
-    skip_values = {"(sin detalle)", "(sin registro / skip)", "(break / descanso)"}
-    if activity and activity not in last_activities and activity not in skip_values:
-        last_activities.append(activity)
-    if len(last_activities) > 9:
-        last_activities = last_activities[-9:]
-    return last_activities
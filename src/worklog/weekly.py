@@ -1,11 +1,20 @@
 import os
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
-from typing import Dict, List
-
-from .storage import read_jsonl, read_csv, ensure_dir, paths_for_day, legacy_paths_for_day
-from .domain import Entry
+from typing import Dict, Iterable, Iterator, List
+
+from .atomic import AtomicWriter
+from .catalog import get_catalog
+from .storage import ensure_dir, read_day_any
+from .domain import Entry, EntryBatch
+from .aggregate import group_by, group_lines, parse_keys
+from .exporter import entry_tags
+from .tags import TagRegistry, merge_totals, tree_lines
 from .config import SummaryConfig
+from .rollup import DayRollup, load_day_rollup
+
+# A partir de este número de días la carga de rollups se reparte en procesos.
+PARALLEL_MIN_DAYS = 32
 
 
 def _parse_iso_week(week: str, tz: ZoneInfo) -> tuple[date, date, str]:
@@ -30,6 +39,62 @@ def _parse_iso_week(week: str, tz: ZoneInfo) -> tuple[date, date, str]:
     return monday, sunday, label
 
 
+def _parse_date(value: str, flag: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Formato inválido para {flag}. Usa YYYY-MM-DD (ej: 2026-02-01).")
+
+
+def _parse_range(cfg: SummaryConfig, tz: ZoneInfo) -> tuple[date, date, str] | None:
+    """
+    Retorna (desde, hasta, label) si se pidió un rango (--from/--to, --month, --quarter o --year).
+    Retorna None si se debe usar la semana ISO de --week.
+    """
+    modes = sum(bool(x) for x in (cfg.date_from or cfg.date_to, cfg.month, cfg.quarter, cfg.year))
+    if modes == 0:
+        return None
+    if modes > 1:
+        raise ValueError("Usa solo uno de: --from/--to, --month, --quarter o --year.")
+
+    if cfg.month:
+        try:
+            y_str, m_str = cfg.month.split("-")
+            d1 = date(int(y_str), int(m_str), 1)
+        except Exception:
+            raise ValueError("Formato inválido para --month. Usa 'YYYY-MM' (ej: 2026-02).")
+        nxt = date(d1.year + (d1.month == 12), d1.month % 12 + 1, 1)
+        return d1, nxt - timedelta(days=1), f"{d1.year}-{d1.month:02d}"
+
+    if cfg.quarter:
+        try:
+            y_str, q_str = cfg.quarter.upper().split("-Q")
+            year, q = int(y_str), int(q_str)
+            if not 1 <= q <= 4:
+                raise ValueError
+        except Exception:
+            raise ValueError("Formato inválido para --quarter. Usa 'YYYY-Qn' (ej: 2026-Q1).")
+        d1 = date(year, 3 * q - 2, 1)
+        nxt = date(year + (q == 4), (3 * q) % 12 + 1, 1)
+        return d1, nxt - timedelta(days=1), f"{year}-Q{q}"
+
+    if cfg.year:
+        try:
+            year = int(cfg.year)
+            d1 = date(year, 1, 1)
+        except Exception:
+            raise ValueError("Formato inválido para --year. Usa 'YYYY' (ej: 2026).")
+        return d1, date(year, 12, 31), f"{year}"
+
+    if not cfg.date_from:
+        raise ValueError("--to requiere --from.")
+    d1 = _parse_date(cfg.date_from, "--from")
+    d2 = _parse_date(cfg.date_to, "--to") if cfg.date_to else datetime.now(tz).date()
+    if d2 < d1:
+        raise ValueError("--to no puede ser anterior a --from.")
+    return d1, d2, f"{d1}_{d2}"
+
+
 def _day_range(d1: date, d2: date) -> List[date]:
     out = []
     d = d1
@@ -39,31 +104,20 @@ def _day_range(d1: date, d2: date) -> List[date]:
     return out
 
 
-def _collect_week_entries(base_dir: str, days: List[date]) -> List[Entry]:
-    entries: List[Entry] = []
-    for d in days:
-        day_str = d.strftime("%Y-%m-%d")
-
-        day_paths = paths_for_day(base_dir, day_str)
-        jsonl_path = day_paths["jsonl"]
-        day_entries = read_jsonl(jsonl_path)
-        if day_entries:
-            entries.extend(day_entries)
-            continue
+def _detail_key(e: Entry) -> tuple[str, str]:
+    return (e.date, e.start)
 
-        csv_entries = read_csv(day_paths["csv"])
-        if csv_entries:
-            entries.extend(csv_entries)
-            continue
 
-        legacy_paths = legacy_paths_for_day(base_dir, day_str)
-        legacy_jsonl_entries = read_jsonl(legacy_paths["jsonl"])
-        if legacy_jsonl_entries:
-            entries.extend(legacy_jsonl_entries)
-            continue
-
-        entries.extend(read_csv(legacy_paths["csv"]))
-    return entries
+def _iter_range_entries(base_dir: str, days: List[date]) -> Iterator[Entry]:
+    """
+    Entradas del rango en orden (fecha, inicio) con un solo día en memoria.
+    Los días no se solapan: basta ordenar cada día y concatenarlos en orden.
+    """
+    catalog = get_catalog(base_dir)
+    for d in days:
+        day_entries = read_day_any(base_dir, d.strftime("%Y-%m-%d"), catalog)
+        day_entries.sort(key=_detail_key)
+        yield from day_entries
 
 
 def _summarize(entries: List[Entry]) -> dict:
@@ -74,25 +128,81 @@ def _summarize(entries: List[Entry]) -> dict:
 
     for e in entries:
         by_day[e.date] = by_day.get(e.date, 0) + e.minutes
-        tags = [t.strip() for t in (e.tags or "").split(",") if t.strip()] or ["(sin tags)"]
-        for t in tags:
+        for t in entry_tags(e):
             by_tag[t] = by_tag.get(t, 0) + e.minutes
 
     return {
         "total_minutes": total_minutes,
         "by_day": dict(sorted(by_day.items())),
         "by_tag": dict(sorted(by_tag.items(), key=lambda kv: kv[1], reverse=True)),
+        "by_tag_tree": TagRegistry().totals((e.tag_tuple, e.minutes) for e in entries),
+    }
+
+
+def _load_rollups(base_dir: str, days: List[date]) -> Iterable[DayRollup]:
+    catalog = get_catalog(base_dir)
+    # Solo los días con archivos: el resto no aporta totales. Una consulta al catálogo por día.
+    pairs = []
+    for d in days:
+        day = d.strftime("%Y-%m-%d")
+        day_sources = catalog.sources(day)
+        if day_sources:
+            pairs.append((day, day_sources))
+    if len(pairs) < PARALLEL_MIN_DAYS:
+        for day, day_sources in pairs:
+            yield load_day_rollup(base_dir, day, day_sources)
+        return
+
+    # Rangos largos: cargar los días en paralelo. Los resultados llegan en orden
+    # y se agregan a medida que llegan, sin guardar entradas en memoria.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(8, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        day_strs, sources = zip(*pairs)
+        yield from pool.map(load_day_rollup, [base_dir] * len(pairs), day_strs, sources, chunksize=16)
+
+
+def _summarize_rollups(rollups: Iterable[DayRollup]) -> dict:
+    # Mismo resultado que _summarize, pero a partir de los totales cacheados por día.
+    total_minutes = 0
+    by_day: Dict[str, int] = {}
+    by_tag: Dict[str, int] = {}
+    by_tag_tree: Dict[str, int] = {}
+
+    for r in rollups:
+        total_minutes += r.total_minutes
+        merge_totals(by_tag_tree, r.by_tag_tree)
+        for d, mins in r.by_day.items():
+            by_day[d] = by_day.get(d, 0) + mins
+        for t, mins in r.by_tag.items():
+            by_tag[t] = by_tag.get(t, 0) + mins
+
+    return {
+        "total_minutes": total_minutes,
+        "by_day": dict(sorted(by_day.items())),
+        "by_tag": dict(sorted(by_tag.items(), key=lambda kv: kv[1], reverse=True)),
+        "by_tag_tree": by_tag_tree,
     }
 
 
 def _write_weekly_md(out_path: str, label: str, monday: date, sunday: date, entries: List[Entry], include_details: bool) -> None:
-    s = _summarize(entries)
+    ordered = sorted(entries, key=_detail_key) if include_details else []
+    _write_summary_md(out_path, f"Weekly Worklog {label}", monday, sunday, _summarize(entries), ordered, include_details)
+
+
+def _write_summary_md(out_path: str, title: str, d1: date, d2: date, s: dict, entries: Iterable[Entry], include_details: bool) -> None:
+    """
+    El encabezado sale de los totales ya calculados en `s`; las filas del detalle
+    se escriben a medida que llegan, así que `entries` puede ser un stream
+    (ya ordenado por fecha e inicio) y la memoria no crece con el rango.
+    """
     total = s["total_minutes"]
 
     lines: List[str] = []
-    lines.append(f"# Weekly Worklog {label}")
+    lines.append(f"# {title}")
     lines.append("")
-    lines.append(f"**Rango:** {monday} → {sunday}")
+    lines.append(f"**Rango:** {d1} → {d2}")
     lines.append(f"**Total:** {total} min ({round(total/60, 2)} h)")
     lines.append("")
 
@@ -111,6 +221,18 @@ def _write_weekly_md(out_path: str, label: str, monday: date, sunday: date, entr
     else:
         lines.append("- (sin registros)")
 
+    tree = tree_lines(s.get("by_tag_tree") or {})
+    if tree:
+        lines.append("")
+        lines.append("## Totales por jerarquía de tags")
+        lines.extend(tree)
+
+    if s.get("groups"):
+        keys, groups = s["groups"]
+        lines.append("")
+        lines.append(f"## Totales por {', '.join(keys)}")
+        lines.extend(group_lines(keys, groups) or ["- (sin registros)"])
+
     if include_details:
         lines.append("")
         lines.append("## Detalle")
@@ -118,35 +240,65 @@ def _write_weekly_md(out_path: str, label: str, monday: date, sunday: date, entr
         lines.append("| Fecha | Inicio | Fin | Min | Actividad | Tags |")
         lines.append("|---|---|---|---:|---|---|")
 
-        # Ordenar por (date, start)
-        def key(e: Entry):
-            return (e.date, e.start)
-
-        for e in sorted(entries, key=key):
-            start = e.start.split("T")[1]
-            end = e.end.split("T")[1]
-            act = (e.activity or "").replace("\n", "<br>")
-            tags = (e.tags or "").replace("\n", " ")
-            lines.append(f"| {e.date} | {start} | {end} | {e.minutes} | {act} | {tags} |")
-
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines).strip() + "\n")
+    # Temporal + os.replace: si el reporte no cambió, el archivo existente no se toca.
+    with AtomicWriter(out_path) as f:
+        f.write("\n".join(lines).strip())
+        if include_details:
+            for e in entries:
+                start = e.start.split("T")[1]
+                end = e.end.split("T")[1]
+                act = (e.activity or "").replace("\n", "<br>")
+                tags = (e.tags or "").replace("\n", " ")
+                f.write(f"\n| {e.date} | {start} | {end} | {e.minutes} | {act} | {tags} |")
+        f.write("\n")
 
 
 def weekly_summary(cfg: SummaryConfig) -> None:
     tz = ZoneInfo(cfg.tz_name)
-    monday, sunday, label = _parse_iso_week(cfg.week, tz)
+    date_range = _parse_range(cfg, tz)
+    if date_range is None:
+        d1, d2, label = _parse_iso_week(cfg.week, tz)
+        title = f"Weekly Worklog {label}"
+        out_dir = os.path.join(cfg.base_dir, "worklog_md", "weekly")
+    else:
+        d1, d2, label = date_range
+        title = f"Worklog {label}"
+        out_dir = os.path.join(cfg.base_dir, "worklog_md", "range")
 
     # Para tu caso laboral, puedes quedarte con L–V.
     # Aun así, el resumen lee toda la semana ISO (L–D). Si no hay logs sábado/domingo, da igual.
-    days = _day_range(monday, sunday)
+    days = _day_range(d1, d2)
+    group_keys = parse_keys(cfg.group_by)
+
+    store = None
+    if cfg.backend == "sqlite":
+        from .sqlite_store import SqliteStore
+
+        store = SqliteStore(cfg.base_dir)
 
-    entries = _collect_week_entries(cfg.base_dir, days)
+    # Los totales salen de los rollups (o de SQL); --group-by y el detalle recorren
+    # las entradas como stream, sin cargar el rango completo en memoria.
+    def stream() -> Iterator[Entry]:
+        return store.iter_range(d1, d2) if store is not None else _iter_range_entries(cfg.base_dir, days)
 
-    out_dir = os.path.join(cfg.base_dir, "worklog_md", "weekly")
-    ensure_dir(out_dir)
-    out_path = os.path.join(out_dir, f"{label}_summary.md")
+    try:
+        if store is not None:
+            summary = store.summarize_range(d1, d2)
+        else:
+            summary = _summarize_rollups(_load_rollups(cfg.base_dir, days))
 
-    _write_weekly_md(out_path, label, monday, sunday, entries, cfg.include_details)
+        if group_keys:
+            summary["groups"] = (group_keys, group_by(EntryBatch.from_entries(stream()), group_keys))
 
-    print(f"✅ Weekly summary generado: {out_path}")
+        ensure_dir(out_dir)
+        out_path = os.path.join(out_dir, f"{label}_summary.md")
+
+        _write_summary_md(out_path, title, d1, d2, summary, stream() if cfg.include_details else (), cfg.include_details)
+    finally:
+        if store is not None:
+            store.close()
+
+    if date_range is None:
+        print(f"✅ Weekly summary generado: {out_path}")
+    else:
+        print(f"✅ Summary generado: {out_path}")
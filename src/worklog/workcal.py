@@ -0,0 +1,201 @@
+import os
+import json
+import bisect
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+from zoneinfo import ZoneInfo
+
+from .clock import WorkWindow, parse_hhmm
+
+CALENDAR_FILE = "worklog_calendar.json"
+CALENDAR_VERSION = 1
+HORIZON_DAYS = 400  # días precalculados por construcción
+_MARGIN_DAYS = 40   # se recalcula antes de quedarse sin turnos por delante
+
+WEEKDAYS = {
+    "lunes": 0, "martes": 1, "miercoles": 2, "miércoles": 2, "jueves": 3,
+    "viernes": 4, "sabado": 5, "sábado": 5, "domingo": 6,
+}
+_SHORT = "LMXJVSD"
+_RANGES = {"LMXJV": "L–V", "LMXJVS": "L–S", "LMXJVSD": "L–D"}
+
+Shift = Tuple[int, int]  # (minuto de inicio, minuto de fin) desde la medianoche; fin <= 1440
+
+
+def calendar_path(base_dir: str) -> str:
+    return os.path.join(base_dir, CALENDAR_FILE)
+
+
+def _minutes(value: str) -> int:
+    if value.strip() == "24:00":
+        return 1440
+    h, m = parse_hhmm(value.strip())
+    return h * 60 + m
+
+
+def parse_shift(value: str) -> Shift:
+    """'07:00-12:00' -> (420, 720)."""
+    try:
+        a, b = value.split("-")
+    except (AttributeError, ValueError):
+        raise ValueError(f"Turno inválido '{value}'. Usa HH:MM-HH:MM (ej: 07:00-12:00).") from None
+    start, end = _minutes(a), _minutes(b)
+    if end <= start:
+        raise ValueError(f"Turno inválido '{value}': el fin debe ser posterior al inicio.")
+    return start, end
+
+
+def _check_shifts(shifts: List[Shift], label: str) -> List[Shift]:
+    shifts = sorted(shifts)
+    for (_, end), (start, _) in zip(shifts, shifts[1:]):
+        if start < end:
+            raise ValueError(f"Turnos superpuestos en {label}.")
+    return shifts
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class WorkCalendar:
+    """
+    Horario laboral por día de la semana (admite turnos partidos) menos los festivos.
+    Los turnos de HORIZON_DAYS días se precalculan como dos arreglos ordenados de
+    instantes (epoch): "¿es horario laboral?" y "próximo inicio" son búsquedas
+    binarias. Las horas locales se convierten con la zona IANA, así que los
+    cambios de horario (DST) quedan resueltos al precalcular.
+    """
+
+    def __init__(
+        self,
+        tz: ZoneInfo,
+        shifts: Dict[int, List[Shift]],
+        holidays: Iterable[date] = (),
+        horizon_days: int = HORIZON_DAYS,
+        source: str = "",
+    ) -> None:
+        if not any(shifts.values()):
+            raise ValueError("El calendario no tiene ningún turno de trabajo.")
+        self.tz = tz
+        self.shifts = {wd: _check_shifts(list(s), _SHORT[wd]) for wd, s in shifts.items()}
+        self.holidays = frozenset(holidays)
+        self.horizon_days = max(_MARGIN_DAYS * 2, horizon_days)
+        self.source = source
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._lo = self._hi = 0.0
+        self._next_day = date.min  # primer día aún no precalculado
+
+    @classmethod
+    def from_window(cls, tz: ZoneInfo, w: WorkWindow) -> "WorkCalendar":
+        """Calendario clásico: lunes a viernes con una sola jornada."""
+        shift = parse_shift(f"{w.start_h:02d}:{w.start_m:02d}-{w.end_h:02d}:{w.end_m:02d}")
+        return cls(tz, {wd: [shift] for wd in range(5)})
+
+    @classmethod
+    def load(cls, path: str, tz: ZoneInfo, default: WorkWindow) -> "WorkCalendar":
+        """
+        Lee el calendario de `path` si existe; si no, L–V con la jornada `default`.
+
+            {"version": 1,
+             "weekdays": {"lunes": ["07:00-12:00", "13:00-17:00"], "viernes": ["07:00-13:00"]},
+             "holidays": ["2026-01-01", "2026-01-12"]}
+
+        Los días no listados en `weekdays` usan la jornada por defecto (L–V) o
+        no se trabajan (sábado y domingo); una lista vacía los deja libres.
+        """
+        base = cls.from_window(tz, default)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return base
+        except (OSError, ValueError) as e:
+            raise ValueError(f"No se pudo leer el calendario {path}: {e}") from None
+        if not isinstance(data, dict) or data.get("version", CALENDAR_VERSION) != CALENDAR_VERSION:
+            raise ValueError(f"Calendario {path} con formato o versión no soportada.")
+
+        shifts = dict(base.shifts)
+        for name, values in (data.get("weekdays") or {}).items():
+            wd = WEEKDAYS.get(str(name).strip().lower())
+            if wd is None:
+                raise ValueError(f"Día desconocido '{name}' en {path}. Usa: lunes, martes, ..., domingo.")
+            shifts[wd] = [parse_shift(v) for v in values]
+
+        holidays = []
+        for value in data.get("holidays") or []:
+            try:
+                holidays.append(date.fromisoformat(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"Festivo inválido '{value}' en {path}. Usa YYYY-MM-DD.") from None
+        return cls(tz, shifts, holidays, source=path)
+
+    # --- precálculo ---
+
+    def _instant(self, d: date, minutes: int) -> float:
+        d = d + timedelta(days=minutes // 1440)
+        m = minutes % 1440
+        return datetime(d.year, d.month, d.day, m // 60, m % 60, tzinfo=self.tz).timestamp()
+
+    def _build(self, first: date) -> None:
+        starts: List[float] = []
+        ends: List[float] = []
+        for k in range(self.horizon_days):
+            d = first + timedelta(days=k)
+            if d in self.holidays:
+                continue
+            for a, b in self.shifts.get(d.weekday(), ()):
+                start, end = self._instant(d, a), self._instant(d, b)
+                if start < end:  # un turno dentro del salto de DST puede quedar vacío
+                    starts.append(start)
+                    ends.append(end)
+        self._starts, self._ends = starts, ends
+        self._next_day = first + timedelta(days=self.horizon_days)
+        self._lo = self._instant(first, 0)
+        self._hi = self._instant(self._next_day - timedelta(days=_MARGIN_DAYS), 0)
+
+    def _at(self, dt: datetime) -> float:
+        t = dt.timestamp()
+        if not (self._lo <= t < self._hi):
+            self._build(dt.astimezone(self.tz).date() - timedelta(days=1))
+        return t
+
+    # --- consultas ---
+
+    def is_work_time(self, dt: datetime) -> bool:
+        t = self._at(dt)
+        i = bisect.bisect_right(self._starts, t) - 1
+        return i >= 0 and t < self._ends[i]
+
+    def shift_end(self, dt: datetime) -> datetime | None:
+        """Fin del turno en curso, o None si `dt` está fuera de horario."""
+        t = self._at(dt)
+        i = bisect.bisect_right(self._starts, t) - 1
+        if i >= 0 and t < self._ends[i]:
+            return datetime.fromtimestamp(self._ends[i], self.tz)
+        return None
+
+    def next_work_start(self, dt: datetime) -> datetime:
+        """Primer inicio de turno estrictamente posterior a `dt`."""
+        t = self._at(dt)
+        i = bisect.bisect_right(self._starts, t)
+        while i == len(self._starts):
+            # sin turnos en lo que queda del horizonte (ej: vacaciones largas): seguir más adelante
+            self._build(self._next_day)
+            i = bisect.bisect_right(self._starts, t)
+        return datetime.fromtimestamp(self._starts[i], self.tz)
+
+    def describe(self) -> str:
+        """Resumen para el banner: 'L–V 07:00–17:00 (18 festivos)'."""
+        groups: Dict[Tuple[Shift, ...], str] = {}
+        for wd in range(7):
+            s = tuple(self.shifts.get(wd, ()))
+            if s:
+                groups[s] = groups.get(s, "") + _SHORT[wd]
+        text = "; ".join(
+            f"{_RANGES.get(days, days)} " + ", ".join(f"{_hhmm(a)}–{_hhmm(b)}" for a, b in s)
+            for s, days in groups.items()
+        )
+        if self.holidays:
+            text += f" ({len(self.holidays)} festivos)"
+        return text
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from worklog.aggregate import _numpy, group_by, parse_keys, summarize
+from worklog.config import SummaryConfig
+from worklog.domain import Entry, EntryBatch
+from worklog.storage import append_jsonl, paths_for_day
+from worklog.weekly import _summarize, weekly_summary
+
+
+def _entries() -> list[Entry]:
+    rows = [
+        ("2026-02-03", 9, 30, "qa,ado/backend"),  # martes
+        ("2026-02-02", 7, 60, ""),
+        ("2026-02-02", 9, 45, "ado/backend,ado/frontend"),
+        ("2026-02-09", 9, 60, "docs,qa"),
+        ("2026-02-09", 9, 0, "qa"),
+        ("", -1, 15, "qa"),  # fila CSV sin fecha ni hora
+    ]
+    out = []
+    for day, hour, minutes, tags in rows:
+        start = f"{day}T{hour:02d}:00:00-05:00" if hour >= 0 else ""
+        out.append(Entry(day, start, start, minutes, "dev", tags))
+    return out
+
+
+class TestAggregate(unittest.TestCase):
+    def _both(self):
+        modes = [False]
+        if _numpy() is not None:
+            modes.append(True)
+        return modes
+
+    def test_summarize_matches_weekly(self) -> None:
+        entries = _entries()
+        batch = EntryBatch.from_entries(entries)
+        for use_numpy in self._both():
+            s = summarize(batch, use_numpy)
+            self.assertEqual(s, _summarize(entries))
+            self.assertEqual(list(s["by_tag"]), list(_summarize(entries)["by_tag"]))
+
+    def test_group_by_keys(self) -> None:
+        batch = EntryBatch.from_entries(_entries())
+        for use_numpy in self._both():
+            self.assertEqual(group_by(batch, "weekday", use_numpy), {-1: 15, 0: 165, 1: 30})
+            self.assertEqual(group_by(batch, "isoweek", use_numpy), {"": 15, "2026-W06": 135, "2026-W07": 60})
+            self.assertEqual(
+                group_by(batch, "weekday,hour", use_numpy),
+                {(-1, -1): 15, (0, 7): 60, (0, 9): 105, (1, 9): 30},
+            )
+            self.assertEqual(group_by(batch, ["tag", "hour"], use_numpy)[("qa", 9)], 90)
+
+    def test_invalid_key(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_keys("day,mes")
+
+    def test_summary_group_by_section(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for e in _entries()[:5]:
+                append_jsonl(paths_for_day(tmp, e.date)["jsonl"], e)
+            weekly_summary(SummaryConfig(base_dir=tmp, tz_name="America/Bogota", week="2026-W06",
+                                         include_details=False, group_by="weekday,hour"))
+            with open(os.path.join(tmp, "worklog_md", "weekly", "2026-W06_summary.md"), encoding="utf-8") as f:
+                text = f.read()
+            self.assertIn("## Totales por weekday, hour", text)
+            self.assertIn("- **lunes · 09:00**: 45 min (0.75 h)", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
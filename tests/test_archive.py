@@ -0,0 +1,130 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+
+from generate import generate_logs
+from worklog.archive import ARCHIVE_DIR, compact, compact_months, load_index, index_path
+from worklog.config import CompactConfig
+from worklog.domain import Entry
+from worklog.storage import append_csv, append_jsonl, discover_days, init_csv_if_needed, iter_recent, read_csv, read_day_any, read_jsonl
+from worklog.weekly import _iter_range_entries, _day_range, _summarize, _summarize_rollups, _load_rollups
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self) -> None:
+        logging.disable(logging.WARNING)
+
+    def tearDown(self) -> None:
+        logging.disable(logging.NOTSET)
+
+    def test_compacted_days_read_the_same(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_logs(tmp, years=0.2, start=date(2024, 1, 1), corrupt_ratio=0.05)
+            days = _day_range(date(2024, 1, 1), date(2024, 3, 15))
+            jan = os.path.join(tmp, "worklog_json", "2024-01-02_worklog.jsonl")
+            csv_jan = os.path.join(tmp, "worklog_csv", "2024-01-02_worklog.csv")
+            before = {
+                "days": discover_days(tmp),
+                "per_day": {d: read_day_any(tmp, d) for d in discover_days(tmp)},
+                "summary": _summarize(list(_iter_range_entries(tmp, days))),
+                "jsonl": read_jsonl(jan),
+                "csv": read_csv(csv_jan),
+            }
+
+            r = compact_months(tmp, "2024-03")
+            self.assertEqual(r.months, 2)
+            self.assertFalse(os.path.exists(jan))
+            self.assertFalse(any(n.startswith("2024-01") for n in os.listdir(os.path.join(tmp, "worklog_md"))))
+            self.assertEqual(len([n for n in os.listdir(os.path.join(tmp, ARCHIVE_DIR)) if n.endswith(".gz")]), 2)
+
+            self.assertEqual(discover_days(tmp), before["days"])
+            self.assertEqual({d: read_day_any(tmp, d) for d in discover_days(tmp)}, before["per_day"])
+            self.assertEqual(_summarize(list(_iter_range_entries(tmp, days))), before["summary"])
+            self.assertEqual(_summarize_rollups(_load_rollups(tmp, days)), before["summary"])
+            self.assertEqual(read_jsonl(jan), before["jsonl"])
+            self.assertEqual(read_csv(csv_jan), before["csv"])
+            self.assertEqual(compact_months(tmp, "2024-03").months, 0)
+
+    def test_recompact_merges_late_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            def add(day: str) -> None:
+                e = Entry(day, f"{day}T07:00:00-05:00", f"{day}T08:00:00-05:00", 60, "dev", "ado")
+                append_jsonl(os.path.join(tmp, f"{day}_worklog.jsonl"), e)
+
+            add("2026-01-05")
+            compact_months(tmp, "2026-02")
+            add("2026-01-06")
+            compact_months(tmp, "2026-02")
+
+            idx = load_index(index_path(tmp, "2026-01"))
+            self.assertEqual(sorted(idx["days"]), ["2026-01-05", "2026-01-06"])
+            self.assertEqual(discover_days(tmp), ["2026-01-05", "2026-01-06"])
+            self.assertEqual(len(read_day_any(tmp, "2026-01-05")), 1)
+            self.assertEqual(len([n for n in os.listdir(os.path.join(tmp, ARCHIVE_DIR)) if n.endswith(".gz")]), 1)
+
+    def test_appending_to_a_compacted_day_keeps_archived_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            day = "2026-01-05"
+            jsonl = os.path.join(tmp, f"{day}_worklog.jsonl")
+            csv_path = os.path.join(tmp, f"{day}_worklog.csv")
+            init_csv_if_needed(csv_path)
+
+            def add(activity: str) -> None:
+                e = Entry(day, f"{day}T07:00:00-05:00", f"{day}T08:00:00-05:00", 60, activity, "ado")
+                append_jsonl(jsonl, e)
+                append_csv(csv_path, e)
+
+            add("uno")
+            add("dos")
+            compact_months(tmp, "2026-02")
+            init_csv_if_needed(csv_path)  # como DayWriter.open: el CSV nuevo lleva encabezado
+            add("tarde")  # entrada tardía en la ruta del día ya archivado
+
+            expected = ["uno", "dos", "tarde"]
+            self.assertEqual([e.activity for e in read_jsonl(jsonl)], expected)
+            self.assertEqual([e.activity for e in read_csv(csv_path)], expected)
+            self.assertEqual([e.activity for e in read_day_any(tmp, day)], expected)
+            self.assertEqual([e.activity for e in iter_recent(tmp)], expected[::-1])
+
+            compact_months(tmp, "2026-02")
+            self.assertFalse(os.path.exists(jsonl))
+            self.assertEqual([e.activity for e in read_jsonl(jsonl)], expected)
+            self.assertEqual([e.activity for e in read_csv(csv_path)], expected)
+            self.assertEqual([e.activity for e in read_day_any(tmp, day)], expected)
+
+    def test_live_file_left_behind_is_not_read_or_archived_twice(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            day = "2026-01-05"
+            jsonl = os.path.join(tmp, f"{day}_worklog.jsonl")
+            e = Entry(day, f"{day}T07:00:00-05:00", f"{day}T08:00:00-05:00", 60, "uno", "ado")
+            append_jsonl(jsonl, e)
+            with open(jsonl, "rb") as f:
+                original = f.read()
+
+            compact_months(tmp, "2026-02")
+            with open(jsonl, "wb") as f:  # como si os.remove hubiera fallado
+                f.write(original)
+            self.assertEqual([x.activity for x in read_jsonl(jsonl)], ["uno"])
+            self.assertEqual([x.activity for x in iter_recent(tmp)], ["uno"])
+
+            append_jsonl(jsonl, Entry(day, f"{day}T08:00:00-05:00", f"{day}T09:00:00-05:00", 60, "dos", "ado"))
+            self.assertEqual([x.activity for x in read_jsonl(jsonl)], ["uno", "dos"])
+
+            compact_months(tmp, "2026-02")
+            self.assertFalse(os.path.exists(jsonl))
+            self.assertEqual([x.activity for x in read_jsonl(jsonl)], ["uno", "dos"])
+
+    def test_before_cannot_include_the_current_month(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = CompactConfig(base_dir=tmp, tz_name="America/Bogota", before="2099-01", dry_run=False)
+            with self.assertRaises(ValueError):
+                compact(cfg)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import io
+import os
+import asyncio
+import threading
+import unittest
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+from unittest import mock
+
+from worklog import async_runner
+from worklog.async_runner import _IoLane, _StdinReader
+
+
+class TestIoLane(unittest.TestCase):
+    def test_jobs_run_in_order_on_one_thread_and_messages_print_on_the_loop(self) -> None:
+        ran: list[tuple[int, str]] = []
+        printed: list[str] = []
+
+        def job(i: int) -> None:
+            ran.append((i, threading.current_thread().name))
+
+        async def main() -> None:
+            lane = _IoLane(asyncio.get_running_loop())
+            for i in range(20):
+                lane.submit(job, i, done_msg=f"ok {i}")
+            await lane.drain()
+            lane.shutdown()
+
+        def fake_print(*args, **kwargs) -> None:
+            printed.append(f"{threading.current_thread().name}:{args[0]}")
+
+        with mock.patch("builtins.print", fake_print):
+            asyncio.run(main())
+
+        self.assertEqual([i for i, _ in ran], list(range(20)))
+        self.assertEqual(len({name for _, name in ran}), 1)
+        self.assertTrue(ran[0][1].startswith("worklog-io"))
+        self.assertEqual(printed, [f"MainThread:ok {i}" for i in range(20)])
+
+    def test_failed_job_logs_and_does_not_print(self) -> None:
+        def boom() -> None:
+            raise OSError("disco lleno")
+
+        async def main() -> None:
+            lane = _IoLane(asyncio.get_running_loop())
+            lane.submit(boom, done_msg="💾 Guardado.")
+            await lane.drain()
+            lane.shutdown()
+
+        out = io.StringIO()
+        with redirect_stdout(out), self.assertLogs("worklog.async_runner", "ERROR"):
+            asyncio.run(main())
+        self.assertEqual(out.getvalue(), "")
+
+
+class TestStdinReader(unittest.TestCase):
+    def test_timeout_returns_default_then_lines_then_eof(self) -> None:
+        r, w = os.pipe()
+        stdin = os.fdopen(r, "r", encoding="utf-8")
+        writer = os.fdopen(w, "w", encoding="utf-8")
+
+        async def main() -> None:
+            reader = _StdinReader(asyncio.get_running_loop())
+            self.assertEqual(await reader.ainput("> ", 0.05, default="ado"), ("ado", True))
+
+            writer.write("daily\r\n")
+            writer.flush()
+            self.assertEqual(await reader.ainput("> ", 5), ("daily", False))
+
+            writer.close()
+            with self.assertRaises(EOFError):
+                await reader.ainput("> ", 5)
+
+        try:
+            with mock.patch("sys.stdin", stdin), redirect_stdout(io.StringIO()):
+                asyncio.run(main())
+        finally:
+            if not writer.closed:
+                writer.close()
+            stdin.close()
+
+
+class TestRunAsync(unittest.TestCase):
+    def test_ctrl_c_commits_the_store_before_exporting(self) -> None:
+        calls: list[str] = []
+        store = mock.Mock()
+        store.commit.side_effect = lambda: calls.append("commit")
+        store.close.side_effect = lambda: calls.append("close")
+        state = SimpleNamespace(store=store, exports=mock.Mock(), paths={"md": "hoy.md"})
+        runner = mock.Mock()
+        runner.return_value.loop_forever = mock.AsyncMock(side_effect=KeyboardInterrupt)
+        cfg = SimpleNamespace(tz_name="America/Bogota")
+
+        with mock.patch.object(async_runner, "_build_calendar"), \
+                mock.patch.object(async_runner, "_init_state", return_value=state), \
+                mock.patch.object(async_runner, "_AsyncRunner", runner), \
+                mock.patch.object(async_runner, "_flush_exports", lambda s: calls.append("export")), \
+                redirect_stdout(io.StringIO()) as out:
+            async_runner.run_async(cfg)
+
+        self.assertEqual(calls, ["commit", "export", "close"])
+        state.exports.close.assert_called_once()
+        self.assertIn("Interrumpido", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
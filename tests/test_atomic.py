@@ -0,0 +1,64 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from worklog.atomic import AtomicWriter, write_text_atomic
+
+
+class TestAtomicWrites(unittest.TestCase):
+    def test_unchanged_content_is_not_rewritten(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "r.md")
+            self.assertTrue(write_text_atomic(path, "# a\n"))
+            os.utime(path, ns=(1, 1))
+
+            self.assertFalse(write_text_atomic(path, "# a\n"))
+            w = AtomicWriter(path)
+            with w as f:
+                f.write("# a\n")
+            self.assertFalse(w.changed)
+            self.assertEqual(os.stat(path).st_mtime_ns, 1)
+
+            self.assertTrue(write_text_atomic(path, "# b\n"))
+            self.assertEqual(os.listdir(tmp), ["r.md"])
+
+    def test_failed_write_keeps_previous_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "r.md")
+            write_text_atomic(path, "completo\n")
+            with self.assertRaises(RuntimeError):
+                with AtomicWriter(path) as f:
+                    f.write("a medias")
+                    raise RuntimeError("corte")
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "completo\n")
+            self.assertEqual(os.listdir(tmp), ["r.md"])
+
+    def test_concurrent_writers_do_not_share_a_temp_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "r.md")
+            errors: list[BaseException] = []
+
+            def writer(n: int) -> None:
+                try:
+                    for i in range(50):
+                        write_text_atomic(path, f"# {n} {i}\n" * 200, durable=n % 2 == 0)
+                except BaseException as e:  # FileNotFoundError si dos hilos comparten el temporal
+                    errors.append(e)
+
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(os.listdir(tmp), ["r.md"])
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(set(lines)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
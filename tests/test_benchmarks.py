@@ -0,0 +1,31 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks"))
+
+from generate import generate_logs
+from worklog.weekly import _iter_range_entries, _day_range
+
+
+class TestGenerator(unittest.TestCase):
+    def test_generated_tree_is_readable(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = generate_logs(tmp, years=0.1, start=date(2024, 1, 1), corrupt_ratio=0.05)
+            days = _day_range(date(2024, 1, 1), date(2024, 2, 5))
+            logging.disable(logging.WARNING)
+            try:
+                entries = list(_iter_range_entries(tmp, days))
+            finally:
+                logging.disable(logging.NOTSET)
+            # las líneas corruptas se omiten; cada entrada válida se lee una vez
+            self.assertEqual(len(entries), stats["entries"])
+            self.assertGreater(stats["corrupt_lines"], 0)
+            self.assertGreater(stats["csv_only"] + stats["legacy"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+
+from worklog.catalog import LogCatalog, get_catalog
+from worklog.config import SummaryConfig
+from worklog.domain import Entry
+from worklog.storage import append_jsonl, read_day_any
+from worklog.weekly import weekly_summary
+
+
+def _entry(day: str, activity: str) -> Entry:
+    return Entry(day, f"{day}T07:00:00-05:00", f"{day}T08:00:00-05:00", 60, activity, "ado")
+
+
+class TestCatalog(unittest.TestCase):
+    def test_sources_in_precedence_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "worklog_json"))
+            append_jsonl(os.path.join(tmp, "2026-02-02_worklog.jsonl"), _entry("2026-02-02", "legacy"))
+            append_jsonl(os.path.join(tmp, "worklog_json", "2026-02-02_worklog.jsonl"), _entry("2026-02-02", "nuevo"))
+            append_jsonl(os.path.join(tmp, "2026-02-03_worklog.jsonl"), _entry("2026-02-03", "solo legacy"))
+
+            cat = LogCatalog(tmp)
+            cat.refresh()
+            self.assertEqual(cat.days(), ["2026-02-02", "2026-02-03"])
+            self.assertEqual([s.kind for s in cat.sources("2026-02-02")], ["jsonl", "legacy_jsonl"])
+            self.assertEqual(cat.sources("2026-02-04"), [])
+            self.assertEqual(read_day_any(tmp, "2026-02-02")[0].activity, "nuevo")
+
+            # un archivo nuevo cambia el mtime de la carpeta y se detecta
+            append_jsonl(os.path.join(tmp, "worklog_json", "2026-02-04_worklog.jsonl"), _entry("2026-02-04", "x"))
+            self.assertEqual(len(get_catalog(tmp).sources("2026-02-04")), 1)
+
+    def test_summary_does_not_create_log_dirs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            append_jsonl(os.path.join(tmp, "2026-02-02_worklog.jsonl"), _entry("2026-02-02", "dev"))
+            weekly_summary(SummaryConfig(base_dir=tmp, tz_name="America/Bogota", week="2026-W06", include_details=True))
+
+            self.assertFalse(os.path.exists(os.path.join(tmp, "worklog_json")))
+            self.assertFalse(os.path.exists(os.path.join(tmp, "worklog_csv")))
+            with open(os.path.join(tmp, "worklog_md", "weekly", "2026-W06_summary.md"), encoding="utf-8") as f:
+                self.assertIn("**Total:** 60 min (1.0 h)", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from worklog.clock import parse_hhmm, is_work_time, next_work_start, WorkWindow
+from worklog.clock import parse_hhmm, WorkWindow
+from worklog.workcal import WorkCalendar
 
 
 class TestClock(unittest.TestCase):
@@ -15,15 +16,15 @@ class TestClock(unittest.TestCase):
 
     def test_is_work_time(self) -> None:
         tz = ZoneInfo("America/Bogota")
-        w = WorkWindow(7, 0, 17, 0)
+        cal = WorkCalendar.from_window(tz, WorkWindow(7, 0, 17, 0))
         dt = datetime(2026, 2, 2, 9, 0, tzinfo=tz)  # Monday
-        self.assertTrue(is_work_time(dt, w))
+        self.assertTrue(cal.is_work_time(dt))
 
     def test_next_work_start_weekend(self) -> None:
         tz = ZoneInfo("America/Bogota")
-        w = WorkWindow(7, 0, 17, 0)
+        cal = WorkCalendar.from_window(tz, WorkWindow(7, 0, 17, 0))
         dt = datetime(2026, 2, 7, 10, 0, tzinfo=tz)  # Saturday
-        nxt = next_work_start(dt, w)
+        nxt = cal.next_work_start(dt)
         self.assertEqual(nxt.weekday(), 0)
         self.assertEqual(nxt.hour, 7)
         self.assertEqual(nxt.minute, 0)
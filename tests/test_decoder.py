@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+
+from worklog.decoder import JsonlDecodeError, decode_jsonl
+from worklog.domain import Entry
+
+
+def _line(i: int) -> str:
+    e = Entry("2026-02-02", f"2026-02-02T08:{i:02d}:00-05:00", f"2026-02-02T08:{i + 1:02d}:00-05:00", 1, f"tarea {i}\nñ", "qa")
+    return json.dumps(e.to_dict(), ensure_ascii=False)
+
+
+class TestDecoder(unittest.TestCase):
+    def _write(self, tmp: str, text: str) -> str:
+        path = os.path.join(tmp, "day.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_lenient_reports_bad_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            text = "\n".join([_line(0), _line(1)[:20], "", '{"date": "x"}', _line(2)]) + "\n"
+            entries, report = decode_jsonl(self._write(tmp, text))
+            self.assertEqual([e.activity for e in entries], ["tarea 0\nñ", "tarea 2\nñ"])
+            self.assertEqual((report.lines, report.decoded, report.skipped), (4, 2, 2))
+            self.assertEqual([n for n, _ in report.errors], [2, 4])
+
+    def test_strict_raises_with_line_number(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self._write(tmp, "\n".join([_line(0), "{bad", _line(1)]))
+            with self.assertRaises(JsonlDecodeError) as ctx:
+                decode_jsonl(path, strict=True)
+            self.assertEqual(ctx.exception.report.errors, [(2, "JSON inválido")])
+
+    def test_chunk_boundaries_and_bom(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            text = "\ufeff" + "\r\n".join(_line(i) for i in range(40))  # sin salto final
+            path = self._write(tmp, text)
+            small, _ = decode_jsonl(path, chunk_size=7)
+            big, report = decode_jsonl(path)
+            self.assertEqual(small, big)
+            self.assertEqual((len(big), report.skipped), (40, 0))
+
+    def test_accepts_minutes_the_old_reader_accepted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = []
+            for minutes in (60, 60.0, "60", " 45 ", "30.0", None, "una hora"):
+                d = json.loads(_line(0))
+                d["minutes"] = minutes
+                rows.append(json.dumps(d))
+            entries, report = decode_jsonl(self._write(tmp, "\n".join(rows) + "\n"))
+            self.assertEqual([e.minutes for e in entries], [60, 60, 60, 45, 30])
+            self.assertTrue(all(type(e.minutes) is int for e in entries))
+            self.assertEqual([n for n, _ in report.errors], [6, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from datetime import date
+
+from worklog.domain import Entry, EntryBatch
+from worklog.weekly import _summarize
+
+
+def _entry(day: str, hour: int, minutes: int, tags: str) -> Entry:
+    return Entry(day, f"{day}T{hour:02d}:15:00-05:00", f"{day}T{hour + 1:02d}:15:00-05:00", minutes, "dev", tags)
+
+
+class TestEntry(unittest.TestCase):
+    def test_derived_fields(self) -> None:
+        e = _entry("2026-02-02", 7, 60, " ado , qa,,")
+        self.assertFalse(hasattr(e, "__dict__"))
+        self.assertEqual(e.tag_tuple, ("ado", "qa"))
+        self.assertEqual((e.start_min, e.end_min), (7 * 60 + 15, 8 * 60 + 15))
+        self.assertEqual(e.day_ordinal, date(2026, 2, 2).toordinal())
+        self.assertEqual(list(e.to_dict()), ["date", "start", "end", "minutes", "activity", "tags"])
+        self.assertEqual(Entry(**e.to_dict()), e)
+
+    def test_invalid_values_do_not_raise(self) -> None:
+        e = Entry("", "", "x", 0, "", "")
+        self.assertEqual((e.day_ordinal, e.start_min, e.end_min, e.tag_tuple), (0, -1, -1, ()))
+
+
+class TestEntryBatch(unittest.TestCase):
+    def test_summarize_matches_weekly(self) -> None:
+        entries = [
+            _entry("2026-02-03", 9, 30, "qa,ado"),
+            _entry("2026-02-02", 7, 60, ""),
+            _entry("2026-02-02", 8, 30, "ado"),
+            _entry("2026-02-03", 10, 60, "docs,qa"),
+            _entry("2026-02-04", 7, 45, "ado/backend,ado/frontend"),
+        ]
+        batch = EntryBatch.from_entries(entries)
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch.summarize(), _summarize(entries))
+        self.assertEqual(list(batch.summarize()["by_tag"]), list(_summarize(entries)["by_tag"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from worklog.exports import ExportWorker
+
+
+class TestExportWorker(unittest.TestCase):
+    def test_burst_coalesces_into_one_run(self) -> None:
+        calls = []
+        worker = ExportWorker(debounce=10.0, max_delay=10.0)
+        for i in range(20):
+            worker.submit("md", lambda i=i: calls.append(i))
+        worker.submit("otro", lambda: calls.append("otro"))
+        worker.flush()
+
+        self.assertEqual(sorted(calls, key=str), [19, "otro"])
+        self.assertEqual(worker.runs, 2)
+        worker.close()
+
+    def test_close_runs_pending_and_survives_errors(self) -> None:
+        calls = []
+
+        def boom() -> None:
+            raise OSError("disco lleno")
+
+        worker = ExportWorker(debounce=10.0)
+        worker.submit("falla", boom)
+        worker.submit("md", lambda: calls.append("md"))
+        worker.close()
+
+        self.assertEqual(calls, ["md"])
+        with self.assertRaises(RuntimeError):
+            worker.submit("md", lambda: None)
+
+
+if __name__ == "__main__":
+    unittest.main()
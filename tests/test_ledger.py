@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from worklog.domain import Entry
+from worklog.exporter import export_markdown
+from worklog.ledger import DayLedger
+from worklog.storage import FileStore, append_jsonl
+
+
+def _entry(start: str, end: str, minutes: int, activity: str, tags: str) -> Entry:
+    return Entry(
+        date="2026-02-02",
+        start=f"2026-02-02T{start}:00-05:00",
+        end=f"2026-02-02T{end}:00-05:00",
+        minutes=minutes,
+        activity=activity,
+        tags=tags,
+    )
+
+
+class TestDayLedger(unittest.TestCase):
+    def test_render_matches_full_export(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileStore(tmp, "2026-02-02")
+            md = store.paths["md"]
+            full_md = os.path.join(tmp, "full.md")
+            entries = [
+                _entry("07:00", "08:00", 60, "daily\nrevisión PR", "ado,backend"),
+                _entry("08:00", "09:00", 60, "pruebas", ""),
+            ]
+
+            ledger = DayLedger(store, store.day, md)
+            ledger.rebuild()
+            for e in entries:
+                ledger.append(e)
+            ledger.export()
+            store.close()
+
+            export_markdown(full_md, entries)
+            with open(md, encoding="utf-8") as a, open(full_md, encoding="utf-8") as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_rebuilds_when_file_changes_outside(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileStore(tmp, "2026-02-02")
+            ledger = DayLedger(store, store.day, store.paths["md"])
+            ledger.rebuild()
+            self.assertEqual(ledger.count, 0)
+
+            append_jsonl(store.paths["jsonl"], _entry("07:00", "08:00", 60, "externo", "ado"))
+            self.assertTrue(ledger.is_stale())
+            ledger.ensure_fresh()
+            self.assertEqual(ledger.count, 1)
+            self.assertEqual(ledger.tag_map, {"ado": 60})
+            store.close()
+
+    def test_concurrent_exports_do_not_double_count(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileStore(tmp, "2026-02-02", durability="flush")
+            ledger = DayLedger(store, store.day, store.paths["md"])
+            ledger.rebuild()
+            done = threading.Event()
+
+            def exporter() -> None:
+                while not done.is_set():
+                    ledger.export()
+
+            t = threading.Thread(target=exporter)
+            t.start()
+            try:
+                for i in range(200):
+                    ledger.append(_entry("07:00", "07:01", 1, f"e{i}", "ado"))
+                ledger.append_many([_entry("08:00", "08:01", 1, f"b{i}", "ado") for i in range(20)])
+            finally:
+                done.set()
+                t.join()
+            store.close()
+
+            self.assertEqual((ledger.count, ledger.total, len(ledger.rows)), (220, 220, 220))
+            ledger.rebuild()
+            self.assertEqual(ledger.count, 220)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import time
+import unittest
+
+from worklog.notifier_host import NotifierHost, stub_host_argv
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+
+
+class TestNotifierHost(unittest.TestCase):
+    def setUp(self) -> None:
+        self._env = os.environ.copy()
+        os.environ["PYTHONPATH"] = os.pathsep.join(p for p in (SRC_DIR, os.environ.get("PYTHONPATH")) if p)
+
+    def tearDown(self) -> None:
+        os.environ.clear()
+        os.environ.update(self._env)
+
+    def test_runs_scripts_on_one_process(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "stub.log")
+            os.environ["WORKLOG_NOTIFIER_STUB_LOG"] = log_path
+            host = NotifierHost(stub_host_argv())
+            try:
+                self.assertTrue(host.ping(timeout=10))
+                pid = host._proc.pid
+                self.assertEqual(host.run_script("return 0 # uno"), 0)
+                self.assertEqual(host.run_script("return 0 # dos"), 0)
+                self.assertEqual(host._proc.pid, pid)
+            finally:
+                host.close()
+            with open(log_path, encoding="utf-8") as f:
+                self.assertEqual(len(f.read().splitlines()), 2)
+
+    def test_restarts_after_crash_and_hang(self) -> None:
+        host = NotifierHost(stub_host_argv(), max_restarts=2)
+        try:
+            self.assertTrue(host.ping(timeout=10))
+            host._proc.kill()
+            host._proc.wait()
+            self.assertEqual(host.run_script("return 0", timeout=10), 0)
+            # una respuesta correcta reinicia el contador
+            self.assertEqual(host.restarts, 0)
+
+            self.assertEqual(host.run_script("__stub_hang__", timeout=0.5), 124)
+            self.assertEqual(host.run_script("return 0", timeout=10), 0)
+            self.assertEqual(host.restarts, 0)
+        finally:
+            host.close()
+
+    def test_gives_up_after_consecutive_failed_restarts(self) -> None:
+        host = NotifierHost(stub_host_argv(), max_restarts=2)
+        try:
+            self.assertTrue(host.ping(timeout=10))
+            self.assertEqual(host.run_script("__stub_hang__", timeout=0.5), 124)
+            # tras el reinicio el host responde READY pero se vuelve a colgar
+            self.assertEqual(host.run_script("__stub_hang__ 1", timeout=2), 124)
+            self.assertEqual(host.run_script("__stub_hang__ 2", timeout=2), 124)
+            self.assertEqual(host.restarts, 2)
+            self.assertEqual(host.run_script("return 0", timeout=5), 125)
+        finally:
+            host.close()
+
+    def test_slow_start_does_not_block_the_request(self) -> None:
+        os.environ["WORKLOG_NOTIFIER_STUB_READY_DELAY"] = "1.5"
+        host = NotifierHost(stub_host_argv(), ready_timeout=30)
+        try:
+            t0 = time.monotonic()
+            self.assertEqual(host.run_script("return 0", timeout=0.2), 126)
+            self.assertLess(time.monotonic() - t0, 1.0)
+            # sigue arrancando en segundo plano y queda listo para la siguiente solicitud
+            self.assertTrue(host.is_alive())
+            self.assertEqual(host.run_script("return 0", timeout=10), 0)
+            self.assertEqual(host.restarts, 0)
+        finally:
+            host.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from worklog.domain import Entry
+from worklog.rollup import load_day_rollup, rollup_path
+from worklog.storage import append_jsonl, paths_for_day
+from worklog.weekly import _summarize, _summarize_rollups, _iter_range_entries
+from datetime import date
+
+
+def _entry(day: str, hour: int, tags: str) -> Entry:
+    return Entry(
+        date=day,
+        start=f"{day}T{hour:02d}:00:00-05:00",
+        end=f"{day}T{hour + 1:02d}:00:00-05:00",
+        minutes=60,
+        activity="dev",
+        tags=tags,
+    )
+
+
+class TestRollup(unittest.TestCase):
+    def test_rollups_match_summarize(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for day, tags in (("2026-02-02", "ado,backend"), ("2026-02-03", ""), ("2026-02-04", "ado/backend,ado/qa")):
+                path = paths_for_day(tmp, day)["jsonl"]
+                append_jsonl(path, _entry(day, 7, tags))
+                append_jsonl(path, _entry(day, 8, "ado"))
+
+            days = [date(2026, 2, d) for d in range(2, 9)]
+            rollups = [load_day_rollup(tmp, d.strftime("%Y-%m-%d")) for d in days]
+            self.assertEqual(_summarize_rollups(rollups), _summarize(list(_iter_range_entries(tmp, days))))
+            self.assertTrue(os.path.exists(rollup_path(tmp, "2026-02-02")))
+
+    def test_reparses_when_source_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = paths_for_day(tmp, "2026-02-02")["jsonl"]
+            append_jsonl(path, _entry("2026-02-02", 7, "ado"))
+            self.assertEqual(load_day_rollup(tmp, "2026-02-02").total_minutes, 60)
+
+            append_jsonl(path, _entry("2026-02-02", 8, "ado"))
+            r = load_day_rollup(tmp, "2026-02-02")
+            self.assertEqual(r.count, 2)
+            self.assertEqual(r.by_tag, {"ado": 120})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from worklog import runner, storage
+from worklog.clock import WorkWindow
+from worklog.config import RunConfig
+from worklog.exports import ExportWorker
+from worklog.runner import _blocks_before_reset, _catch_up_entries, _missed_blocks, _open_ledger, _persist_batch, _rotate_if_new_day
+from worklog.suggest import SuggestionIndex
+from worklog.workcal import WorkCalendar, parse_shift
+
+TZ = ZoneInfo("America/Bogota")
+
+
+def _cfg(base_dir: str = "logs", minutes: int = 60) -> RunConfig:
+    return RunConfig(
+        minutes=minutes, base_dir=base_dir, start="07:00", end="17:00", tags="ado", notify=False,
+        immediate=False, tz_name="America/Bogota", break_start="13:00", break_end="14:00",
+        break_enabled=True, input_timeout_sec=0,
+    )
+
+
+class TestCatchUp(unittest.TestCase):
+    def test_missed_blocks_skip_gaps_between_shifts(self) -> None:
+        cal = WorkCalendar(TZ, {0: [parse_shift("07:00-12:00"), parse_shift("13:00-17:00")]})
+        state = SimpleNamespace(tick_start=datetime(2026, 2, 2, 9, 0, tzinfo=TZ), calendar=cal)
+        blocks = _missed_blocks(_cfg(), state, datetime(2026, 2, 2, 15, 20, tzinfo=TZ))
+        self.assertEqual(
+            [(s.hour, e.hour) for s, e in blocks],
+            [(9, 10), (10, 11), (11, 12), (13, 14), (14, 15)],
+        )
+
+    def test_catch_up_writes_all_blocks_in_one_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            day = "2026-02-02"
+            store = storage.open_store(tmp, day, durability="fsync")
+            paths = storage.paths_for_day(tmp, day)
+            state = SimpleNamespace(
+                tick_start=datetime(2026, 2, 2, 10, 0, tzinfo=TZ),
+                calendar=WorkCalendar.from_window(TZ, WorkWindow(7, 0, 17, 0)),
+                break_start=(13, 0),
+                break_end=(14, 0),
+                store=store,
+                ledger=_open_ledger(store, paths),
+                exports=ExportWorker(debounce=0.01),
+                suggestions=SuggestionIndex(os.path.join(tmp, "suggest.json")),
+            )
+            blocks = _missed_blocks(_cfg(tmp), state, datetime(2026, 2, 2, 16, 5, tzinfo=TZ))
+            entries = _catch_up_entries(state, blocks, "migración", "ado")
+            _persist_batch(state, entries)
+            state.exports.close()
+            store.close()
+
+            saved = storage.read_jsonl(paths["jsonl"])
+            self.assertEqual(len(saved), 6)
+            self.assertEqual([e.activity for e in saved].count("(break / descanso)"), 1)
+            self.assertEqual(state.exports.runs, 2)  # un Markdown + sugerencias
+            with open(paths["md"], encoding="utf-8") as f:
+                self.assertIn("migración", f.read())
+
+    def _state(self, day: str, tick_start: datetime) -> SimpleNamespace:
+        return SimpleNamespace(
+            tick_start=tick_start,
+            calendar=WorkCalendar.from_window(TZ, WorkWindow(7, 0, 17, 0)),
+            store=mock.Mock(day=day),
+        )
+
+    def test_blocks_are_offered_before_the_off_hours_sleep(self) -> None:
+        state = self._state("2026-02-02", datetime(2026, 2, 2, 15, 0, tzinfo=TZ))
+        with mock.patch.object(runner, "now", return_value=datetime(2026, 2, 2, 18, 30, tzinfo=TZ)):
+            blocks = _blocks_before_reset(_cfg(), TZ, state)
+        self.assertEqual([(s.hour, e.hour) for s, e in blocks], [(15, 16), (16, 17)])
+
+    def test_nothing_to_settle_during_work_time(self) -> None:
+        state = self._state("2026-02-02", datetime(2026, 2, 2, 9, 0, tzinfo=TZ))
+        with mock.patch.object(runner, "now", return_value=datetime(2026, 2, 2, 12, 30, tzinfo=TZ)):
+            self.assertEqual(_blocks_before_reset(_cfg(), TZ, state), [])
+
+    def test_day_rotation_settles_the_old_day_and_resumes_at_the_first_shift(self) -> None:
+        # Suspendido a las 16:00 y despertado al día siguiente a las 09:10.
+        state = self._state("2026-02-02", datetime(2026, 2, 2, 16, 0, tzinfo=TZ))
+        with mock.patch.object(runner, "now", return_value=datetime(2026, 2, 3, 9, 10, tzinfo=TZ)), \
+                mock.patch.object(runner, "_open_ledger"), mock.patch("builtins.print"):
+            blocks = _blocks_before_reset(_cfg(), TZ, state)
+            state.tick_start = blocks[-1][1]
+            _rotate_if_new_day(_cfg(), TZ, state)
+
+        self.assertEqual([(s.day, s.hour, e.hour) for s, e in blocks], [(2, 16, 17)])
+        state.store.rotate.assert_called_once_with("2026-02-03")
+        self.assertEqual(state.tick_start, datetime(2026, 2, 3, 7, 0, tzinfo=TZ))
+        self.assertEqual(len(_missed_blocks(_cfg(), state, datetime(2026, 2, 3, 9, 10, tzinfo=TZ))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from worklog.clock import WorkWindow
+from worklog.scheduler import Scheduler, next_deadline
+from worklog.workcal import WorkCalendar
+
+
+class TestScheduler(unittest.TestCase):
+    def test_next_deadline_picks_earliest_boundary(self) -> None:
+        tz = ZoneInfo("America/Bogota")
+        cal = WorkCalendar.from_window(tz, WorkWindow(7, 0, 17, 0))
+        n = datetime(2026, 2, 2, 12, 30, tzinfo=tz)
+
+        self.assertEqual(next_deadline(n, n + timedelta(minutes=10), cal, (13, 0), (14, 0)), n + timedelta(minutes=10))
+        self.assertEqual(next_deadline(n, n + timedelta(hours=1), cal, (13, 0), (14, 0)), n.replace(hour=13, minute=0))
+        late = datetime(2026, 2, 2, 16, 50, tzinfo=tz)
+        self.assertEqual(next_deadline(late, late + timedelta(hours=1), cal), late.replace(hour=17, minute=0))
+        night = datetime(2026, 2, 2, 23, 0, tzinfo=tz)
+        self.assertEqual(next_deadline(night, night + timedelta(hours=2), cal), datetime(2026, 2, 3, 0, 0, tzinfo=tz))
+
+    def test_sleep_is_capped_and_detects_clock_jump(self) -> None:
+        tz = ZoneInfo("America/Bogota")
+        clock = {"wall": 0.0, "mono": 0.0}
+        slept = []
+
+        def fake_sleep(seconds: float) -> None:
+            slept.append(seconds)
+            clock["mono"] += seconds
+            clock["wall"] += seconds + 3600  # el equipo estuvo suspendido una hora
+
+        s = Scheduler(tz, max_sleep=60, sleep=fake_sleep, wall=lambda: clock["wall"], mono=lambda: clock["mono"])
+        deadline = datetime.now(tz) + timedelta(hours=2)
+        self.assertTrue(s.sleep_until(deadline))
+        self.assertEqual(slept, [60])
+
+    def test_detects_resume_when_monotonic_counts_suspend(self) -> None:
+        # Windows: time.monotonic sigue contando durante la suspensión; no hay drift pero sí exceso
+        tz = ZoneInfo("America/Bogota")
+        clock = {"wall": 0.0, "mono": 0.0}
+
+        def fake_sleep(seconds: float) -> None:
+            clock["mono"] += seconds + 3600
+            clock["wall"] += seconds + 3600
+
+        s = Scheduler(tz, max_sleep=60, sleep=fake_sleep, wall=lambda: clock["wall"], mono=lambda: clock["mono"])
+        self.assertTrue(s.sleep_until(datetime.now(tz) + timedelta(hours=2)))
+
+    def test_normal_sleep_is_not_a_jump(self) -> None:
+        tz = ZoneInfo("America/Bogota")
+        clock = {"wall": 0.0, "mono": 0.0}
+
+        def fake_sleep(seconds: float) -> None:
+            clock["mono"] += seconds + 0.5
+            clock["wall"] += seconds + 0.5
+
+        s = Scheduler(tz, max_sleep=60, sleep=fake_sleep, wall=lambda: clock["wall"], mono=lambda: clock["mono"])
+        self.assertFalse(s.sleep_until(datetime.now(tz) + timedelta(hours=2)))
+
+    def test_no_sleep_when_deadline_passed(self) -> None:
+        tz = ZoneInfo("America/Bogota")
+        s = Scheduler(tz, sleep=lambda _: self.fail("should not sleep"))
+        self.assertFalse(s.sleep_until(datetime.now(tz) - timedelta(seconds=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from worklog.domain import Entry
+from worklog import search
+from worklog.search import SearchIndex, parse_query, rebuild
+from worklog.storage import FileStore, append_jsonl, paths_for_day
+
+
+def _entry(day: str, hour: int, activity: str, tags: str) -> Entry:
+    return Entry(day, f"{day}T{hour:02d}:00:00-05:00", f"{day}T{hour + 1:02d}:00:00-05:00", 60, activity, tags)
+
+
+class TestSearch(unittest.TestCase):
+    def test_rebuild_and_query(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for e in (
+                _entry("2026-02-02", 7, "Revisión del pipeline\nfix certificados", "ado/backend"),
+                _entry("2026-02-02", 8, "pipeline de release", "qa"),
+                _entry("2026-02-03", 9, "certificados del cliente", "cliente acme"),
+            ):
+                append_jsonl(paths_for_day(tmp, e.date)["jsonl"], e)
+            self.assertEqual(rebuild(tmp), 3)
+            index = SearchIndex(tmp)
+
+            self.assertEqual([h.start[11:13] for h in index.search("pipeline")], ["08", "07"])
+            self.assertEqual(len(index.search("revision certificados")), 1)
+            self.assertEqual(len(index.search('"fix certificados"')), 1)
+            self.assertEqual(len(index.search('"certificados fix"')), 0)
+            self.assertEqual([h.date for h in index.search("#ado")], ["2026-02-02"])
+            self.assertEqual(len(index.search("tag:cliente-acme certificados")), 1)
+            self.assertEqual(index.search("pipeline", limit=1)[0].block(), "08:00–09:00")
+
+    def test_store_append_updates_existing_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileStore(tmp, "2026-02-02", durability="flush")
+            store.append(_entry("2026-02-02", 7, "antes del indice", ""))
+            self.assertFalse(SearchIndex(tmp).exists())
+
+            rebuild(tmp)
+            store.append(_entry("2026-02-02", 8, "despues del indice", "qa"))
+            store.close()
+            index = SearchIndex(tmp)
+            self.assertEqual(len(index.search("indice")), 2)
+            self.assertEqual(len(index.search("despues #qa")), 1)
+
+    def test_entries_saved_during_rebuild_are_replayed_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileStore(tmp, "2026-02-02", durability="flush")
+            store.append(_entry("2026-02-02", 7, "primera tarea", ""))
+            rebuild(tmp)
+            history = search._history
+
+            def racing_history(base_dir):
+                # El runner guarda dos entradas mientras rebuild lee el historial:
+                # una antes de que se lea su día y otra después.
+                store.append(_entry("2026-02-02", 8, "tarea leida", ""))
+                yield from history(base_dir)
+                store.append(_entry("2026-02-02", 9, "tarea tardia", ""))
+
+            with mock.patch.object(search, "_history", racing_history):
+                self.assertEqual(rebuild(tmp), 3)
+            store.append(_entry("2026-02-02", 10, "tarea posterior", ""))
+            store.close()
+
+            index = SearchIndex(tmp)
+            self.assertEqual([h.start[11:13] for h in index.search("tarea")], ["10", "09", "08", "07"])
+            self.assertFalse(os.path.exists(search._pending_path(tmp)))
+
+    def test_postings_seek_the_term_table_and_scan_the_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for h in range(7, 12):
+                append_jsonl(paths_for_day(tmp, "2026-02-02")["jsonl"], _entry("2026-02-02", h, f"deploy {h}", "ado"))
+            rebuild(tmp)
+            index = SearchIndex(tmp)
+            size, table = index._table(search._shard("deploy"))
+            self.assertIn("deploy", table)
+            self.assertGreater(size, 0)
+
+            index.maintain(_entry("2026-02-03", 7, "deploy final", "ado"))
+            self.assertEqual(len(index._postings("deploy")), 6)
+            self.assertEqual(len(index.search("deploy #ado")), 6)
+            self.assertTrue(index.contains(_entry("2026-02-03", 7, "deploy final", "ado")))
+            self.assertFalse(index.contains(_entry("2026-02-03", 8, "deploy final", "ado")))
+
+    def test_parse_query(self) -> None:
+        terms, phrases = parse_query('Revisión "base de datos" #ADO/Backend')
+        self.assertEqual(terms, {"revision", "base", "de", "datos", "#ado/backend"})
+        self.assertEqual(phrases, ["base de datos"])
+
+
+if __name__ == "__main__":
+    unittest.main()
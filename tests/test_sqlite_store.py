@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date
+
+from worklog.domain import Entry
+from worklog.sqlite_store import SqliteStore, migrate_files
+from worklog.storage import append_jsonl, paths_for_day
+from worklog.weekly import _iter_range_entries, _day_range, _summarize
+
+SAMPLE_LOGS = os.path.join(os.path.dirname(__file__), os.pardir, "logs")
+
+
+class TestSqliteStore(unittest.TestCase):
+    def test_migration_matches_file_summary(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            base = os.path.join(tmp, "logs")
+            shutil.copytree(SAMPLE_LOGS, base)
+            d1, d2 = date(2026, 2, 1), date(2026, 2, 15)
+
+            days, entries = migrate_files(base)
+            self.assertGreater(days, 0)
+            self.assertEqual(migrate_files(base), (0, 0))
+
+            file_entries = list(_iter_range_entries(base, _day_range(d1, d2)))
+            store = SqliteStore(base)
+            try:
+                self.assertEqual(store.summarize_range(d1, d2), _summarize(file_entries))
+                self.assertEqual(len(list(store.iter_range(d1, d2))), len(file_entries))
+            finally:
+                store.close()
+
+    def test_reimports_changed_day(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = paths_for_day(tmp, "2026-02-02")["jsonl"]
+            e = Entry("2026-02-02", "2026-02-02T07:00:00-05:00", "2026-02-02T08:00:00-05:00", 60, "dev", "ado")
+            append_jsonl(path, e)
+            migrate_files(tmp)
+            append_jsonl(path, e)
+            migrate_files(tmp)
+
+            store = SqliteStore(tmp, "2026-02-02")
+            try:
+                self.assertEqual(len(store.read_day("2026-02-02")), 2)
+                store.append(e)
+                self.assertEqual(store.day_signature("2026-02-02")[0], 3)
+            finally:
+                store.close()
+
+    def test_days_written_to_sqlite_are_not_imported_again(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            e = Entry("2026-02-02", "2026-02-02T07:00:00-05:00", "2026-02-02T08:00:00-05:00", 60, "dev", "ado")
+            other = Entry("2026-02-03", "2026-02-03T07:00:00-05:00", "2026-02-03T08:00:00-05:00", 60, "qa", "ado")
+            # el mismo bloque quedó en los archivos y en SQLite (ej: se cambió de backend ese día)
+            append_jsonl(paths_for_day(tmp, "2026-02-02")["jsonl"], e)
+            append_jsonl(paths_for_day(tmp, "2026-02-03")["jsonl"], other)
+            store = SqliteStore(tmp, "2026-02-02")
+            store.append(e)
+            store.close()
+
+            self.assertEqual(migrate_files(tmp), (1, 1))
+            store = SqliteStore(tmp)
+            try:
+                self.assertEqual(store.read_day("2026-02-02"), [e])
+                self.assertEqual(store.read_day("2026-02-03"), [other])
+                self.assertEqual(store.summarize_range(date(2026, 2, 2), date(2026, 2, 3))["total_minutes"], 120)
+            finally:
+                store.close()
+
+    def test_export_thread_waits_for_the_open_batch(self) -> None:
+        # ExportWorker lee el día desde otro hilo: no debe ver un lote a medio escribir.
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SqliteStore(tmp, "2026-02-02", durability="group")
+            seen: list[tuple | None] = []
+            reader = threading.Thread(target=lambda: seen.append(store.day_signature("2026-02-02")))
+            try:
+                with store.batch():
+                    store.append(Entry("2026-02-02", "2026-02-02T07:00:00-05:00", "2026-02-02T08:00:00-05:00", 60, "a", "ado"))
+                    reader.start()
+                    reader.join(0.2)
+                    self.assertTrue(reader.is_alive())
+                    store.append(Entry("2026-02-02", "2026-02-02T08:00:00-05:00", "2026-02-02T09:00:00-05:00", 60, "b", "ado"))
+                reader.join()
+            finally:
+                store.close()
+            self.assertEqual(seen[0][0], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+HEAVY = ("typer", "rich", "subprocess", "worklog.runner", "worklog.notifier", "worklog.ui")
+
+
+class TestStartup(unittest.TestCase):
+    def _light_command(self, *args: str) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_DIR))
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime", "-m", "worklog", *args, "--base-dir", tmp],
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+            self.assertEqual(proc.returncode, 0, proc.stderr[-2000:])
+            imported = {line.split("|")[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+            self.assertFalse([m for m in imported if m.split(".")[0] in HEAVY or m in HEAVY])
+            # el log se abre solo si se escribe algo
+            self.assertFalse(os.path.exists(os.path.join(tmp, "worklog.log")))
+
+    def test_summary_does_not_import_interactive_modules(self) -> None:
+        self._light_command("summary", "--week", "2026-W06")
+
+    def test_tail_does_not_import_interactive_modules(self) -> None:
+        self._light_command("tail", "-n", "3")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,33 @@
 import os
 import tempfile
 import unittest
+from unittest import mock
 
-from worklog.storage import append_jsonl, read_jsonl
+from worklog.storage import (
+    DayWriter,
+    append_csv,
+    append_jsonl,
+    init_csv_if_needed,
+    iter_jsonl_reverse,
+    iter_recent,
+    paths_for_day,
+    read_csv,
+    read_jsonl,
+)
 from worklog.domain import Entry
+from worklog.decoder import decode_jsonl
+from worklog.journal import TAIL_BYTES, TORN_SUFFIX, recover_tail
+
+
+def _entry(day: str = "2026-02-02", activity: str = "reunion") -> Entry:
+    return Entry(
+        date=day,
+        start=f"{day}T12:00:00-05:00",
+        end=f"{day}T13:00:00-05:00",
+        minutes=60,
+        activity=activity,
+        tags="azure-devops",
+    )
 
 
 class TestStorage(unittest.TestCase):
@@ -32,6 +56,157 @@ class TestStorage(unittest.TestCase):
             entries = read_jsonl(path)
             self.assertEqual(entries, [])
 
+    def test_day_writer_appends_and_rotates(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            day1 = paths_for_day(tmp, "2026-02-02")
+            day2 = paths_for_day(tmp, "2026-02-03")
+            writer = DayWriter(day1, durability="group", group_size=2)
+            writer.append(_entry())
+            with writer.batch():
+                writer.append(_entry(activity="a"))
+                writer.append(_entry(activity="b"))
+            self.assertEqual(len(read_jsonl(day1["jsonl"])), 3)
+            self.assertEqual([e.activity for e in read_csv(day1["csv"])], ["reunion", "a", "b"])
+
+            writer.rotate(day2)
+            writer.append(_entry("2026-02-03"))
+            writer.close()
+            self.assertEqual(len(read_jsonl(day2["jsonl"])), 1)
+            self.assertEqual(len(read_csv(day2["csv"])), 1)
+
+    def test_group_mode_syncs_pending_entries_when_the_deadline_passes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = DayWriter(paths_for_day(tmp, "2026-02-02"), durability="group", group_size=16, group_seconds=5)
+            try:
+                writer.append(_entry())
+                self.assertEqual(writer._pending, 1)
+                left = writer.sync_if_due()
+                self.assertTrue(0 < left <= 5)
+
+                writer._last_sync -= 5  # pasó group_seconds sin más escrituras
+                with mock.patch("os.fsync") as fsync:
+                    self.assertIsNone(writer.sync_if_due())
+                self.assertEqual(fsync.call_count, 2)
+                self.assertEqual(writer._pending, 0)
+                self.assertIsNone(writer.sync_if_due())
+            finally:
+                writer.close()
+
+    def test_day_writer_rejects_unknown_durability(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                DayWriter(paths_for_day(tmp, "2026-02-02"), durability="never")
+
+
+class TestTailRecovery(unittest.TestCase):
+    def test_torn_last_line_is_moved_aside_and_sequence_continues(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = paths_for_day(tmp, "2026-02-02")
+            writer = DayWriter(paths, durability="flush")
+            writer.append(_entry(activity="a"))
+            writer.append(_entry(activity="b"))
+            writer.close()
+            with open(paths["jsonl"], "ab") as f:
+                f.write(b'{"date": "2026-02-02", "start": "2026-02-0')  # corte a mitad de escritura
+
+            writer = DayWriter(paths, durability="flush")
+            writer.append(_entry(activity="c"))
+            writer.close()
+
+            entries, report = decode_jsonl(paths["jsonl"], strict=True)
+            self.assertEqual([e.activity for e in entries], ["a", "b", "c"])
+            self.assertTrue(report.ok)
+            with open(paths["jsonl"], "rb") as f:
+                self.assertIn(b'"seq": 3', f.read().splitlines()[-1])
+            with open(paths["jsonl"] + TORN_SUFFIX, "rb") as f:
+                self.assertTrue(f.read().startswith(b'{"date": "2026-02-02", "start"'))
+
+    def test_torn_multiline_csv_row_is_cut_at_the_record_boundary(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = paths_for_day(tmp, "2026-02-02")
+            writer = DayWriter(paths, durability="flush")
+            writer.append(_entry(activity="uno"))
+            writer.append(_entry(activity="linea1\nlinea2"))
+            writer.close()
+            with open(paths["csv"], "ab") as f:
+                f.write(b'2026-02-02,2026-02-02T12:00:00-05:00,2026-02-02T13:00:00-05:00,60,"linea1\n')
+
+            writer = DayWriter(paths, durability="flush")
+            writer.append(_entry(activity="tres"))
+            writer.append(_entry(activity="cuatro"))
+            writer.close()
+
+            self.assertEqual([e.activity for e in read_csv(paths["csv"])], ["uno", "linea1\nlinea2", "tres", "cuatro"])
+            with open(paths["csv"] + TORN_SUFFIX, "rb") as f:
+                self.assertTrue(f.read().endswith(b'60,"linea1\n'))
+
+    def test_corrupt_last_record_is_repaired_reading_only_the_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "big.jsonl")
+            for i in range(3000):  # > TAIL_BYTES
+                append_jsonl(path, _entry(activity=f"act {i}"))
+            self.assertGreater(os.path.getsize(path), TAIL_BYTES)
+            with open(path, "r+b") as f:
+                f.seek(-20, os.SEEK_END)
+                f.write(b"X")  # bit-rot en el último registro, con salto de línea intacto
+
+            state = recover_tail(path)
+            self.assertEqual(state.last_seq, 2999)
+            self.assertGreater(state.repaired_bytes, 0)
+            entries, report = decode_jsonl(path, strict=True)
+            self.assertEqual(len(entries), 2999)
+            self.assertEqual(recover_tail(path).repaired_bytes, 0)
+
+    def test_checksum_mismatch_in_the_middle_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mid.jsonl")
+            for activity in ("a", "b", "c"):
+                append_jsonl(path, _entry(activity=activity))
+            with open(path, "rb") as f:
+                data = f.read()
+            with open(path, "wb") as f:
+                f.write(data.replace(b'"activity": "b"', b'"activity": "B"'))
+
+            entries, report = decode_jsonl(path)
+            self.assertEqual([e.activity for e in entries], ["a", "c"])
+            self.assertEqual(report.errors, [(2, "checksum inválido")])
+
+    def test_unsealed_lines_still_read(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "old.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"date": "2026-02-02", "start": "a", "end": "b", "minutes": 5, "activity": "x", "tags": ""}\n')
+            append_jsonl(path, _entry(activity="y"))
+            self.assertEqual([e.activity for e in read_jsonl(path)], ["x", "y"])
+
+
+class TestReverseReader(unittest.TestCase):
+    def test_reverse_matches_forward_across_block_boundaries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "day.jsonl")
+            with open(path, "wb") as f:
+                f.write(b"\xef\xbb\xbf")
+            for i in range(50):
+                append_jsonl(path, _entry(activity=f"act {i}\ncon salto" if i % 7 == 0 else f"act {i}"))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("{bad json}\n\n")
+            forward = read_jsonl(path)
+            for block in (7, 64, 1 << 16):
+                self.assertEqual(list(iter_jsonl_reverse(path, block_size=block)), forward[::-1])
+
+    def test_iter_recent_walks_days_newest_first_and_stops_early(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for day in ("2026-02-02", "2026-02-03"):
+                for activity in ("a", "b"):
+                    append_jsonl(paths_for_day(tmp, day)["jsonl"], _entry(day, f"{day} {activity}"))
+            csv_path = paths_for_day(tmp, "2026-02-04")["csv"]  # día solo CSV
+            init_csv_if_needed(csv_path)
+            append_csv(csv_path, _entry("2026-02-04", "csv"))
+
+            it = iter_recent(tmp)
+            self.assertEqual([next(it).activity for _ in range(3)], ["csv", "2026-02-03 b", "2026-02-03 a"])
+            self.assertEqual([e.activity for e in it], ["2026-02-02 b", "2026-02-02 a"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from worklog import suggest
+from worklog.suggest import SuggestionIndex
+
+T0 = datetime(2026, 2, 2, 9, 0, tzinfo=timezone(timedelta(hours=-5)))
+
+
+class TestSuggest(unittest.TestCase):
+    def test_recency_beats_old_frequency(self) -> None:
+        idx = SuggestionIndex("unused.json")
+        # 4 usos hace 4 semanas pesan menos que 2 usos de hoy
+        for h in range(4):
+            idx.record("migración legacy", T0 - timedelta(days=28, hours=h))
+        idx.record("daily", T0 - timedelta(hours=2))
+        idx.record("daily", T0 - timedelta(hours=1))
+        idx.record("code review", T0)
+        idx.record("(sin detalle)", T0)
+
+        self.assertEqual(idx.top(3), ["daily", "code review", "migración legacy"])
+        self.assertEqual(idx.last(), "code review")
+        self.assertEqual(idx.items["migración legacy"][1], 4)
+
+    def test_lookup_prefix_then_fuzzy(self) -> None:
+        idx = SuggestionIndex("unused.json")
+        idx.record("Revisión de PR", T0)
+        idx.record("Deploy revisado", T0)
+        idx.record("prevision de costos", T0)
+        idx.record("reunión de equipo", T0 - timedelta(days=1))
+
+        self.assertEqual(idx.lookup("revi"), ["Revisión de PR", "Deploy revisado", "prevision de costos"])
+        self.assertEqual(idx.lookup("rnequ"), ["reunión de equipo"])
+        self.assertEqual(idx.lookup("zzz"), [])
+
+    def test_persist_and_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            idx = SuggestionIndex.load(tmp)
+            self.assertFalse(idx.exists())
+            n = suggest.MAX_ITEMS + suggest.MAX_ITEMS // 5 + 1
+            for i in range(n):
+                idx.record(f"tarea {i}", T0 + timedelta(minutes=i))
+            idx.save()
+
+            self.assertTrue(os.path.exists(suggest.suggest_path(tmp)))
+            loaded = SuggestionIndex.load(tmp)
+            self.assertEqual(len(loaded.items), suggest.MAX_ITEMS)
+            self.assertEqual(loaded.top(1), [f"tarea {n - 1}"])
+            self.assertNotIn("tarea 0", loaded.items)
+            self.assertEqual(loaded.lookup("tarea 36")[0], "tarea 360")
+
+
+if __name__ == "__main__":
+    unittest.main()
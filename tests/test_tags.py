@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from worklog.domain import Entry
+from worklog.tags import TagRegistry, tree_lines
+from worklog.weekly import _summarize, _write_summary_md
+
+
+def _entry(minutes: int, tags: str) -> Entry:
+    return Entry("2026-02-02", "2026-02-02T07:00:00-05:00", "2026-02-02T08:00:00-05:00", minutes, "dev", tags)
+
+
+class TestTagRegistry(unittest.TestCase):
+    def test_intern_creates_parents(self) -> None:
+        reg = TagRegistry()
+        leaf = reg.intern("ado/backend/api")
+        self.assertEqual(reg.intern("ado/backend/api"), leaf)
+        self.assertEqual(reg.names, ["ado", "ado/backend", "ado/backend/api"])
+        self.assertEqual(list(reg.parents), [-1, 0, 1])
+
+    def test_each_entry_counts_once_per_level(self) -> None:
+        entries = [_entry(60, "ado/backend,ado/frontend"), _entry(30, "ado"), _entry(15, "docs"), _entry(10, "")]
+        tree = _summarize(entries)["by_tag_tree"]
+        self.assertEqual(tree, {"ado": 90, "ado/backend": 60, "ado/frontend": 60, "docs": 15})
+        self.assertEqual(tree_lines(tree), [
+            "- **ado**: 90 min (1.5 h)",
+            "  - **ado/backend**: 60 min (1.0 h)",
+            "  - **ado/frontend**: 60 min (1.0 h)",
+        ])
+
+    def test_summary_md_has_hierarchy_section_only_when_needed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "s.md")
+            d = date(2026, 2, 2)
+            for tags, expected in (("ado,docs", False), ("ado/backend", True)):
+                entries = [_entry(60, tags)]
+                _write_summary_md(out, "t", d, d, _summarize(entries), entries, False)
+                with open(out, encoding="utf-8") as f:
+                    self.assertEqual("## Totales por jerarquía de tags" in f.read(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
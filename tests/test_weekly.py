@@ -2,9 +2,12 @@ import os
 import tempfile
 import unittest
 from datetime import date
+from zoneinfo import ZoneInfo
 
-from worklog.weekly import _write_weekly_md
+from worklog.weekly import _write_weekly_md, _parse_range, weekly_summary
+from worklog.config import SummaryConfig
 from worklog.domain import Entry
+from worklog.storage import append_jsonl, paths_for_day
 
 
 class TestWeekly(unittest.TestCase):
@@ -24,6 +27,53 @@ class TestWeekly(unittest.TestCase):
             _write_weekly_md(out_path, "2026-W05", date(2026, 2, 2), date(2026, 2, 8), entries, False)
             self.assertTrue(os.path.exists(out_path))
 
+    def test_parse_range_modes(self) -> None:
+        tz = ZoneInfo("America/Bogota")
+
+        def cfg(**kw) -> SummaryConfig:
+            return SummaryConfig(base_dir="logs", tz_name="America/Bogota", week="current", include_details=False, **kw)
+
+        self.assertIsNone(_parse_range(cfg(), tz))
+        self.assertEqual(_parse_range(cfg(month="2024-02"), tz), (date(2024, 2, 1), date(2024, 2, 29), "2024-02"))
+        self.assertEqual(_parse_range(cfg(quarter="2026-Q4"), tz), (date(2026, 10, 1), date(2026, 12, 31), "2026-Q4"))
+        self.assertEqual(_parse_range(cfg(year="2026"), tz), (date(2026, 1, 1), date(2026, 12, 31), "2026"))
+        self.assertEqual(
+            _parse_range(cfg(date_from="2026-02-01", date_to="2026-02-15"), tz),
+            (date(2026, 2, 1), date(2026, 2, 15), "2026-02-01_2026-02-15"),
+        )
+        with self.assertRaises(ValueError):
+            _parse_range(cfg(month="2026-02", year="2026"), tz)
+
+    def test_year_summary_aggregates_all_days(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for day in ("2026-01-05", "2026-06-10", "2026-12-30"):
+                append_jsonl(
+                    paths_for_day(tmp, day)["jsonl"],
+                    Entry(day, f"{day}T07:00:00-05:00", f"{day}T08:00:00-05:00", 60, "dev", "ado"),
+                )
+            weekly_summary(SummaryConfig(base_dir=tmp, tz_name="America/Bogota", week="current",
+                                         include_details=False, year="2026"))
+            with open(os.path.join(tmp, "worklog_md", "range", "2026_summary.md"), encoding="utf-8") as f:
+                text = f.read()
+            self.assertIn("**Total:** 180 min (3.0 h)", text)
+            self.assertIn("- **ado**: 180 min (3.0 h)", text)
+
+    def test_details_are_streamed_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for day, hour in (("2026-02-03", 7), ("2026-02-02", 9), ("2026-02-02", 7)):
+                append_jsonl(
+                    paths_for_day(tmp, day)["jsonl"],
+                    Entry(day, f"{day}T{hour:02d}:00:00-05:00", f"{day}T{hour + 1:02d}:00:00-05:00", 60, f"dev {hour}", "ado"),
+                )
+            weekly_summary(SummaryConfig(base_dir=tmp, tz_name="America/Bogota", week="2026-W06", include_details=True))
+            with open(os.path.join(tmp, "worklog_md", "weekly", "2026-W06_summary.md"), encoding="utf-8") as f:
+                rows = [line for line in f.read().splitlines() if line.startswith("| 2026")]
+            self.assertEqual([r.split(" | ")[0:2] for r in rows], [
+                ["| 2026-02-02", "07:00:00-05:00"],
+                ["| 2026-02-02", "09:00:00-05:00"],
+                ["| 2026-02-03", "07:00:00-05:00"],
+            ])
+
 
 if __name__ == "__main__":
     unittest.main()
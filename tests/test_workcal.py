@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from worklog.clock import WorkWindow
+from worklog.scheduler import next_deadline
+from worklog.workcal import WorkCalendar, calendar_path, parse_shift
+
+BOG = ZoneInfo("America/Bogota")
+
+
+class TestWorkCalendar(unittest.TestCase):
+    def test_default_matches_weekday_window(self) -> None:
+        cal = WorkCalendar.load("missing.json", BOG, WorkWindow(7, 0, 17, 0))
+        self.assertEqual(cal.describe(), "L–V 07:00–17:00")
+        self.assertTrue(cal.is_work_time(datetime(2026, 2, 2, 9, 0, tzinfo=BOG)))
+        self.assertFalse(cal.is_work_time(datetime(2026, 2, 2, 17, 0, tzinfo=BOG)))
+        saturday = datetime(2026, 2, 7, 10, 0, tzinfo=BOG)
+        self.assertEqual(cal.next_work_start(saturday), datetime(2026, 2, 9, 7, 0, tzinfo=BOG))
+
+    def test_file_with_split_shifts_weekday_hours_and_holidays(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(calendar_path(tmp), "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "version": 1,
+                        "weekdays": {"lunes": ["07:00-12:00", "13:00-17:00"], "viernes": ["07:00-13:00"], "sábado": ["08:00-10:00"]},
+                        "holidays": ["2026-03-23"],
+                    },
+                    f,
+                )
+            cal = WorkCalendar.load(calendar_path(tmp), BOG, WorkWindow(8, 0, 16, 0))
+
+        monday = datetime(2026, 3, 16, 12, 30, tzinfo=BOG)
+        self.assertFalse(cal.is_work_time(monday))  # almuerzo entre turnos
+        self.assertEqual(cal.next_work_start(monday), monday.replace(hour=13, minute=0))
+        self.assertEqual(cal.shift_end(monday.replace(hour=9)), monday.replace(hour=12, minute=0))
+        self.assertTrue(cal.is_work_time(datetime(2026, 3, 17, 15, 30, tzinfo=BOG)))  # martes: jornada por defecto
+        self.assertFalse(cal.is_work_time(datetime(2026, 3, 20, 14, 0, tzinfo=BOG)))  # viernes corto
+        self.assertTrue(cal.is_work_time(datetime(2026, 3, 21, 9, 0, tzinfo=BOG)))  # sábado
+
+        # festivo (lunes 23): salta al martes
+        self.assertEqual(
+            cal.next_work_start(datetime(2026, 3, 21, 11, 0, tzinfo=BOG)), datetime(2026, 3, 24, 8, 0, tzinfo=BOG)
+        )
+        self.assertIn("(1 festivos)", cal.describe())
+        self.assertEqual(next_deadline(monday.replace(hour=16), monday.replace(hour=18), cal), monday.replace(hour=17, minute=0))
+
+    def test_dst_transitions_keep_local_hours(self) -> None:
+        ny = ZoneInfo("America/New_York")
+        cal = WorkCalendar.from_window(ny, WorkWindow(9, 0, 17, 0))
+        # viernes antes y lunes después del cambio de horario del 2026-03-08
+        start = cal.next_work_start(datetime(2026, 3, 6, 18, 0, tzinfo=ny))
+        self.assertEqual((start.date(), start.hour, start.utcoffset()), (date(2026, 3, 9), 9, timedelta(hours=-4)))
+        self.assertTrue(cal.is_work_time(datetime(2026, 3, 9, 16, 30, tzinfo=ny)))
+
+    def test_long_gaps_and_far_dates_rebuild_the_horizon(self) -> None:
+        holidays = [date(2026, 6, 1) + timedelta(days=k) for k in range(120)]
+        cal = WorkCalendar(BOG, {0: [parse_shift("07:00-17:00")]}, holidays, horizon_days=60)
+        self.assertEqual(cal.next_work_start(datetime(2026, 5, 30, tzinfo=BOG)), datetime(2026, 10, 5, 7, 0, tzinfo=BOG))
+        self.assertTrue(cal.is_work_time(datetime(2031, 1, 6, 8, 0, tzinfo=BOG)))
+
+    def test_invalid_files_are_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cal.json")
+            for data in ({"weekdays": {"lunes": ["12:00-08:00"]}}, {"weekdays": {"funday": []}}, {"holidays": ["2026-13-01"]}):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                with self.assertRaises(ValueError):
+                    WorkCalendar.load(path, BOG, WorkWindow(7, 0, 17, 0))
+        with self.assertRaises(ValueError):
+            WorkCalendar(BOG, {0: [(420, 720), (700, 800)]})
+
+
+if __name__ == "__main__":
+    unittest.main()